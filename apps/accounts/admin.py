@@ -44,6 +44,19 @@ class UserAdmin(BaseUserAdmin):
 
     get_role_display.short_description = "Role"
 
+    def save_formset(self, request, form, formset, change):
+        if formset.model is not UserProfile:
+            return super().save_formset(request, form, formset, change)
+        # Write only the inline's fields so counters kept with F() updates aren't overwritten
+        profiles = formset.save(commit=False)
+        for profile in formset.deleted_objects:
+            profile.delete()
+        for profile in profiles:
+            if profile.pk is None:
+                profile.save()
+            else:
+                profile.save(update_fields=UserProfileInline.fields)
+
 
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
@@ -103,3 +116,9 @@ class UserProfileAdmin(admin.ModelAdmin):
 
     def get_queryset(self, request):
         return super().get_queryset(request).select_related("user", "shanyraq")
+
+    def save_model(self, request, obj, form, change):
+        if change:
+            obj.save(update_fields=form.changed_data)
+        else:
+            super().save_model(request, obj, form, change)
@@ -6,7 +6,7 @@ Context processors for accounts: user profile, stats, theme, onboarding.
 def user_profile_stats(request):
     """
     Add user_profile, season_xp, lifetime_xp, shanyraq_season_sp, user_rank, theme_preference,
-    onboarding_needed for templates (navbar, theme toggle, onboarding modal).
+    onboarding_needed, unread_notifications_count for templates (navbar, theme toggle, onboarding modal).
     """
     from apps.shanyraq.models import Shanyraq
 
@@ -18,6 +18,7 @@ def user_profile_stats(request):
         "user_rank": "",
         "theme_preference": "system",
         "onboarding_needed": False,
+        "unread_notifications_count": 0,
         "onboarding_shanyraq_list": [],
     }
     if request.user.is_authenticated:
@@ -29,6 +30,7 @@ def user_profile_stats(request):
             context["shanyraq_season_sp"] = profile.shanyraq.season_sp
         context["user_rank"] = profile.rank or ""
         context["theme_preference"] = profile.theme or "system"
+        context["unread_notifications_count"] = profile.unread_notifications
         context["onboarding_needed"] = not profile.onboarding_completed
         if context["onboarding_needed"]:
             context["onboarding_shanyraq_list"] = list(Shanyraq.objects.all().values("id", "name"))
@@ -9,6 +9,8 @@ from django.http import HttpResponseForbidden
 from django.shortcuts import resolve_url
 from django.utils.decorators import method_decorator
 
+from apps.core.permissions import user_can_review
+
 from .models import Role
 
 
@@ -58,6 +60,18 @@ def event_creator_required(view_func):
     return login_required(role_required(Role.STUDENT_COUNCIL, Role.ADMIN)(view_func))
 
 
+def reviewer_required(view_func):
+    """Require a reviewer: Teacher or Admin role, or staff (see apps.core.permissions.user_can_review)."""
+
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        if not user_can_review(request.user):
+            return HttpResponseForbidden()
+        return view_func(request, *args, **kwargs)
+
+    return login_required(_wrapped_view)
+
+
 def shanyraq_leader_required(view_func):
     """Require role Shanyraq Leader, Student Council, Teacher, or Admin."""
     return login_required(
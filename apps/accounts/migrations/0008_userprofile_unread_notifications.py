@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:27
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_unread(apps, schema_editor):
+    UserProfile = apps.get_model("accounts", "UserProfile")
+    Notification = apps.get_model("notifications", "Notification")
+    unread = (
+        Notification.objects.filter(user=OuterRef("user"), is_read=False)
+        .order_by()
+        .values("user")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    UserProfile.objects.update(unread_notifications=Coalesce(Subquery(unread), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_migrate_points_to_xp_sp'),
+        ('notifications', '0002_notification_unread_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='unread_notifications',
+            field=models.PositiveIntegerField(default=0, help_text='Cached unread notification count (see apps.notifications.services)'),
+        ),
+        migrations.RunPython(count_unread, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_userprofile_unread_notifications'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='calendar_feed_key',
+            field=models.CharField(blank=True, help_text='Secret in the personal calendar feed URL; rotating it revokes old links', max_length=32),
+        ),
+    ]
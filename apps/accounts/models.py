@@ -1,3 +1,5 @@
+import secrets
+
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
@@ -94,6 +96,12 @@ class UserProfile(models.Model):
     interests = models.TextField(blank=True, help_text="Comma-separated interests")
     activity_score = models.PositiveIntegerField(default=0, help_text="Cached activity metric")
     last_activity = models.DateTimeField(null=True, blank=True)
+    unread_notifications = models.PositiveIntegerField(
+        default=0, help_text="Cached unread notification count (see apps.notifications.services)"
+    )
+    calendar_feed_key = models.CharField(
+        max_length=32, blank=True, help_text="Secret in the personal calendar feed URL; rotating it revokes old links"
+    )
     onboarding_completed = models.BooleanField(default=False)
     theme = models.CharField(
         max_length=10,
@@ -118,3 +126,9 @@ class UserProfile(models.Model):
 
     def display_name(self):
         return self.full_name.strip() or self.user.email
+
+    def rotate_calendar_feed_key(self):
+        """Issue a new calendar feed secret; links built with the old one stop working."""
+        self.calendar_feed_key = secrets.token_urlsafe(16)
+        self.save(update_fields=["calendar_feed_key"])
+        return self.calendar_feed_key
@@ -17,8 +17,5 @@ def create_user_profile(sender, instance, created, **kwargs):
 
 @receiver(post_save, sender=User)
 def save_user_profile(sender, instance, **kwargs):
-    """Save UserProfile when User is saved."""
-    try:
-        instance.profile.save()
-    except UserProfile.DoesNotExist:
-        UserProfile.objects.create(user=instance)
+    """Make sure a UserProfile exists when User is saved (profiles save their own fields)."""
+    UserProfile.objects.get_or_create(user=instance)
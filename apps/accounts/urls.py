@@ -10,4 +10,6 @@ urlpatterns = [
     path("profile/<int:user_id>/", views.profile_by_id_view, name="profile_by_id"),
     path("onboarding/save/", views.onboarding_save_view, name="onboarding_save"),
     path("theme/save/", views.theme_save_view, name="theme_save"),
+    path("calendar/reset/", views.calendar_feed_reset_view, name="calendar_feed_reset"),
+    path("calendar/<str:token>.ics", views.calendar_feed_view, name="calendar_feed"),
 ]
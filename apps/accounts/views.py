@@ -1,10 +1,16 @@
+from itertools import chain
+
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse
+from django.core import signing
+from django.db.models import Q
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
 from django.views.decorators.csrf import ensure_csrf_cookie
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.http import require_http_methods, require_safe
 
+from apps.core.services.ical import calendar_response, feed_window_start
 from apps.shanyraq.models import Shanyraq
 from apps.skills.models import Skill, UserSkill
 
@@ -21,7 +27,7 @@ def profile_edit_view(request):
     if request.method == "POST":
         form = ProfileEditForm(request.POST, request.FILES, instance=profile)
         if form.is_valid():
-            form.save()
+            form.save(commit=False).save(update_fields=form.changed_data)
             messages.success(request, "Profile updated successfully!")
             return redirect("accounts:profile")
     else:
@@ -64,7 +70,7 @@ def profile_view(request):
 
             # Update interests
             profile.interests = interests
-            profile.save()
+            profile.save(update_fields=["interests"])
 
             messages.success(request, "Skills updated successfully!")
             return redirect("accounts:profile")
@@ -77,6 +83,9 @@ def profile_view(request):
     context = {
         "profile": profile,
         "section_name": "Profile",
+        "calendar_feed_url": request.build_absolute_uri(
+            reverse("accounts:calendar_feed", args=[calendar_feed_token(profile)])
+        ),
         "all_skills": all_skills,
         "user_skill_ids": user_skill_ids,
         "user_skill_levels": user_skill_levels,
@@ -133,7 +142,7 @@ def onboarding_save_view(request):
     if request.FILES.get("avatar"):
         profile.avatar = request.FILES["avatar"]
     profile.onboarding_completed = True
-    profile.save()
+    profile.save(update_fields=["class_name", "shanyraq", "avatar", "onboarding_completed"])
     messages.success(request, "Profile updated. Welcome!")
     return redirect("accounts:profile")
 
@@ -148,5 +157,68 @@ def theme_save_view(request):
         return JsonResponse({"ok": False}, status=400)
     profile = request.user.get_profile()
     profile.theme = theme
-    profile.save()
+    profile.save(update_fields=["theme"])
     return JsonResponse({"ok": True})
+
+
+CALENDAR_FEED_SALT = "accounts.calendar-feed"
+
+
+def calendar_feed_token(profile):
+    """
+    Signed, URL-safe token for the user's personal calendar feed. It carries the profile's
+    calendar_feed_key (issued on first use), so rotating the key revokes every old link.
+    """
+    key = profile.calendar_feed_key or profile.rotate_calendar_feed_key()
+    return signing.dumps([profile.user_id, key], salt=CALENDAR_FEED_SALT)
+
+
+@login_required
+@require_http_methods(["POST"])
+def calendar_feed_reset_view(request):
+    """Revoke the current calendar feed link and issue a new one."""
+    request.user.get_profile().rotate_calendar_feed_key()
+    messages.success(request, "Calendar feed link reset. Subscribe again with the new link.")
+    return redirect("accounts:profile")
+
+
+@require_safe
+def calendar_feed_view(request, token):
+    """
+    Personal iCalendar feed: the user's own bookings and events.
+    Authenticated by the signed token in the URL, since calendar apps cannot log in.
+    """
+    from apps.events.models import Event, EventStatus, RegistrationStatus
+    from apps.events.views import event_vevents
+    from apps.spaces.models import BookingStatus, SpaceBooking
+    from apps.spaces.views import booking_vevents
+
+    try:
+        user_id, key = signing.loads(token, salt=CALENDAR_FEED_SALT)
+    except (signing.BadSignature, TypeError, ValueError):
+        raise Http404
+    if not key:
+        raise Http404
+    user = get_object_or_404(User, pk=user_id, is_active=True, profile__calendar_feed_key=key)
+
+    since = feed_window_start()
+    booking_window = SpaceBooking.objects.filter(booked_by=user, end_time__gte=since)
+    # Events the user organises or is registered for
+    event_window = Event.objects.filter(
+        Q(created_by=user)
+        | Q(registrations__user=user, registrations__status=RegistrationStatus.REGISTERED),
+        end_at__gte=since,
+    ).distinct()
+    bookings = (
+        booking_window.filter(status__in=(BookingStatus.PENDING, BookingStatus.APPROVED))
+        .select_related("space")
+        .order_by("start_time")
+    )
+    events = event_window.filter(status__in=(EventStatus.PENDING, EventStatus.APPROVED)).order_by("start_at")
+    return calendar_response(
+        request,
+        filename="my-schedule.ics",
+        name="My NIS schedule",
+        events=chain(booking_vevents(bookings), event_vevents(events)),
+        version_querysets=[booking_window, event_window],
+    )
@@ -0,0 +1,21 @@
+"""
+Middleware: run every request in the school timezone.
+"""
+from django.utils import timezone
+
+from apps.core.services.timeline import school_timezone
+
+
+class SchoolTimezoneMiddleware:
+    """
+    Activate settings.SCHOOL_TIME_ZONE for the request, so form datetimes are parsed,
+    make_aware()/localdate() resolve and templates render in school-local time
+    (storage stays in UTC).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with timezone.override(school_timezone()):
+            return self.get_response(request)
@@ -11,6 +11,13 @@ def user_is_moderator(user):
     return getattr(user, 'is_moderator', False)
 
 
+def user_can_review(user):
+    """Approve/reject events and bookings: admin/teacher role, or staff (the moderation dashboard gate)."""
+    if not user or not user.is_authenticated:
+        return False
+    return user.is_staff or getattr(user, 'is_moderator', False)
+
+
 def user_is_admin(user):
     if not user or not user.is_authenticated:
         return False
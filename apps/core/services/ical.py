@@ -0,0 +1,122 @@
+"""
+Minimal iCalendar (RFC 5545) writer for read-only feeds.
+Feeds are generated line by line so views can stream them over .iterator().
+"""
+from datetime import timedelta
+from datetime import timezone as dt_timezone
+
+from django.db.models import Count, Max
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+ICS_CONTENT_TYPE = "text/calendar; charset=utf-8"
+PRODID = "-//NIS SuperApp//Calendar//EN"
+FEED_PAST_DAYS = 90  # feeds skip items that ended longer ago than this
+
+
+def feed_window_start():
+    """Oldest end time included in feeds."""
+    return timezone.now() - timedelta(days=FEED_PAST_DAYS)
+
+
+def ical_escape(value):
+    """Escape TEXT values: backslash, semicolon, comma and newlines."""
+    return (
+        str(value or "")
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def ical_datetime(value):
+    """UTC DATE-TIME form, e.g. 20260301T140000Z."""
+    return value.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def fold_line(line):
+    """Fold a content line at 75 octets, continuation lines start with a space."""
+    raw = line.encode("utf-8")
+    if len(raw) <= 75:
+        return line + "\r\n"
+    parts = []
+    limit = 75
+    while raw:
+        cut = min(limit, len(raw))
+        # Never split inside a multi-byte UTF-8 sequence
+        while cut < len(raw) and (raw[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(raw[:cut].decode("utf-8"))
+        raw = raw[cut:]
+        limit = 74
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def vevent(uid, start, end, summary, description="", location="", stamp=None, status="CONFIRMED"):
+    """Content lines (unfolded) for a single VEVENT."""
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{ical_datetime(stamp or start)}",
+        f"DTSTART:{ical_datetime(start)}",
+        f"DTEND:{ical_datetime(end)}",
+        f"SUMMARY:{ical_escape(summary)}",
+        f"STATUS:{status}",
+    ]
+    if description:
+        lines.append(f"DESCRIPTION:{ical_escape(description)}")
+    if location:
+        lines.append(f"LOCATION:{ical_escape(location)}")
+    lines.append("END:VEVENT")
+    return lines
+
+
+def stream_calendar(name, events):
+    """
+    Yield a whole VCALENDAR as folded lines.
+    `events` is an iterable of line lists as returned by vevent().
+    """
+    for line in ("BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}", "CALSCALE:GREGORIAN", f"X-WR-CALNAME:{ical_escape(name)}"):
+        yield fold_line(line)
+    for lines in events:
+        yield "".join(fold_line(line) for line in lines)
+    yield fold_line("END:VCALENDAR")
+
+
+def feed_version(*querysets):
+    """
+    (last_modified, etag) for a feed built from the given querysets, from one
+    Max(updated_at)/Count aggregate each. The count catches rows leaving the feed.
+    """
+    last_modified = None
+    parts = []
+    for qs in querysets:
+        agg = qs.order_by().aggregate(last=Max("updated_at"), n=Count("pk"))
+        parts.append(f"{agg['n']}@{agg['last'].timestamp() if agg['last'] else 0}")
+        if agg["last"] and (last_modified is None or agg["last"] > last_modified):
+            last_modified = agg["last"]
+    return last_modified, "-".join(parts)
+
+
+def calendar_response(request, filename, name, events, version_querysets):
+    """
+    Streaming text/calendar response with ETag/Last-Modified, or a 304 when the
+    client's copy is current. `events` is only consumed when the feed is sent, so
+    pass a generator that iterates the queryset with .iterator().
+    """
+    last_modified, version = feed_version(*version_querysets)
+    etag = quote_etag(version)
+    last_modified_ts = int(last_modified.timestamp()) if last_modified else None
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified_ts)
+    if not_modified is not None:
+        return not_modified
+    response = StreamingHttpResponse(stream_calendar(name, events), content_type=ICS_CONTENT_TYPE)
+    response["ETag"] = etag
+    if last_modified_ts:
+        response["Last-Modified"] = http_date(last_modified_ts)
+    response["Content-Disposition"] = f'inline; filename="{filename}"'
+    return response
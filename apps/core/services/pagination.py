@@ -0,0 +1,43 @@
+"""
+Keyset (cursor) pagination: pages by (field, pk) instead of OFFSET, so deep pages
+cost the same as the first one when (field) is indexed.
+"""
+from datetime import datetime
+
+from django.db.models import Q
+from django.utils.encoding import force_str
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+
+
+def encode_cursor(value, pk):
+    """Opaque URL-safe cursor for a (datetime, pk) position."""
+    return urlsafe_base64_encode(f"{value.isoformat()}|{pk}".encode())
+
+
+def decode_cursor(cursor):
+    """(datetime, pk) from encode_cursor(), or None when the cursor is missing or malformed."""
+    if not cursor:
+        return None
+    try:
+        value, pk = force_str(urlsafe_base64_decode(cursor)).split("|")
+        return datetime.fromisoformat(value), int(pk)
+    except (ValueError, TypeError):
+        return None
+
+
+def keyset_page(queryset, field, cursor=None, page_size=20, descending=False):
+    """
+    One page of queryset ordered by (field, pk), starting after `cursor`.
+    Returns (items, next_cursor); next_cursor is None on the last page.
+    """
+    position = decode_cursor(cursor)
+    op = "lt" if descending else "gt"
+    if position:
+        value, pk = position
+        queryset = queryset.filter(Q(**{f"{field}__{op}": value}) | Q(**{field: value, f"pk__{op}": pk}))
+    order = (f"-{field}", "-pk") if descending else (field, "pk")
+    items = list(queryset.order_by(*order)[: page_size + 1])
+    if len(items) <= page_size:
+        return items, None
+    last = items[page_size - 1]
+    return items[:page_size], encode_cursor(getattr(last, field), last.pk)
@@ -0,0 +1,60 @@
+"""
+Calendar helpers: school-local day boundaries and interval-to-day bucketing.
+"""
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.utils import timezone
+
+
+def school_timezone():
+    """Timezone calendars are drawn in (settings.SCHOOL_TIME_ZONE, falling back to TIME_ZONE)."""
+    return ZoneInfo(getattr(settings, "SCHOOL_TIME_ZONE", None) or settings.TIME_ZONE)
+
+
+def local_midnight(day, tz=None):
+    """Aware datetime for 00:00 of `day` in tz (school timezone by default)."""
+    return datetime.combine(day, time.min, tzinfo=tz or school_timezone())
+
+
+def bucket_by_day(items, first_day, days, start_attr="start_time", end_attr="end_time", tz=None):
+    """
+    Split intervals across every local day they cover within [first_day, first_day + days).
+
+    Returns {date: [segment, ...]} with a key for every day in the range. Each segment is
+    a dict with the original "item", its clipped local "start"/"end" for that day and
+    "continues_before"/"continues_after" flags. Items sorted by start keep their order
+    within each day. Runs in O(items + segments); no per-day scans.
+    """
+    tz = tz or school_timezone()
+    last_day = first_day + timedelta(days=days - 1)
+    buckets = {first_day + timedelta(days=i): [] for i in range(days)}
+    for item in items:
+        start = getattr(item, start_attr).astimezone(tz)
+        end = getattr(item, end_attr).astimezone(tz)
+        if end <= start:
+            continue
+        start_day = start.date()
+        # An interval ending exactly at midnight does not touch the next day
+        end_day = (end - timedelta(microseconds=1)).date()
+        day = max(start_day, first_day)
+        stop = min(end_day, last_day)
+        while day <= stop:
+            day_start = local_midnight(day, tz)
+            day_end = local_midnight(day + timedelta(days=1), tz)
+            buckets[day].append({
+                "item": item,
+                "start": max(start, day_start),
+                "end": min(end, day_end),
+                "continues_before": start < day_start,
+                "continues_after": end > day_end,
+            })
+            day += timedelta(days=1)
+    return buckets
+
+
+def local_week_start(week_offset=0, tz=None):
+    """Monday (date) of the current school-local week, shifted by week_offset weeks."""
+    today = timezone.localdate(timezone=tz or school_timezone())
+    return today - timedelta(days=today.weekday()) + timedelta(weeks=week_offset)
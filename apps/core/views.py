@@ -6,7 +6,6 @@ from django.views.generic import TemplateView
 
 from apps.accounts.models import User, UserProfile
 from apps.events.models import Event
-from apps.notifications.models import Notification
 from apps.season.models import Quest, UserQuestProgress
 
 from .mixins import BaseTemplateMixin
@@ -75,11 +74,6 @@ class HomeView(BaseTemplateMixin, TemplateView):
                 quest.progress = quest_progress_map[quest.id]
 
             context["active_quests"] = active_quests
-            try:
-                context["unread_notifications_count"] = Notification.objects.filter(
-                    user=user, is_read=False
-                ).count()
-            except Exception:
-                context["unread_notifications_count"] = 0
+            context["unread_notifications_count"] = user_profile.unread_notifications
 
         return context
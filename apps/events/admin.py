@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 
-from .models import Event, EventApplication, EventApprovalLog, EventPolicy
+from .models import Event, EventApplication, EventApprovalLog, EventDraft, EventPolicy, EventRegistration
 
 
 @admin.register(EventPolicy)
@@ -16,8 +16,8 @@ class EventAdmin(admin.ModelAdmin):
     list_display = ("title", "status_badge", "start_at", "end_at", "location", "created_by", "created_at")
     list_filter = ("status", "created_at")
     search_fields = ("title", "description", "location")
-    raw_id_fields = ("created_by", "policy")
-    readonly_fields = ("created_at", "updated_at")
+    raw_id_fields = ("created_by", "policy", "space", "booking")
+    readonly_fields = ("created_at", "updated_at", "closed_at")
     date_hierarchy = "start_at"
 
     def status_badge(self, obj):
@@ -46,3 +46,20 @@ class EventApprovalLogAdmin(admin.ModelAdmin):
     list_filter = ("to_status", "created_at")
     raw_id_fields = ("event", "changed_by")
     readonly_fields = ("event", "from_status", "to_status", "changed_by", "comment", "created_at")
+
+
+@admin.register(EventRegistration)
+class EventRegistrationAdmin(admin.ModelAdmin):
+    list_display = ("event", "user", "status", "registered_at", "checked_in_at", "xp_awarded")
+    list_filter = ("status", "checked_in_at")
+    search_fields = ("event__title", "user__email")
+    raw_id_fields = ("event", "user", "checked_in_by")
+    readonly_fields = ("registered_at", "xp_awarded")
+
+
+@admin.register(EventDraft)
+class EventDraftAdmin(admin.ModelAdmin):
+    list_display = ("user", "title", "start_at", "updated_at")
+    search_fields = ("title", "user__email")
+    raw_id_fields = ("user", "space")
+    readonly_fields = ("updated_at",)
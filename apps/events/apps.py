@@ -6,3 +6,6 @@ class EventsConfig(AppConfig):
     name = 'apps.events'
     label = 'events'
     verbose_name = 'Events'
+
+    def ready(self):
+        import apps.events.signals  # noqa
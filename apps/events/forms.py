@@ -3,6 +3,8 @@ Event creation wizard forms and approval forms.
 """
 from django import forms
 
+from apps.spaces.models import Space
+
 from .models import EventPolicy, EventStatus
 
 
@@ -23,6 +25,16 @@ class EventWizardStep2Form(forms.Form):
         input_formats=["%Y-%m-%dT%H:%M", "%Y-%m-%d %H:%M", "%Y-%m-%d"],
     )
     location = forms.CharField(max_length=255, required=False, widget=forms.TextInput(attrs={"class": "input-field", "placeholder": "Venue or room"}))
+    space = forms.ModelChoiceField(
+        queryset=Space.objects.none(),
+        required=False,
+        empty_label="— No room booking —",
+        widget=forms.Select(attrs={"class": "input-field"}),
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["space"].queryset = Space.objects.filter(is_active=True)
 
     def clean(self):
         data = super().clean()
@@ -57,3 +69,33 @@ class EventApproveRejectForm(forms.Form):
         if data.get("action") == "reject" and not (data.get("comment") or "").strip():
             self.add_error("comment", "Please provide a reason for rejection.")
         return data
+
+
+class CheckInForm(forms.Form):
+    """Bulk check-in: scanned user IDs, emails or usernames, one per line (or comma separated)."""
+    identifiers = forms.CharField(
+        widget=forms.Textarea(attrs={"class": "input-field", "rows": 6, "placeholder": "Scan or paste IDs / emails, one per line", "autofocus": True}),
+    )
+
+
+class CloseEventForm(forms.Form):
+    """Close attendance and award XP to each checked-in attendee."""
+    attendance_xp = forms.IntegerField(min_value=0, max_value=1000, widget=forms.NumberInput(attrs={"class": "input-field"}))
+
+
+class EventSearchForm(forms.Form):
+    """Keyword search with optional status and date filters (GET)."""
+    q = forms.CharField(max_length=200, required=False, widget=forms.TextInput(attrs={"class": "input-field", "placeholder": "Search events", "type": "search"}))
+    status = forms.ChoiceField(required=False, widget=forms.Select(attrs={"class": "input-field"}))
+    date_from = forms.DateField(required=False, widget=forms.DateInput(attrs={"class": "input-field", "type": "date"}))
+    date_to = forms.DateField(required=False, widget=forms.DateInput(attrs={"class": "input-field", "type": "date"}))
+
+    def __init__(self, *args, statuses=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["status"].choices = [("", "Any status")] + [(s.value, s.label) for s in statuses]
+
+    def clean(self):
+        data = super().clean()
+        if data.get("date_from") and data.get("date_to") and data["date_to"] < data["date_from"]:
+            self.add_error("date_to", "End date must be on or after the start date.")
+        return data
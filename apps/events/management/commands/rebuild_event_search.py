@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.events.search import rebuild_index, search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the event full-text search index (after bulk imports or queryset.update() on titles)"
+
+    def handle(self, *args, **options):
+        backend = search_backend()
+        if backend is None:
+            self.stdout.write(self.style.WARNING("No search index on this database; search uses icontains."))
+            return
+        count = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} event(s) ({backend})."))
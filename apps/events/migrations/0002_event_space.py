@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0001_events_initial'),
+        ('spaces', '0004_booking_expiry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='booking',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='event', to='spaces.spacebooking'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='space',
+            field=models.ForeignKey(blank=True, help_text='Room reserved for the event (a booking is created on submit)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='events', to='spaces.space'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['space', 'start_at', 'end_at'], name='events_even_space_i_c9a576_idx'),
+        ),
+    ]
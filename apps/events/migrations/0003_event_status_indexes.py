@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_event_space'),
+        ('spaces', '0004_booking_expiry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['status', 'start_at'], name='events_even_status_76ecd8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['status', 'end_at'], name='events_even_status_ddf18f_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_event_status_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='attendance_xp',
+            field=models.PositiveIntegerField(default=0, help_text='XP each checked-in attendee gets when the event is closed'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='closed_at',
+            field=models.DateTimeField(blank=True, help_text='Set when attendance XP has been awarded', null=True),
+        ),
+        migrations.CreateModel(
+            name='EventRegistration',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('registered', 'Registered'), ('cancelled', 'Cancelled')], default='registered', max_length=20)),
+                ('registered_at', models.DateTimeField(auto_now_add=True)),
+                ('checked_in_at', models.DateTimeField(blank=True, null=True)),
+                ('xp_awarded', models.PositiveIntegerField(default=0)),
+                ('checked_in_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='event_check_ins', to=settings.AUTH_USER_MODEL)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='registrations', to='events.event')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='event_registrations', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'event registration',
+                'verbose_name_plural': 'event registrations',
+                'ordering': ['registered_at'],
+                'indexes': [models.Index(fields=['event', 'checked_in_at'], name='events_even_event_i_14013d_idx')],
+                'unique_together': {('event', 'user')},
+            },
+        ),
+    ]
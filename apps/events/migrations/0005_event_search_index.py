@@ -0,0 +1,55 @@
+from django.db import migrations
+from django.db.utils import OperationalError
+
+
+def create_search_index(apps, schema_editor):
+    """FTS5 table on SQLite, tsvector side table on PostgreSQL; other backends search with icontains."""
+    vendor = schema_editor.connection.vendor
+    # Forget a backend detected before the table existed (see apps.events.search.search_backend)
+    schema_editor.connection.__dict__.pop("_event_search_backend", None)
+    if vendor == "sqlite":
+        try:
+            schema_editor.execute(
+                "CREATE VIRTUAL TABLE events_event_fts USING fts5("
+                "title, description, location, tokenize='unicode61 remove_diacritics 2')"
+            )
+        except OperationalError:
+            # SQLite built without FTS5: search falls back to icontains
+            return
+        schema_editor.execute(
+            "INSERT INTO events_event_fts (rowid, title, description, location) "
+            "SELECT id, title, description, location FROM events_event"
+        )
+    elif vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE TABLE events_event_search ("
+            "event_id bigint PRIMARY KEY REFERENCES events_event (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+            "document tsvector NOT NULL)"
+        )
+        schema_editor.execute("CREATE INDEX events_event_search_gin ON events_event_search USING gin (document)")
+        schema_editor.execute(
+            "INSERT INTO events_event_search (event_id, document) SELECT id, "
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'C') || "
+            "setweight(to_tsvector('simple', coalesce(location, '')), 'B') FROM events_event"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    schema_editor.connection.__dict__.pop("_event_search_backend", None)
+    if vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS events_event_fts")
+    elif vendor == "postgresql":
+        schema_editor.execute("DROP TABLE IF EXISTS events_event_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0004_event_registration'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
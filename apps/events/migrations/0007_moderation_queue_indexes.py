@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_event_draft'),
+        ('spaces', '0005_moderation_queue_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['status', 'created_at'], name='events_even_status_72a590_idx'),
+        ),
+    ]
@@ -5,6 +5,9 @@ Status flow: Draft -> Pending -> Approved -> Rejected
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
+
+from apps.core.permissions import user_can_review
 
 
 class EventStatus(models.TextChoices):
@@ -38,6 +41,21 @@ class Event(models.Model):
     start_at = models.DateTimeField()
     end_at = models.DateTimeField()
     location = models.CharField(max_length=255, blank=True)
+    space = models.ForeignKey(
+        "spaces.Space",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="events",
+        help_text="Room reserved for the event (a booking is created on submit)",
+    )
+    booking = models.OneToOneField(
+        "spaces.SpaceBooking",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="event",
+    )
     status = models.CharField(
         max_length=20,
         choices=EventStatus.choices,
@@ -59,11 +77,19 @@ class Event(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     rejection_comment = models.TextField(blank=True, help_text="Set when status is Rejected")
+    attendance_xp = models.PositiveIntegerField(default=0, help_text="XP each checked-in attendee gets when the event is closed")
+    closed_at = models.DateTimeField(null=True, blank=True, help_text="Set when attendance XP has been awarded")
 
     class Meta:
         verbose_name = "event"
         verbose_name_plural = "events"
         ordering = ["-start_at"]
+        indexes = [
+            models.Index(fields=["space", "start_at", "end_at"]),
+            models.Index(fields=["status", "start_at"]),
+            models.Index(fields=["status", "end_at"]),
+            models.Index(fields=["status", "created_at"]),
+        ]
 
     def __str__(self):
         return self.title
@@ -108,10 +134,24 @@ class Event(models.Model):
         return (self.created_by and self.created_by.id == user.id and self.status == EventStatus.DRAFT)
 
     def can_approve_or_reject(self, user):
-        """Admin or Teacher can approve/reject when pending."""
+        """A reviewer (Admin, Teacher, staff) can approve/reject when pending."""
+        return user_can_review(user) and self.status == EventStatus.PENDING
+
+    @property
+    def is_closed(self):
+        return self.closed_at is not None
+
+    def can_register(self, user):
+        """Any signed-in user can RSVP to an approved event that has not ended."""
         if not user.is_authenticated:
             return False
-        return getattr(user, "role", None) in ("admin", "teacher") and self.status == EventStatus.PENDING
+        return self.status == EventStatus.APPROVED and not self.is_closed and self.end_at > timezone.now()
+
+    def can_check_in(self, user):
+        """Creator or a reviewer (Admin, Teacher, staff) can check attendees in until the event is closed."""
+        if not user.is_authenticated or self.status != EventStatus.APPROVED or self.is_closed:
+            return False
+        return user_can_review(user) or self.created_by_id == user.id
 
 
 class EventApplication(models.Model):
@@ -137,6 +177,45 @@ class EventApplication(models.Model):
         return f"Application for {self.event.title}"
 
 
+class EventDraft(models.Model):
+    """Creation wizard progress, one per user; each step writes only its own fields."""
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="event_draft",
+    )
+    title = models.CharField(max_length=255, blank=True)
+    description = models.TextField(blank=True)
+    start_at = models.DateTimeField(null=True, blank=True)
+    end_at = models.DateTimeField(null=True, blank=True)
+    location = models.CharField(max_length=255, blank=True)
+    space = models.ForeignKey(
+        "spaces.Space",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "event draft"
+        verbose_name_plural = "event drafts"
+
+    def __str__(self):
+        return f"Draft by {self.user}: {self.title or '(untitled)'}"
+
+    @property
+    def has_details(self):
+        """Step 1 done."""
+        return bool(self.title)
+
+    @property
+    def has_schedule(self):
+        """Step 2 done."""
+        return self.start_at is not None and self.end_at is not None
+
+
 class EventApprovalLog(models.Model):
     """Status change history: who changed status, when, and optional comment."""
     event = models.ForeignKey(
@@ -162,3 +241,53 @@ class EventApprovalLog(models.Model):
 
     def __str__(self):
         return f"{self.event.pk}: {self.from_status} → {self.to_status}"
+
+
+class RegistrationStatus(models.TextChoices):
+    REGISTERED = "registered", "Registered"
+    CANCELLED = "cancelled", "Cancelled"
+
+
+class EventRegistration(models.Model):
+    """RSVP and attendance of one user at one event (walk-ins get a row at check-in)."""
+    event = models.ForeignKey(
+        Event,
+        on_delete=models.CASCADE,
+        related_name="registrations",
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="event_registrations",
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=RegistrationStatus.choices,
+        default=RegistrationStatus.REGISTERED,
+    )
+    registered_at = models.DateTimeField(auto_now_add=True)
+    checked_in_at = models.DateTimeField(null=True, blank=True)
+    checked_in_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="event_check_ins",
+    )
+    xp_awarded = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "event registration"
+        verbose_name_plural = "event registrations"
+        ordering = ["registered_at"]
+        unique_together = [["event", "user"]]
+        indexes = [
+            models.Index(fields=["event", "checked_in_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user.email} @ {self.event.title}"
+
+    @property
+    def attended(self):
+        return self.checked_in_at is not None
@@ -0,0 +1,155 @@
+"""
+Full-text event search over title, description and location.
+
+SQLite uses an FTS5 table (events_event_fts, rowid = event id) ranked by bm25;
+PostgreSQL uses a weighted tsvector side table (events_event_search) with a GIN index
+ranked by ts_rank. Both are created by migration 0005 and kept in sync by signals
+(see apps/events/signals.py); `manage.py rebuild_event_search` refills them after
+bulk writes. Other backends, or a SQLite build without FTS5, fall back to icontains.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+
+from .models import Event
+
+SQLITE_TABLE = "events_event_fts"
+POSTGRES_TABLE = "events_event_search"
+SEARCH_FIELDS = ("title", "description", "location")
+
+# Column weights: title matters most, then location, then description
+_SQLITE_RANK = f"bm25({SQLITE_TABLE}, 10.0, 1.0, 4.0)"
+_POSTGRES_DOCUMENT = (
+    "setweight(to_tsvector('simple', coalesce(%s, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(%s, '')), 'C') || "
+    "setweight(to_tsvector('simple', coalesce(%s, '')), 'B')"
+)
+
+
+def search_backend():
+    """'fts5', 'postgres' or None (icontains fallback), checked once per connection."""
+    backend = getattr(connection, "_event_search_backend", "unknown")
+    if backend == "unknown":
+        tables = connection.introspection.table_names()
+        if connection.vendor == "sqlite" and SQLITE_TABLE in tables:
+            backend = "fts5"
+        elif connection.vendor == "postgresql" and POSTGRES_TABLE in tables:
+            backend = "postgres"
+        else:
+            backend = None
+        connection._event_search_backend = backend
+    return backend
+
+
+def query_terms(query):
+    """Word tokens of a user query; punctuation and search operators are dropped."""
+    return re.findall(r"\w+", query or "")[:10]
+
+
+def index_event(event):
+    """Insert or refresh one event in the search index."""
+    backend = search_backend()
+    values = [getattr(event, field) or "" for field in SEARCH_FIELDS]
+    with connection.cursor() as cursor:
+        if backend == "fts5":
+            cursor.execute(f"DELETE FROM {SQLITE_TABLE} WHERE rowid = %s", [event.pk])
+            cursor.execute(
+                f"INSERT INTO {SQLITE_TABLE} (rowid, title, description, location) VALUES (%s, %s, %s, %s)",
+                [event.pk, *values],
+            )
+        elif backend == "postgres":
+            cursor.execute(
+                f"INSERT INTO {POSTGRES_TABLE} (event_id, document) VALUES (%s, {_POSTGRES_DOCUMENT}) "
+                "ON CONFLICT (event_id) DO UPDATE SET document = EXCLUDED.document",
+                [event.pk, *values],
+            )
+
+
+def unindex_event(event_id):
+    """Remove one event from the search index."""
+    backend = search_backend()
+    with connection.cursor() as cursor:
+        if backend == "fts5":
+            cursor.execute(f"DELETE FROM {SQLITE_TABLE} WHERE rowid = %s", [event_id])
+        elif backend == "postgres":
+            cursor.execute(f"DELETE FROM {POSTGRES_TABLE} WHERE event_id = %s", [event_id])
+
+
+def rebuild_index():
+    """Refill the whole index from the events table. Returns the number of events indexed."""
+    backend = search_backend()
+    with connection.cursor() as cursor:
+        if backend == "fts5":
+            cursor.execute(f"DELETE FROM {SQLITE_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {SQLITE_TABLE} (rowid, title, description, location) "
+                "SELECT id, title, description, location FROM events_event"
+            )
+        elif backend == "postgres":
+            cursor.execute(f"DELETE FROM {POSTGRES_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {POSTGRES_TABLE} (event_id, document) "
+                f"SELECT id, {_POSTGRES_DOCUMENT % ('title', 'description', 'location')} FROM events_event"
+            )
+        else:
+            return 0
+    return Event.objects.count()
+
+
+def _ranked_ids(terms, queryset, limit, offset):
+    """[(event_id, rank)] best first, restricted to the (filtered) queryset via a subquery."""
+    subquery, sub_params = queryset.order_by().values_list("pk").query.sql_with_params()
+    if search_backend() == "fts5":
+        # Quoted prefix terms, implicitly ANDed: no FTS syntax reaches MATCH.
+        # "+rowid" keeps FTS5 from re-running the MATCH once per filtered id.
+        match = " ".join('"%s"*' % term for term in terms)
+        sql = (
+            f"SELECT rowid, {_SQLITE_RANK} AS rank FROM {SQLITE_TABLE} "
+            f"WHERE {SQLITE_TABLE} MATCH %s AND +rowid IN ({subquery}) "
+            "ORDER BY rank LIMIT %s OFFSET %s"
+        )
+        params = [match, *sub_params, limit, offset]
+    else:
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        sql = (
+            f"SELECT event_id, ts_rank(document, to_tsquery('simple', %s)) AS rank FROM {POSTGRES_TABLE} "
+            f"WHERE document @@ to_tsquery('simple', %s) AND event_id IN ({subquery}) "
+            "ORDER BY rank DESC LIMIT %s OFFSET %s"
+        )
+        params = [tsquery, tsquery, *sub_params, limit, offset]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def search_events(query, queryset=None, limit=20, offset=0):
+    """
+    Events matching every word of `query` (prefix match), best match first.
+    `queryset` carries the caller's filters (status, dates, visibility).
+    Returns a list of Event objects with a `search_rank` attribute.
+    """
+    queryset = Event.objects.all() if queryset is None else queryset
+    terms = query_terms(query)
+    if not terms:
+        return []
+    if search_backend() is None:
+        matches, title_hit = Q(), Q()
+        for term in terms:
+            matches &= Q(title__icontains=term) | Q(description__icontains=term) | Q(location__icontains=term)
+            title_hit &= Q(title__icontains=term)
+        return list(
+            queryset.filter(matches)
+            .annotate(search_rank=Case(When(title_hit, then=Value(0)), default=Value(1), output_field=IntegerField()))
+            .order_by("search_rank", "-start_at")[offset : offset + limit]
+        )
+
+    ranked = _ranked_ids(terms, queryset, limit, offset)
+    by_id = queryset.in_bulk([event_id for event_id, _ in ranked])
+    events = []
+    for event_id, rank in ranked:
+        event = by_id.get(event_id)
+        if event is not None:
+            event.search_rank = rank
+            events.append(event)
+    return events
@@ -1,68 +1,469 @@
 """
-Event workflow: submit for approval, approve, reject, and log status changes.
+Event workflow: wizard drafts, submit for approval, approve, reject, and log status changes.
+Events with a space reserve it through the spaces booking engine (one shared conflict check).
 """
+import re
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Lower, TruncHour
 from django.utils import timezone
 
-from .models import Event, EventApplication, EventApprovalLog, EventStatus
+from apps.core.permissions import user_can_review
+from apps.core.services.timeline import local_midnight, school_timezone
+
+from apps.notifications.models import NotificationType
+from apps.notifications.services import build_notification, send_notifications
+from apps.shanyraq.models import SourceType
+from apps.shanyraq.services import XPService
+from apps.spaces.models import BookingStatus, SpaceBooking
+from apps.spaces.services import (
+    approve_booking,
+    bulk_approve_bookings,
+    bulk_reject_bookings,
+    create_booking,
+    reject_booking,
+)
+
+from .models import (
+    Event,
+    EventApplication,
+    EventApprovalLog,
+    EventDraft,
+    EventRegistration,
+    EventStatus,
+    RegistrationStatus,
+)
+
+User = get_user_model()
+
+
+def _reserve_space(event, user):
+    """Create the event's pending room booking if it has a space but no booking yet. Returns an error or None."""
+    if not event.space_id or event.booking_id:
+        return None
+    try:
+        _, err = create_booking(
+            event.space,
+            user,
+            event.start_at,
+            event.end_at,
+            purpose=f"Event: {event.title}",
+            event=event,
+        )
+    except ValidationError as e:
+        return " ".join(e.messages)
+    return err and f"Room not available: {err}"
+
+
+def get_wizard_draft(user):
+    """The user's in-progress wizard draft, or None."""
+    return EventDraft.objects.select_related("space").filter(user=user).first()
+
+
+def save_wizard_step(user, draft, **fields):
+    """
+    Store one wizard step. Creates the draft on the first step; afterwards only the
+    step's own columns (plus updated_at) are written. Returns the draft.
+    """
+    if draft is None:
+        return EventDraft.objects.create(user=user, **fields)
+    for name, value in fields.items():
+        setattr(draft, name, value)
+    draft.save(update_fields=[*fields, "updated_at"])
+    return draft
+
+
+def create_event_from_draft(draft, policy=None):
+    """Turn a completed wizard draft into a Draft event and drop the wizard draft. Returns (event, error)."""
+    if not draft.has_details or not draft.has_schedule:
+        return None, "The event details are incomplete."
+    space = draft.space if draft.space and draft.space.is_active else None
+    try:
+        with transaction.atomic():
+            event = Event.objects.create(
+                title=draft.title,
+                description=draft.description,
+                start_at=draft.start_at,
+                end_at=draft.end_at,
+                location=draft.location,
+                space=space,
+                status=EventStatus.DRAFT,
+                policy=policy,
+                created_by=draft.user,
+            )
+            draft.delete()
+    except ValidationError as e:
+        return None, " ".join(e.messages)
+    return event, None
+
+
+SCHEDULED_EVENT_STATUSES = (EventStatus.APPROVED, EventStatus.PENDING)
+OVERLAP_WARNING_LIMIT = 10
+
+
+def find_overlapping_events(event, limit=OVERLAP_WARNING_LIMIT):
+    """Approved/pending events (other than this one) whose time range overlaps it; one indexed query."""
+    return list(
+        Event.objects.filter(
+            status__in=SCHEDULED_EVENT_STATUSES,
+            start_at__lt=event.end_at,
+            end_at__gt=event.start_at,
+        )
+        .exclude(pk=event.pk)
+        .select_related("space")
+        .order_by("start_at")[:limit]
+    )
+
+
+def event_week_heatmap(week_start, tz=None):
+    """
+    Approved/pending events running in each hour of the week starting at `week_start` (a date).
+
+    One grouped query counts events per (first hour, last hour) pair in the school timezone;
+    the pairs are then spread over the hour slots they cover. Returns {"week_start",
+    "days": [date iso, ...], "hours": [[count x 24] x 7], "max"}.
+    """
+    tz = tz or school_timezone()
+    range_start = local_midnight(week_start, tz)
+    range_end = local_midnight(week_start + timedelta(days=7), tz)
+    spans = (
+        Event.objects.filter(status__in=SCHEDULED_EVENT_STATUSES, start_at__lt=range_end, end_at__gt=range_start)
+        # An event ending exactly on the hour does not occupy the next slot
+        .annotate(
+            first_hour=TruncHour("start_at", tzinfo=tz),
+            last_hour=TruncHour(F("end_at") - timedelta(microseconds=1), tzinfo=tz),
+        )
+        .values("first_hour", "last_hour")
+        .annotate(events=Count("id"))
+        .order_by()
+    )
+    hours = [[0] * 24 for _ in range(7)]
+    for span in spans:
+        slot = max(span["first_hour"], range_start).astimezone(tz)
+        last = min(span["last_hour"], range_end - timedelta(hours=1)).astimezone(tz)
+        while slot <= last:
+            hours[(slot.date() - week_start).days][slot.hour] += span["events"]
+            slot = (slot + timedelta(hours=1)).astimezone(tz)
+    return {
+        "week_start": week_start.isoformat(),
+        "days": [(week_start + timedelta(days=i)).isoformat() for i in range(7)],
+        "hours": hours,
+        "max": max(max(day) for day in hours),
+    }
 
 
 def submit_event_for_approval(event, user):
-    """Set event to Pending, create EventApplication and log."""
+    """
+    Set event to Pending, reserve its space (if any), create EventApplication and log.
+    Overlapping approved/pending events don't block submission; they are stored on
+    event.overlapping_events and noted in the log so creator and reviewer see them.
+    """
     if event.status != EventStatus.DRAFT:
         return False, "Event is not in draft."
     if event.created_by_id != user.id:
         return False, "Only the creator can submit."
-    old_status = event.status
-    event.status = EventStatus.PENDING
-    event.save(update_fields=["status", "updated_at"])
-    EventApplication.objects.get_or_create(event=event, defaults={"submitted_by": user})
-    EventApprovalLog.objects.create(
-        event=event,
-        from_status=old_status,
-        to_status=EventStatus.PENDING,
-        changed_by=user,
-        comment="Submitted for approval",
-    )
+    with transaction.atomic():
+        err = _reserve_space(event, user)
+        if err:
+            return False, err
+        event.overlapping_events = find_overlapping_events(event)
+        comment = "Submitted for approval"
+        if event.overlapping_events:
+            comment += f" (overlaps {len(event.overlapping_events)} scheduled event(s))"
+        old_status = event.status
+        event.status = EventStatus.PENDING
+        event.save(update_fields=["status", "updated_at"])
+        EventApplication.objects.get_or_create(event=event, defaults={"submitted_by": user})
+        EventApprovalLog.objects.create(
+            event=event,
+            from_status=old_status,
+            to_status=EventStatus.PENDING,
+            changed_by=user,
+            comment=comment,
+        )
     return True, None
 
 
 def approve_event(event, user, comment=""):
-    """Set event to Approved and log."""
+    """Set event to Approved together with its room booking, and log."""
     if event.status != EventStatus.PENDING:
         return False, "Event is not pending."
-    if user.role not in ("admin", "teacher"):
-        return False, "Only Admin or Teacher can approve."
-    old_status = event.status
-    event.status = EventStatus.APPROVED
-    event.rejection_comment = ""
-    event.save(update_fields=["status", "rejection_comment", "updated_at"])
-    EventApprovalLog.objects.create(
-        event=event,
-        from_status=old_status,
-        to_status=EventStatus.APPROVED,
-        changed_by=user,
-        comment=comment or "Approved",
-    )
+    if not user_can_review(user):
+        return False, "Only Admin, Teacher or staff can approve."
+    with transaction.atomic():
+        err = _reserve_space(event, user)
+        if err:
+            return False, err
+        booking = event.booking
+        if booking is not None:
+            if booking.status == BookingStatus.PENDING:
+                ok, err = approve_booking(booking, user, comment or "Approved with event")
+                if not ok:
+                    transaction.set_rollback(True)
+                    return False, f"Room booking: {err}"
+            elif booking.status != BookingStatus.APPROVED:
+                transaction.set_rollback(True)
+                return False, f"The room booking is {booking.get_status_display().lower()}; choose the room again."
+        old_status = event.status
+        event.status = EventStatus.APPROVED
+        event.rejection_comment = ""
+        event.save(update_fields=["status", "rejection_comment", "updated_at"])
+        EventApprovalLog.objects.create(
+            event=event,
+            from_status=old_status,
+            to_status=EventStatus.APPROVED,
+            changed_by=user,
+            comment=comment or "Approved",
+        )
+        _notify_creators([event], EventStatus.APPROVED, comment)
     return True, None
 
 
 def reject_event(event, user, comment):
-    """Set event to Rejected, set comment, and log."""
+    """Set event to Rejected, release its pending room booking, set comment, and log."""
     if event.status != EventStatus.PENDING:
         return False, "Event is not pending."
-    if user.role not in ("admin", "teacher"):
-        return False, "Only Admin or Teacher can reject."
+    if not user_can_review(user):
+        return False, "Only Admin, Teacher or staff can reject."
     if not (comment or "").strip():
         return False, "Rejection reason is required."
-    old_status = event.status
-    event.status = EventStatus.REJECTED
-    event.rejection_comment = comment.strip()
-    event.save(update_fields=["status", "rejection_comment", "updated_at"])
-    EventApprovalLog.objects.create(
-        event=event,
-        from_status=old_status,
-        to_status=EventStatus.REJECTED,
-        changed_by=user,
-        comment=comment.strip(),
+    with transaction.atomic():
+        if event.booking_id and event.booking.status == BookingStatus.PENDING:
+            reject_booking(event.booking, user, comment)
+        old_status = event.status
+        event.status = EventStatus.REJECTED
+        event.rejection_comment = comment.strip()
+        event.save(update_fields=["status", "rejection_comment", "updated_at"])
+        EventApprovalLog.objects.create(
+            event=event,
+            from_status=old_status,
+            to_status=EventStatus.REJECTED,
+            changed_by=user,
+            comment=comment.strip(),
+        )
+        _notify_creators([event], EventStatus.REJECTED, comment.strip())
+    return True, None
+
+
+def _notify_creators(events, status, comment=""):
+    """Tell each event's creator it was approved or rejected (one bulk INSERT)."""
+    if status == EventStatus.APPROVED:
+        notification_type, verb = NotificationType.EVENT_APPROVED, "approved"
+    else:
+        notification_type, verb = NotificationType.EVENT_REJECTED, "rejected"
+    send_notifications(
+        build_notification(
+            event.created_by_id,
+            f"Event {verb}: {event.title}",
+            f"Your event \"{event.title}\" was {verb}." + (f" Comment: {comment}" if comment else ""),
+            notification_type,
+            related=event,
+        )
+        for event in events
+        if event.created_by_id
+    )
+
+
+def _bulk_log_events(event_ids, user, from_status, to_status, comment):
+    EventApprovalLog.objects.bulk_create(
+        EventApprovalLog(event_id=pk, from_status=from_status, to_status=to_status, changed_by=user, comment=comment)
+        for pk in event_ids
     )
+
+
+def bulk_approve_events(event_ids, user, comment=""):
+    """
+    Approve the selected pending events in one transaction. Rooms are reserved with the
+    same conflict check as approve_event(), and pending room bookings go through
+    bulk_approve_bookings(), which skips any that overlap other bookings or room-only
+    events; events whose room can't be reserved or approved are skipped.
+    Returns ((approved_count, skipped_count), error).
+    """
+    if not user_can_review(user):
+        return (0, 0), "Only Admin, Teacher or staff can approve."
+    with transaction.atomic():
+        events = list(
+            Event.objects.filter(pk__in=event_ids, status=EventStatus.PENDING).select_related("space", "booking")
+        )
+        if not events:
+            return (0, 0), "No pending events selected."
+        ready, booking_ids = [], {}
+        for event in events:
+            if _reserve_space(event, user):
+                continue
+            booking = event.booking
+            if booking is None or booking.status == BookingStatus.APPROVED:
+                ready.append(event.pk)
+            elif booking.status == BookingStatus.PENDING:
+                booking_ids[booking.pk] = event.pk
+        if booking_ids:
+            bulk_approve_bookings(list(booking_ids), user, comment or "Approved with event")
+            ready += [
+                booking_ids[pk]
+                for pk in SpaceBooking.objects.filter(pk__in=booking_ids, status=BookingStatus.APPROVED).values_list(
+                    "pk", flat=True
+                )
+            ]
+        if ready:
+            Event.objects.filter(pk__in=ready).update(
+                status=EventStatus.APPROVED, rejection_comment="", updated_at=timezone.now()
+            )
+            _bulk_log_events(ready, user, EventStatus.PENDING, EventStatus.APPROVED, comment or "Approved (bulk)")
+            approved = set(ready)
+            _notify_creators([event for event in events if event.pk in approved], EventStatus.APPROVED, comment)
+    return (len(ready), len(events) - len(ready)), None
+
+
+def bulk_reject_events(event_ids, user, comment):
+    """Reject the selected pending events and release their pending room bookings. Returns (count, error)."""
+    if not user_can_review(user):
+        return 0, "Only Admin, Teacher or staff can reject."
+    if not (comment or "").strip():
+        return 0, "Rejection reason is required."
+    comment = comment.strip()
+    with transaction.atomic():
+        events = list(
+            Event.objects.filter(pk__in=event_ids, status=EventStatus.PENDING).only(
+                "pk", "title", "booking_id", "created_by_id"
+            )
+        )
+        if not events:
+            return 0, "No pending events selected."
+        ids = [event.pk for event in events]
+        booking_ids = list(
+            SpaceBooking.objects.filter(
+                pk__in=[event.booking_id for event in events if event.booking_id], status=BookingStatus.PENDING
+            ).values_list("pk", flat=True)
+        )
+        if booking_ids:
+            bulk_reject_bookings(booking_ids, user, comment)
+        Event.objects.filter(pk__in=ids).update(
+            status=EventStatus.REJECTED, rejection_comment=comment, updated_at=timezone.now()
+        )
+        _bulk_log_events(ids, user, EventStatus.PENDING, EventStatus.REJECTED, comment)
+        _notify_creators(events, EventStatus.REJECTED, comment)
+    return len(ids), None
+
+
+def register_for_event(event, user):
+    """RSVP (or re-RSVP after cancelling) to an approved upcoming event."""
+    if not event.can_register(user):
+        return None, "Registration is closed for this event."
+    registration, created = EventRegistration.objects.get_or_create(event=event, user=user)
+    if not created and registration.status != RegistrationStatus.REGISTERED:
+        registration.status = RegistrationStatus.REGISTERED
+        registration.save(update_fields=["status"])
+    return registration, None
+
+
+def cancel_registration(event, user):
+    """Withdraw an RSVP; attendees who already checked in stay registered."""
+    updated = EventRegistration.objects.filter(
+        event=event,
+        user=user,
+        status=RegistrationStatus.REGISTERED,
+        checked_in_at__isnull=True,
+    ).update(status=RegistrationStatus.CANCELLED)
+    if not updated:
+        return False, "You have no active registration to cancel."
     return True, None
+
+
+def resolve_attendees(identifiers):
+    """
+    Map scanned tokens (user IDs, emails or usernames; any separators) to users in one query.
+    Returns (users, unknown_tokens).
+    """
+    tokens = list(dict.fromkeys(t for t in re.split(r"[\s,;]+", identifiers or "") if t))
+    ids = {int(t) for t in tokens if t.isdigit()}
+    emails = {t.lower() for t in tokens if "@" in t}
+    usernames = {t.lower() for t in tokens if not t.isdigit() and "@" not in t}
+    if not tokens:
+        return [], []
+    users = list(
+        User.objects.annotate(email_lower=Lower("email"), username_lower=Lower("username"))
+        .filter(Q(pk__in=ids) | Q(email_lower__in=emails) | Q(username_lower__in=usernames), is_active=True)
+        .only("pk", "email", "username")
+    )
+    matched = set()
+    for user in users:
+        matched.update({str(user.pk), user.email.lower(), user.username.lower()})
+    unknown = [t for t in tokens if t.lower() not in matched]
+    return users, unknown
+
+
+def check_in_attendees(event, identifiers, by_user):
+    """
+    Bulk check-in from scanned IDs/emails: one lookup query, one UPDATE for registered
+    users and one bulk_create for walk-ins.
+    Returns ({"checked_in", "already", "unknown"}, error).
+    """
+    if not event.can_check_in(by_user):
+        return None, "Check-in is not open for this event."
+    users, unknown = resolve_attendees(identifiers)
+    if not users:
+        return {"checked_in": 0, "already": 0, "unknown": unknown}, None
+    user_ids = {u.pk for u in users}
+    now = timezone.now()
+    with transaction.atomic():
+        existing = dict(
+            EventRegistration.objects.filter(event=event, user_id__in=user_ids).values_list("user_id", "checked_in_at")
+        )
+        already = {uid for uid, checked_in_at in existing.items() if checked_in_at}
+        to_update = [uid for uid in existing if uid not in already]
+        EventRegistration.objects.filter(event=event, user_id__in=to_update).update(
+            status=RegistrationStatus.REGISTERED,
+            checked_in_at=now,
+            checked_in_by=by_user,
+        )
+        EventRegistration.objects.bulk_create([
+            EventRegistration(event=event, user_id=uid, checked_in_at=now, checked_in_by=by_user)
+            for uid in user_ids - existing.keys()
+        ])
+    return {"checked_in": len(user_ids) - len(already), "already": len(already), "unknown": unknown}, None
+
+
+def close_event(event, user, attendance_xp=None):
+    """
+    Close attendance and award attendance XP to every checked-in attendee in one batch
+    (see XPService.award_xp_bulk). Returns (awarded_count, error).
+    """
+    if not user_can_review(user):
+        return 0, "Only Admin, Teacher or staff can close an event."
+    if event.status != EventStatus.APPROVED:
+        return 0, "Only approved events can be closed."
+    if event.start_at > timezone.now():
+        return 0, "The event has not started yet."
+    xp = event.attendance_xp if attendance_xp is None else attendance_xp
+    now = timezone.now()
+    with transaction.atomic():
+        # Claim the close atomically so two moderators cannot award XP twice
+        if not Event.objects.filter(pk=event.pk, closed_at__isnull=True).update(
+            closed_at=now, attendance_xp=xp, updated_at=now
+        ):
+            return 0, "This event is already closed."
+        event.closed_at, event.attendance_xp = now, xp
+        attended = EventRegistration.objects.filter(event=event, checked_in_at__isnull=False)
+        attendee_ids = list(attended.values_list("user_id", flat=True))
+        awarded = XPService.award_xp_bulk(
+            attendee_ids,
+            xp,
+            reason=f"Attended: {event.title}"[:255],
+            source_type=SourceType.EVENT,
+            reference_id=event.pk,
+            approved_by=user,
+        )
+        if awarded:
+            attended.update(xp_awarded=xp)
+        EventApprovalLog.objects.create(
+            event=event,
+            from_status=event.status,
+            to_status=event.status,
+            changed_by=user,
+            comment=f"Closed: {len(attendee_ids)} attendee(s), {xp} XP each" if awarded else f"Closed: {len(attendee_ids)} attendee(s), no XP",
+        )
+    return awarded, None
@@ -0,0 +1,22 @@
+"""
+Signals for events app: keep the full-text search index in sync with events.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Event
+from .search import SEARCH_FIELDS, index_event, unindex_event
+
+
+@receiver(post_save, sender=Event)
+def update_event_search_index(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Reindex on save, unless the save only touched non-searchable fields (status, closed_at...)."""
+    if raw or (update_fields is not None and not set(SEARCH_FIELDS) & set(update_fields)):
+        return
+    index_event(instance)
+
+
+@receiver(post_delete, sender=Event)
+def remove_event_search_index(sender, instance, **kwargs):
+    unindex_event(instance.pk)
@@ -6,9 +6,15 @@ app_name = "events"
 
 urlpatterns = [
     path("", views.event_list_view, name="list"),
+    path("search/", views.event_search_view, name="search"),
+    path("heatmap/", views.event_heatmap_view, name="heatmap"),
+    path("calendar.ics", views.event_calendar_feed_view, name="calendar_feed"),
     path("create/<int:step>/", views.event_wizard_view, name="wizard"),
     path("review/", views.event_review_list_view, name="review_list"),
     path("<int:pk>/", views.event_detail_view, name="detail"),
     path("<int:pk>/submit/", views.event_submit_view, name="submit"),
     path("<int:pk>/review/", views.event_review_view, name="review"),
+    path("<int:pk>/register/", views.event_register_view, name="register"),
+    path("<int:pk>/check-in/", views.event_check_in_view, name="check_in"),
+    path("<int:pk>/close/", views.event_close_view, name="close"),
 ]
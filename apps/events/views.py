@@ -1,82 +1,212 @@
 """
 Events app: list, detail, creation wizard, submit, approve/reject, review panel.
 """
+import hashlib
+from datetime import timedelta
 
 from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
-from django.http import HttpResponseForbidden
+from django.core.cache import cache
+from django.http import HttpResponseBadRequest, HttpResponseForbidden, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
 from django.views.decorators.http import require_http_methods, require_safe
 
-from apps.accounts.decorators import event_creator_required, teacher_required
+from apps.accounts.decorators import event_creator_required, reviewer_required
+from apps.core.permissions import user_can_review
+from apps.core.services.ical import calendar_response, feed_window_start, vevent
+from apps.core.services.pagination import decode_cursor, keyset_page
+from apps.core.services.timeline import local_midnight, local_week_start, school_timezone
+from apps.spaces.services import check_booking_conflicts
 
 from .forms import (
+    CheckInForm,
+    CloseEventForm,
     EventApproveRejectForm,
+    EventSearchForm,
     EventWizardStep1Form,
     EventWizardStep2Form,
     EventWizardStep3Form,
 )
-from .models import Event, EventStatus
-from .services import approve_event, reject_event, submit_event_for_approval
+from .models import Event, EventRegistration, EventStatus, RegistrationStatus
+from .search import search_events
+from .services import (
+    approve_event,
+    cancel_registration,
+    check_in_attendees,
+    close_event,
+    create_event_from_draft,
+    event_week_heatmap,
+    find_overlapping_events,
+    get_wizard_draft,
+    register_for_event,
+    reject_event,
+    save_wizard_step,
+    submit_event_for_approval,
+)
 
 User = get_user_model()
-SESSION_WIZARD_KEY = "event_wizard_data"
+EVENT_LIST_TABS = ("upcoming", "planned", "past")
+EVENT_LIST_PAGE_SIZE = 20
+EVENT_LIST_ANON_CACHE_TIMEOUT = 60
+EVENT_SEARCH_PAGE_SIZE = 20
 
 
 def _get_upcoming_approved():
     """Events that are approved and start in the future."""
-    now = timezone.now()
-    return (
-        Event.objects.filter(status=EventStatus.APPROVED, start_at__gt=now)
-        .select_related("created_by")
-        .order_by("start_at")
-    )
+    return Event.objects.filter(status=EventStatus.APPROVED, start_at__gt=timezone.now())
 
 
 def _get_planned():
     """Draft or pending events (awaiting approval or not yet submitted)."""
-    return (
-        Event.objects.filter(status__in=(EventStatus.DRAFT, EventStatus.PENDING))
-        .select_related("created_by")
-        .order_by("-updated_at")
-    )
+    return Event.objects.filter(status__in=(EventStatus.DRAFT, EventStatus.PENDING))
 
 
 def _get_past():
     """Events that have ended (approved and end_at in the past)."""
-    now = timezone.now()
-    return (
-        Event.objects.filter(status=EventStatus.APPROVED, end_at__lt=now)
-        .select_related("created_by")
-        .order_by("-end_at")[:50]
-    )
+    return Event.objects.filter(status=EventStatus.APPROVED, end_at__lt=timezone.now())
+
+
+def _event_list_pages(cursors):
+    """{tab: (events, next_cursor)} for the three tabs, each paged by keyset."""
+    return {
+        "upcoming": keyset_page(_get_upcoming_approved(), "start_at", cursors["upcoming"], EVENT_LIST_PAGE_SIZE),
+        "planned": keyset_page(_get_planned(), "start_at", cursors["planned"], EVENT_LIST_PAGE_SIZE),
+        "past": keyset_page(_get_past(), "end_at", cursors["past"], EVENT_LIST_PAGE_SIZE, descending=True),
+    }
 
 
 @require_safe
 def event_list_view(request):
-    """Event list: Upcoming, Planned, Past tabs."""
-    upcoming = _get_upcoming_approved()
-    planned = _get_planned()
-    past = _get_past()
+    """Event list: Upcoming, Planned, Past tabs, each paginated with its own cursor."""
+    # Malformed cursors fall back to the first page (and share its cache entry)
+    cursors = {tab: request.GET.get(tab) if decode_cursor(request.GET.get(tab)) else None for tab in EVENT_LIST_TABS}
+    active_tab = request.GET.get("tab")
+    if active_tab not in EVENT_LIST_TABS:
+        active_tab = "upcoming"
+    if request.user.is_authenticated:
+        pages = _event_list_pages(cursors)
+    else:
+        # Anonymous visitors all see the same lists; cache the data, not the HTML (CSRF token)
+        position = "|".join(cursors[tab] or "" for tab in EVENT_LIST_TABS)
+        key = "events:list:" + hashlib.md5(position.encode(), usedforsecurity=False).hexdigest()
+        pages = cache.get(key)
+        if pages is None:
+            pages = _event_list_pages(cursors)
+            cache.set(key, pages, EVENT_LIST_ANON_CACHE_TIMEOUT)
     return render(
         request,
         "events/event_list.html",
         {
             "section_name": "Events",
-            "upcoming_events": upcoming,
-            "planned_events": planned,
-            "past_events": past,
+            "active_tab": active_tab,
+            "upcoming_events": pages["upcoming"][0],
+            "upcoming_next": pages["upcoming"][1],
+            "upcoming_cursor": cursors["upcoming"],
+            "planned_events": pages["planned"][0],
+            "planned_next": pages["planned"][1],
+            "planned_cursor": cursors["planned"],
+            "past_events": pages["past"][0],
+            "past_next": pages["past"][1],
+            "past_cursor": cursors["past"],
         },
     )
 
 
+@require_safe
+def event_search_view(request):
+    """Ranked keyword search over title, description and location, with status/date filters."""
+    # Draft and pending events are already public in the Planned tab; rejected ones are not
+    statuses = [EventStatus.APPROVED, EventStatus.PENDING, EventStatus.DRAFT]
+    if request.user.is_authenticated and request.user.is_moderator:
+        statuses.append(EventStatus.REJECTED)
+    form = EventSearchForm(request.GET or None, statuses=statuses)
+    results, has_next = [], False
+    try:
+        page = max(int(request.GET.get("page", 1)), 1)
+    except ValueError:
+        page = 1
+    if form.is_valid() and form.cleaned_data["q"].strip():
+        data = form.cleaned_data
+        events = Event.objects.filter(status__in=[data["status"]] if data["status"] else statuses)
+        tz = school_timezone()
+        if data["date_from"]:
+            events = events.filter(end_at__gte=local_midnight(data["date_from"], tz))
+        if data["date_to"]:
+            events = events.filter(start_at__lt=local_midnight(data["date_to"] + timedelta(days=1), tz))
+        # One extra row tells us whether there is a next page
+        results = search_events(
+            data["q"], events, limit=EVENT_SEARCH_PAGE_SIZE + 1, offset=(page - 1) * EVENT_SEARCH_PAGE_SIZE
+        )
+        has_next = len(results) > EVENT_SEARCH_PAGE_SIZE
+        results = results[:EVENT_SEARCH_PAGE_SIZE]
+    query = request.GET.copy()
+    query.pop("page", None)
+    return render(
+        request,
+        "events/event_search.html",
+        {
+            "section_name": "Events",
+            "form": form,
+            "results": results,
+            "page": page,
+            "has_next": has_next,
+            "query_string": query.urlencode(),
+        },
+    )
+
+
+@require_safe
+def event_heatmap_view(request):
+    """JSON: approved/pending events per hour slot for a school week (?week=offset from this week)."""
+    try:
+        week_offset = int(request.GET.get("week", 0))
+        if abs(week_offset) > 520:
+            raise ValueError
+    except ValueError:
+        return HttpResponseBadRequest("week must be a week offset between -520 and 520.")
+    tz = school_timezone()
+    return JsonResponse(event_week_heatmap(local_week_start(week_offset, tz), tz))
+
+
+def event_vevents(events):
+    """VEVENT line lists for events, streamed with .iterator()."""
+    for event in events.iterator(chunk_size=500):
+        yield vevent(
+            uid=f"event-{event.pk}@nis-superapp",
+            start=event.start_at,
+            end=event.end_at,
+            summary=event.title,
+            description=event.description,
+            location=event.location,
+            stamp=event.updated_at,
+            status="CONFIRMED" if event.status == EventStatus.APPROVED else "TENTATIVE",
+        )
+
+
+@require_safe
+def event_calendar_feed_view(request):
+    """iCalendar feed of approved school events."""
+    window = Event.objects.filter(end_at__gte=feed_window_start())
+    events = window.filter(status=EventStatus.APPROVED).order_by("start_at")
+    return calendar_response(
+        request,
+        filename="events.ics",
+        name="NIS Events",
+        events=event_vevents(events),
+        version_querysets=[window],
+    )
+
+
 @require_safe
 def event_detail_view(request, pk):
     """Event detail: show event and status; creator sees submit, moderator sees approve/reject."""
-    event = get_object_or_404(Event.objects.select_related("created_by", "policy"), pk=pk)
+    event = get_object_or_404(Event.objects.select_related("created_by", "policy", "space", "booking"), pk=pk)
     logs = event.approval_logs.select_related("changed_by").order_by("-created_at")[:20]  # type: ignore[union-attr]
+    registration = None
+    if request.user.is_authenticated:
+        registration = EventRegistration.objects.filter(event=event, user=request.user).first()
     return render(
         request,
         "events/event_detail.html",
@@ -84,64 +214,147 @@ def event_detail_view(request, pk):
             "section_name": "Events",
             "event": event,
             "approval_logs": logs,
+            "registration": registration,
+            "registered_count": event.registrations.filter(status=RegistrationStatus.REGISTERED).count(),  # type: ignore[attr-defined]
             "can_submit": event.can_submit(request.user),
             "can_approve_or_reject": event.can_approve_or_reject(request.user),
+            "can_register": event.can_register(request.user),
+            "can_check_in": event.can_check_in(request.user),
+            "can_review": user_can_review(request.user),
         },
     )
 
 
+@login_required
+@require_http_methods(["POST"])
+def event_register_view(request, pk):
+    """RSVP to an event, or withdraw the RSVP (action=cancel)."""
+    event = get_object_or_404(Event, pk=pk)
+    if request.POST.get("action") == "cancel":
+        ok, err = cancel_registration(event, request.user)
+        if ok:
+            messages.success(request, "Registration cancelled.")
+        else:
+            messages.error(request, err or "Could not cancel registration.")
+    else:
+        registration, err = register_for_event(event, request.user)
+        if registration:
+            messages.success(request, "You are registered for this event.")
+        else:
+            messages.error(request, err or "Could not register.")
+    return redirect("events:detail", pk=pk)
+
+
+@login_required
+@require_http_methods(["GET", "POST"])
+def event_check_in_view(request, pk):
+    """Attendance desk: bulk check-in by scanned IDs/emails; moderators can close the event."""
+    event = get_object_or_404(Event.objects.select_related("created_by"), pk=pk)
+    can_close = user_can_review(request.user) and event.status == EventStatus.APPROVED
+    if not (event.can_check_in(request.user) or can_close):
+        return HttpResponseForbidden()
+
+    result = None
+    form = CheckInForm()
+    if request.method == "POST":
+        form = CheckInForm(request.POST)
+        if form.is_valid():
+            result, err = check_in_attendees(event, form.cleaned_data["identifiers"], request.user)
+            if err:
+                messages.error(request, err)
+            else:
+                form = CheckInForm()
+
+    registrations = event.registrations.select_related("user").order_by("-checked_in_at", "registered_at")  # type: ignore[attr-defined]
+    return render(
+        request,
+        "events/event_check_in.html",
+        {
+            "section_name": "Events",
+            "event": event,
+            "form": form,
+            "result": result,
+            "registrations": registrations,
+            "attended_count": registrations.filter(checked_in_at__isnull=False).count(),
+            "can_check_in": event.can_check_in(request.user),
+            "can_close": can_close and not event.is_closed,
+            "close_form": CloseEventForm(initial={"attendance_xp": event.attendance_xp}),
+        },
+    )
+
+
+@reviewer_required
+@require_http_methods(["POST"])
+def event_close_view(request, pk):
+    """Close attendance and award XP to all checked-in attendees in one batch."""
+    event = get_object_or_404(Event, pk=pk)
+    form = CloseEventForm(request.POST)
+    if not form.is_valid():
+        messages.error(request, "Enter a valid XP amount.")
+        return redirect("events:check_in", pk=pk)
+    awarded, err = close_event(event, request.user, form.cleaned_data["attendance_xp"])
+    if err:
+        messages.error(request, err)
+    elif awarded:
+        messages.success(request, f"Event closed. {awarded} attendee(s) received {event.attendance_xp} XP.")
+    else:
+        messages.success(request, "Event closed. No XP was awarded.")
+    return redirect("events:check_in", pk=pk)
+
+
 @event_creator_required
 @require_http_methods(["GET", "POST"])
 def event_wizard_view(request, step):
-    """Multi-step event creation wizard. step in (1, 2, 3)."""
+    """Multi-step event creation wizard. step in (1, 2, 3); progress is kept in the user's EventDraft."""
     step = int(step)
     if step not in (1, 2, 3):
         return redirect("events:wizard", step=1)
-    wizard_data = request.session.get(SESSION_WIZARD_KEY, {})
+    draft = get_wizard_draft(request.user)
+    # Steps can't be skipped: send the user back to the first unfinished one
+    if step > 1 and (draft is None or not draft.has_details):
+        return redirect("events:wizard", step=1)
+    if step > 2 and not draft.has_schedule:
+        return redirect("events:wizard", step=2)
 
     if request.method == "POST":
+        if "discard" in request.POST:
+            if draft is not None:
+                draft.delete()
+            messages.info(request, "Draft discarded.")
+            return redirect("events:list")
         if step == 1:
             form = EventWizardStep1Form(request.POST)
             if form.is_valid():
-                wizard_data["title"] = form.cleaned_data["title"]
-                wizard_data["description"] = form.cleaned_data.get("description", "")
-                request.session[SESSION_WIZARD_KEY] = wizard_data
+                save_wizard_step(
+                    request.user,
+                    draft,
+                    title=form.cleaned_data["title"],
+                    description=form.cleaned_data.get("description", ""),
+                )
                 return redirect("events:wizard", step=2)
         elif step == 2:
             form = EventWizardStep2Form(request.POST)
             if form.is_valid():
-                wizard_data["start_at"] = form.cleaned_data["start_at"].isoformat()
-                wizard_data["end_at"] = form.cleaned_data["end_at"].isoformat()
-                wizard_data["location"] = form.cleaned_data.get("location", "")
-                request.session[SESSION_WIZARD_KEY] = wizard_data
-                return redirect("events:wizard", step=3)
+                space = form.cleaned_data.get("space")
+                if space and check_booking_conflicts(space, form.cleaned_data["start_at"], form.cleaned_data["end_at"]):
+                    form.add_error("space", f"{space.name} is already booked at that time.")
+                else:
+                    save_wizard_step(
+                        request.user,
+                        draft,
+                        start_at=form.cleaned_data["start_at"],
+                        end_at=form.cleaned_data["end_at"],
+                        location=form.cleaned_data.get("location", "") or (space.name if space else ""),
+                        space=space,
+                    )
+                    return redirect("events:wizard", step=3)
         elif step == 3:
             form = EventWizardStep3Form(request.POST)
             if form.is_valid():
-                from datetime import datetime
-
-                policy = form.cleaned_data.get("policy")
-                start_at = wizard_data["start_at"]
-                end_at = wizard_data["end_at"]
-                if isinstance(start_at, str):
-                    start_at = datetime.fromisoformat(start_at.replace("Z", "+00:00"))
-                if isinstance(end_at, str):
-                    end_at = datetime.fromisoformat(end_at.replace("Z", "+00:00"))
-                if timezone.is_naive(start_at):
-                    start_at = timezone.make_aware(start_at)
-                if timezone.is_naive(end_at):
-                    end_at = timezone.make_aware(end_at)
-                event = Event.objects.create(
-                    title=wizard_data["title"],
-                    description=wizard_data.get("description", ""),
-                    start_at=start_at,
-                    end_at=end_at,
-                    location=wizard_data.get("location", ""),
-                    status=EventStatus.DRAFT,
-                    policy=policy,
-                    created_by=request.user,
-                )
-                del request.session[SESSION_WIZARD_KEY]
+                event, err = create_event_from_draft(draft, policy=form.cleaned_data.get("policy"))
+                if err:
+                    messages.error(request, err)
+                    return redirect("events:wizard", step=2)
                 messages.success(
                     request,
                     f"Event «{event.title}» created as draft. You can submit it for approval.",
@@ -150,37 +363,15 @@ def event_wizard_view(request, step):
     else:
         if step == 1:
             form = EventWizardStep1Form(
-                initial={
-                    "title": wizard_data.get("title"),
-                    "description": wizard_data.get("description", ""),
-                }
+                initial={"title": draft.title, "description": draft.description} if draft else None
             )
         elif step == 2:
-            from datetime import datetime
-
-            start = wizard_data.get("start_at")
-            end = wizard_data.get("end_at")
-            if start:
-                try:
-                    if isinstance(start, str) and "T" in start:
-                        start = datetime.fromisoformat(start.replace("Z", "+00:00"))
-                    elif isinstance(start, str):
-                        start = datetime.fromisoformat(start)
-                except (ValueError, TypeError):
-                    start = None
-            if end:
-                try:
-                    if isinstance(end, str) and "T" in end:
-                        end = datetime.fromisoformat(end.replace("Z", "+00:00"))
-                    elif isinstance(end, str):
-                        end = datetime.fromisoformat(end)
-                except (ValueError, TypeError):
-                    end = None
             form = EventWizardStep2Form(
                 initial={
-                    "start_at": start,
-                    "end_at": end,
-                    "location": wizard_data.get("location", ""),
+                    "start_at": draft.start_at,
+                    "end_at": draft.end_at,
+                    "location": draft.location,
+                    "space": draft.space_id,
                 }
             )
         else:
@@ -193,7 +384,7 @@ def event_wizard_view(request, step):
             "section_name": "Events",
             "step": step,
             "form": form,
-            "wizard_data": wizard_data,
+            "draft": draft,
         },
     )
 
@@ -208,16 +399,23 @@ def event_submit_view(request, pk):
     ok, err = submit_event_for_approval(event, request.user)
     if ok:
         messages.success(request, "Event submitted for approval.")
+        if event.overlapping_events:
+            titles = ", ".join(e.title for e in event.overlapping_events[:3])
+            more = len(event.overlapping_events) - 3
+            messages.warning(
+                request,
+                f"Heads up: it overlaps {titles}{f' and {more} more' if more > 0 else ''}.",
+            )
     else:
         messages.error(request, err or "Could not submit.")
     return redirect("events:detail", pk=pk)
 
 
-@teacher_required
+@reviewer_required
 @require_http_methods(["GET", "POST"])
 def event_review_view(request, pk):
-    """Admin/Teacher review panel: approve or reject with comment."""
-    event = get_object_or_404(Event.objects.select_related("created_by", "policy"), pk=pk)
+    """Reviewer panel (Admin/Teacher/staff): approve or reject with comment."""
+    event = get_object_or_404(Event.objects.select_related("created_by", "policy", "space", "booking"), pk=pk)
     if event.status != EventStatus.PENDING:
         messages.info(request, "This event is not pending review.")
         return redirect("events:detail", pk=pk)
@@ -251,14 +449,15 @@ def event_review_view(request, pk):
             "event": event,
             "form": form,
             "approval_logs": logs,
+            "overlapping_events": find_overlapping_events(event),
         },
     )
 
 
-@teacher_required
+@reviewer_required
 @require_safe
 def event_review_list_view(request):
-    """List of events pending review (Admin/Teacher)."""
+    """List of events pending review (Admin/Teacher/staff)."""
     pending = (
         Event.objects.filter(status=EventStatus.PENDING)
         .select_related("created_by")
@@ -3,10 +3,11 @@ from django.contrib.admin.views.decorators import staff_member_required
 from django.db.models import Count, Q
 from django.shortcuts import redirect, render
 from django.urls import path, reverse
-from django.utils import timezone
-from django.utils.html import format_html
+from django.utils.html import format_html, format_html_join
 
-from .models import ActionType, ModeratorActionLog
+from apps.core.permissions import user_can_review
+
+from .models import ModeratorActionArchive, ModeratorActionLog
 
 
 @admin.register(ModeratorActionLog)
@@ -37,6 +38,35 @@ class ModeratorActionLogAdmin(admin.ModelAdmin):
         return False
 
 
+@admin.register(ModeratorActionArchive)
+class ModeratorActionArchiveAdmin(admin.ModelAdmin):
+    list_display = ["month", "first_id", "last_id", "row_count", "archived_at"]
+    list_filter = ["month"]
+    exclude = ["payload"]
+    readonly_fields = ["month", "first_id", "last_id", "row_count", "archived_at", "rows_preview"]
+
+    def rows_preview(self, obj):
+        from .services import read_archive
+
+        rows = read_archive(obj)[:50]
+        return format_html_join(
+            "",
+            "<div>{} · {} {} #{} · {}</div>",
+            (
+                (row["created_at"], row["action_type"], row["target_model"], row["target_id"], row["description"])
+                for row in rows
+            ),
+        )
+
+    rows_preview.short_description = "First 50 rows"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 class ModerationDashboardAdmin(admin.AdminSite):
     site_header = "NIS SuperApp Moderation"
     site_title = "NIS Moderation"
@@ -72,6 +102,7 @@ class ModerationDashboardAdmin(admin.AdminSite):
                 self.admin_view(self.reject_booking_view),
                 name="reject_booking",
             ),
+            path("bulk-action/", self.admin_view(self.bulk_action_view), name="bulk_action"),
         ]
         return custom_urls + urls
 
@@ -95,230 +126,117 @@ class ModerationDashboardAdmin(admin.AdminSite):
             context["main_admin_shanyraq_url"] = reverse("admin:shanyraq_shanyraq_changelist")
         except:
             context["main_admin_shanyraq_url"] = "/admin/shanyraq/shanyraq/"
+        try:
+            context["main_admin_activitysubmission_url"] = reverse(
+                "admin:shanyraq_activitysubmission_changelist", current_app="admin"
+            )
+        except:
+            context["main_admin_activitysubmission_url"] = "/admin/shanyraq/activitysubmission/"
         return context
 
     def dashboard_view(self, request):
         # Check permissions
-        if not request.user.is_staff and not getattr(request.user, "is_moderator", False):
+        if not user_can_review(request.user):
             from django.http import HttpResponseForbidden
 
             return HttpResponseForbidden("Access denied. Moderator privileges required.")
 
-        from apps.accounts.models import User
-        from apps.events.models import Event, EventStatus
-        from apps.shanyraq.models import Shanyraq
-        from apps.spaces.models import BookingStatus, SpaceBooking
+        from .counters import get_counters
+        from .services import QUEUE_KINDS, moderation_queue
 
-        # Get pending items
-        pending_events = (
-            Event.objects.filter(status=EventStatus.PENDING)
-            .select_related("created_by")
-            .order_by("created_at")
-        )
-        pending_bookings = (
-            SpaceBooking.objects.filter(status=BookingStatus.PENDING)
-            .select_related("space", "booked_by")
-            .order_by("start_time")
-        )
+        # Unified queue, oldest first; ?type= narrows it, ?after= is the keyset cursor
+        kinds = [kind for kind in request.GET.getlist("type") if kind in QUEUE_KINDS]
+        cursor = request.GET.get("after")
+        queue_items, next_cursor = moderation_queue(kinds, cursor)
+        type_query = "&".join(f"type={kind}" for kind in kinds)
 
         # Recent actions
         recent_actions = ModeratorActionLog.objects.select_related("moderator").order_by(
             "-created_at"
         )[:10]
 
-        # Stats
+        # Stats: cached counters maintained on writes (see counters.py)
+        counts = get_counters()
         stats = {
-            "pending_events_count": pending_events.count(),
-            "pending_bookings_count": pending_bookings.count(),
-            "total_users": User.objects.count(),
-            "total_shanyraqs": Shanyraq.objects.count(),
-            "actions_today": ModeratorActionLog.objects.filter(
-                created_at__date=timezone.now().date()
-            ).count(),
+            "pending_events_count": counts["pending_events"],
+            "pending_bookings_count": counts["pending_bookings"],
+            "pending_activities_count": counts["pending_activities"],
+            "total_users": counts["users"],
+            "total_shanyraqs": counts["shanyraqs"],
+            "actions_today": counts["actions_today"],
         }
 
         context = {
-            "pending_events": pending_events,
-            "pending_bookings": pending_bookings,
+            **self.each_context(request),
+            "queue_items": queue_items,
+            "queue_kinds": QUEUE_KINDS,
+            "selected_kinds": kinds,
+            "type_query": type_query,
+            "next_cursor": next_cursor,
+            "is_first_page": not cursor,
             "recent_actions": recent_actions,
             "stats": stats,
             "title": "Moderation Dashboard",
         }
         return render(request, "admin/moderation/dashboard.html", context)
 
-    def approve_event_view(self, request, event_id):
-        # Check permissions
-        if not request.user.is_staff and not getattr(request.user, "is_moderator", False):
+    def _moderate_one(self, request, kind, action, pk):
+        if not user_can_review(request.user):
             from django.http import HttpResponseForbidden
 
             return HttpResponseForbidden("Access denied. Moderator privileges required.")
 
-        from apps.events.models import Event, EventApprovalLog, EventStatus
-
-        try:
-            event = Event.objects.get(pk=event_id, status=EventStatus.PENDING)
-            old_status = event.status
-            event.status = EventStatus.APPROVED
-            event.save()
-
-            # Log approval
-            EventApprovalLog.objects.create(
-                event=event,
-                from_status=old_status,
-                to_status=event.status,
-                changed_by=request.user,
-                comment=request.POST.get("comment", ""),
-            )
-
-            # Log moderator action
-            ModeratorActionLog.objects.create(
-                moderator=request.user,
-                action_type=ActionType.APPROVE_EVENT,
-                target_model="events.Event",
-                target_id=event_id,
-                description=f"Approved event: {event.title}",
-                old_value=f'{{"status": "{old_status}"}}',
-                new_value=f'{{"status": "{event.status}"}}',
-                comment=request.POST.get("comment", ""),
-            )
-
-            messages.success(request, f'Event "{event.title}" has been approved.')
-        except Event.DoesNotExist:
-            messages.error(request, "Event not found or not pending.")
-
-        return redirect("/moderation/dashboard/")
-
-    def reject_event_view(self, request, event_id):
-        # Check permissions
-        if not request.user.is_staff and not getattr(request.user, "is_moderator", False):
-            from django.http import HttpResponseForbidden
-
-            return HttpResponseForbidden("Access denied. Moderator privileges required.")
-
-        from apps.events.models import Event, EventApprovalLog, EventStatus
+        from .services import ACTION_VERBS, MODERATION_ACTIONS, moderate
 
         if request.method == "POST":
-            try:
-                event = Event.objects.get(pk=event_id, status=EventStatus.PENDING)
-                old_status = event.status
-                event.status = EventStatus.REJECTED
-                event.rejection_comment = request.POST.get("comment", "")
-                event.save()
-
-                # Log rejection
-                EventApprovalLog.objects.create(
-                    event=event,
-                    from_status=old_status,
-                    to_status=event.status,
-                    changed_by=request.user,
-                    comment=request.POST.get("comment", ""),
-                )
-
-                # Log moderator action
-                ModeratorActionLog.objects.create(
-                    moderator=request.user,
-                    action_type=ActionType.REJECT_EVENT,
-                    target_model="events.Event",
-                    target_id=event_id,
-                    description=f"Rejected event: {event.title}",
-                    old_value=f'{{"status": "{old_status}"}}',
-                    new_value=f'{{"status": "{event.status}"}}',
-                    comment=request.POST.get("comment", ""),
-                )
-
-                messages.success(request, f'Event "{event.title}" has been rejected.')
-            except Event.DoesNotExist:
-                messages.error(request, "Event not found or not pending.")
+            model = MODERATION_ACTIONS[kind][0]
+            obj = model.objects.filter(pk=pk, status="pending").first()
+            if obj is None:
+                messages.error(request, f"{kind.capitalize()} not found or not pending.")
+            else:
+                ok, err = moderate(kind, action, obj, request.user, request.POST.get("comment", ""))
+                if ok:
+                    messages.success(request, f'{kind.capitalize()} "{obj}" has been {ACTION_VERBS[action].lower()}.')
+                else:
+                    messages.error(request, err)
 
         return redirect("/moderation/dashboard/")
 
-    def approve_booking_view(self, request, booking_id):
-        # Check permissions
-        if not request.user.is_staff and not getattr(request.user, "is_moderator", False):
-            from django.http import HttpResponseForbidden
-
-            return HttpResponseForbidden("Access denied. Moderator privileges required.")
-
-        from apps.spaces.models import BookingApprovalLog, BookingStatus, SpaceBooking
-
-        try:
-            booking = SpaceBooking.objects.get(pk=booking_id, status=BookingStatus.PENDING)
-            old_status = booking.status
-            booking.status = BookingStatus.APPROVED
-            booking.reviewed_by = request.user
-            booking.reviewed_at = timezone.now()
-            booking.save()
-
-            # Log approval
-            BookingApprovalLog.objects.create(
-                booking=booking,
-                from_status=old_status,
-                to_status=booking.status,
-                changed_by=request.user,
-                comment=request.POST.get("comment", ""),
-            )
-
-            # Log moderator action
-            ModeratorActionLog.objects.create(
-                moderator=request.user,
-                action_type=ActionType.APPROVE_BOOKING,
-                target_model="spaces.SpaceBooking",
-                target_id=booking_id,
-                description=f"Approved booking: {booking}",
-                old_value=f'{{"status": "{old_status}"}}',
-                new_value=f'{{"status": "{booking.status}"}}',
-                comment=request.POST.get("comment", ""),
-            )
+    def approve_event_view(self, request, event_id):
+        return self._moderate_one(request, "event", "approve", event_id)
 
-            messages.success(request, f'Booking "{booking}" has been approved.')
-        except SpaceBooking.DoesNotExist:
-            messages.error(request, "Booking not found or not pending.")
+    def reject_event_view(self, request, event_id):
+        return self._moderate_one(request, "event", "reject", event_id)
 
-        return redirect("/moderation/dashboard/")
+    def approve_booking_view(self, request, booking_id):
+        return self._moderate_one(request, "booking", "approve", booking_id)
 
     def reject_booking_view(self, request, booking_id):
-        # Check permissions
-        if not request.user.is_staff and not getattr(request.user, "is_moderator", False):
+        return self._moderate_one(request, "booking", "reject", booking_id)
+
+    def bulk_action_view(self, request):
+        """Approve or reject every selected queue item ("event:12", "booking:7", ...) in one go."""
+        if not user_can_review(request.user):
             from django.http import HttpResponseForbidden
 
             return HttpResponseForbidden("Access denied. Moderator privileges required.")
 
-        from apps.spaces.models import BookingApprovalLog, BookingStatus, SpaceBooking
-
-        if request.method == "POST":
-            try:
-                booking = SpaceBooking.objects.get(pk=booking_id, status=BookingStatus.PENDING)
-                old_status = booking.status
-                booking.status = BookingStatus.REJECTED
-                booking.reviewed_by = request.user
-                booking.reviewed_at = timezone.now()
-                booking.rejection_reason = request.POST.get("comment", "")
-                booking.save()
-
-                # Log rejection
-                BookingApprovalLog.objects.create(
-                    booking=booking,
-                    from_status=old_status,
-                    to_status=booking.status,
-                    changed_by=request.user,
-                    comment=request.POST.get("comment", ""),
-                )
-
-                # Log moderator action
-                ModeratorActionLog.objects.create(
-                    moderator=request.user,
-                    action_type=ActionType.REJECT_BOOKING,
-                    target_model="spaces.SpaceBooking",
-                    target_id=booking_id,
-                    description=f"Rejected booking: {booking}",
-                    old_value=f'{{"status": "{old_status}"}}',
-                    new_value=f'{{"status": "{booking.status}"}}',
-                    comment=request.POST.get("comment", ""),
-                )
-
-                messages.success(request, f'Booking "{booking}" has been rejected.')
-            except SpaceBooking.DoesNotExist:
-                messages.error(request, "Booking not found or not pending.")
+        from .services import ACTION_VERBS, MODERATION_ACTIONS, bulk_moderate
+
+        action = request.POST.get("action")
+        if request.method == "POST" and action in ("approve", "reject"):
+            selection = {kind: [] for kind in MODERATION_ACTIONS}
+            for value in request.POST.getlist("items"):
+                kind, _, pk = value.partition(":")
+                if kind in selection and pk.isdigit():
+                    selection[kind].append(int(pk))
+            (done, skipped), err = bulk_moderate(selection, action, request.user, request.POST.get("comment", ""))
+            if err:
+                messages.error(request, err)
+            else:
+                messages.success(request, f"{done} item(s) {ACTION_VERBS[action].lower()}.")
+                if skipped:
+                    messages.warning(request, f"{skipped} item(s) skipped: their room is no longer free.")
 
         return redirect("/moderation/dashboard/")
 
@@ -328,3 +246,4 @@ moderation_admin = ModerationDashboardAdmin(name="moderation_admin")
 
 # Register models with the moderation admin
 moderation_admin.register(ModeratorActionLog, ModeratorActionLogAdmin)
+moderation_admin.register(ModeratorActionArchive, ModeratorActionArchiveAdmin)
@@ -6,3 +6,6 @@ class ModerationConfig(AppConfig):
     name = 'apps.moderation'
     label = 'moderation'
     verbose_name = 'Moderation'
+
+    def ready(self):
+        import apps.moderation.signals  # noqa
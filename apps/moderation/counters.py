@@ -0,0 +1,87 @@
+"""
+Dashboard counters kept in the cache and adjusted on writes (see signals.py), so the
+moderation dashboard reads numbers instead of running COUNT queries.
+
+Single-row saves/deletes bump counters after commit; bulk writes that bypass model
+signals drop the affected keys instead. A missing key is recomputed once (pending
+counts in one grouped query, today's actions with a created_at range). The timeout
+bounds any drift from writes that neither path sees (bulk_create, raw SQL).
+"""
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core.services.timeline import local_midnight, school_timezone
+
+COUNTER_TIMEOUT = 60 * 60
+COUNTER_KEY = "moderation:count:{name}"
+PENDING_COUNTERS = {"event": "pending_events", "booking": "pending_bookings", "activity": "pending_activities"}
+
+
+def _today():
+    return timezone.localdate(timezone=school_timezone())
+
+
+def counter_key(name):
+    """Cache key for a counter; "actions_today" is keyed by the school-local date."""
+    if name == "actions_today":
+        name = f"actions:{_today().isoformat()}"
+    return COUNTER_KEY.format(name=name)
+
+
+def _compute(names):
+    from apps.accounts.models import User
+    from apps.shanyraq.models import Shanyraq
+
+    from .models import ModeratorActionLog
+    from .services import pending_counts
+
+    values = {}
+    if set(PENDING_COUNTERS.values()) & set(names):
+        for kind, total in pending_counts().items():
+            values[PENDING_COUNTERS[kind]] = total
+    if "users" in names:
+        values["users"] = User.objects.count()
+    if "shanyraqs" in names:
+        values["shanyraqs"] = Shanyraq.objects.count()
+    if "actions_today" in names:
+        # A range on created_at, not created_at__date, so the column index is usable
+        start = local_midnight(_today())
+        values["actions_today"] = ModeratorActionLog.objects.filter(
+            created_at__gte=start, created_at__lt=start + timedelta(days=1)
+        ).count()
+    return {name: values[name] for name in names}
+
+
+def get_counters(names=(*PENDING_COUNTERS.values(), "users", "shanyraqs", "actions_today")):
+    """{name: value}, read with one cache round trip; only missing counters hit the database."""
+    keys = {name: counter_key(name) for name in names}
+    cached = cache.get_many(keys.values())
+    values = {name: cached[key] for name, key in keys.items() if key in cached}
+    missing = [name for name in names if name not in values]
+    if missing:
+        computed = _compute(missing)
+        cache.set_many({keys[name]: value for name, value in computed.items()}, COUNTER_TIMEOUT)
+        values.update(computed)
+    return values
+
+
+def bump(name, delta=1):
+    """Adjust a cached counter after the current transaction commits (no-op if not cached)."""
+    key = counter_key(name)
+
+    def apply():
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            pass  # not cached: the next read recomputes it
+
+    transaction.on_commit(apply)
+
+
+def invalidate(*names):
+    """Drop counters after commit, for bulk writes that bypass model signals."""
+    keys = [counter_key(name) for name in names]
+    transaction.on_commit(lambda: cache.delete_many(keys))
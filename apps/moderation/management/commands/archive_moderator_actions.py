@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.core.services.timeline import local_midnight, school_timezone
+from apps.moderation.models import ModeratorActionLog
+from apps.moderation.services import ARCHIVE_CHUNK_SIZE, archive_action_logs
+
+
+class Command(BaseCommand):
+    help = "Move moderator action logs older than N whole months into compressed archive chunks (run monthly)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--keep-months", type=int, default=6, help="Whole months to keep live, besides the current one")
+        parser.add_argument("--chunk-size", type=int, default=ARCHIVE_CHUNK_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="Only report how many rows would be archived")
+
+    def handle(self, *args, **options):
+        if options["keep_months"] < 0 or options["chunk_size"] < 1:
+            raise CommandError("--keep-months must be >= 0 and --chunk-size >= 1.")
+        today = timezone.localdate(timezone=school_timezone())
+        months = today.year * 12 + today.month - 1 - options["keep_months"]
+        cutoff = local_midnight(today.replace(year=months // 12, month=months % 12 + 1, day=1))
+
+        if options["dry_run"]:
+            count = ModeratorActionLog.objects.filter(created_at__lt=cutoff).count()
+            self.stdout.write(f"Would archive {count} action log(s) created before {cutoff:%Y-%m-%d}.")
+            return
+        archived = archive_action_logs(cutoff, options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} action log(s) created before {cutoff:%Y-%m-%d}."))
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('moderation', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='moderatoractionlog',
+            index=models.Index(fields=['created_at'], name='moderation__created_fb2ad8_idx'),
+        ),
+    ]
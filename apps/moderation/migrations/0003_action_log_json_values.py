@@ -0,0 +1,98 @@
+import json
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+def text_to_json(apps, schema_editor):
+    """Parse the hand-built JSON strings; anything unparsable is kept under "raw"."""
+    ModeratorActionLog = apps.get_model("moderation", "ModeratorActionLog")
+    rows = ModeratorActionLog.objects.order_by("pk").values_list("pk", "old_value", "new_value")
+    batch = []
+    for pk, old, new in rows.iterator(chunk_size=1000):
+        values = []
+        for raw in (old, new):
+            if not raw:
+                values.append(None)
+                continue
+            try:
+                values.append(json.loads(raw))
+            except ValueError:
+                values.append({"raw": raw})
+        batch.append(ModeratorActionLog(pk=pk, old_value_json=values[0], new_value_json=values[1]))
+        if len(batch) >= 1000:
+            ModeratorActionLog.objects.bulk_update(batch, ["old_value_json", "new_value_json"])
+            batch = []
+    if batch:
+        ModeratorActionLog.objects.bulk_update(batch, ["old_value_json", "new_value_json"])
+
+
+def _as_text(value):
+    if value is None:
+        return ""
+    if isinstance(value, dict) and list(value) == ["raw"]:
+        return value["raw"]
+    return json.dumps(value, cls=django.core.serializers.json.DjangoJSONEncoder)
+
+
+def json_to_text(apps, schema_editor):
+    ModeratorActionLog = apps.get_model("moderation", "ModeratorActionLog")
+    batch = []
+    for log in ModeratorActionLog.objects.order_by("pk").iterator(chunk_size=1000):
+        log.old_value = _as_text(log.old_value_json)
+        log.new_value = _as_text(log.new_value_json)
+        batch.append(log)
+        if len(batch) >= 1000:
+            ModeratorActionLog.objects.bulk_update(batch, ["old_value", "new_value"])
+            batch = []
+    if batch:
+        ModeratorActionLog.objects.bulk_update(batch, ["old_value", "new_value"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('moderation', '0002_action_log_created_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='moderatoractionlog',
+            name='old_value_json',
+            field=models.JSONField(blank=True, null=True, encoder=django.core.serializers.json.DjangoJSONEncoder),
+        ),
+        migrations.AddField(
+            model_name='moderatoractionlog',
+            name='new_value_json',
+            field=models.JSONField(blank=True, null=True, encoder=django.core.serializers.json.DjangoJSONEncoder),
+        ),
+        migrations.RunPython(text_to_json, json_to_text),
+        migrations.RemoveField(
+            model_name='moderatoractionlog',
+            name='old_value',
+        ),
+        migrations.RemoveField(
+            model_name='moderatoractionlog',
+            name='new_value',
+        ),
+        migrations.RenameField(
+            model_name='moderatoractionlog',
+            old_name='old_value_json',
+            new_name='old_value',
+        ),
+        migrations.RenameField(
+            model_name='moderatoractionlog',
+            old_name='new_value_json',
+            new_name='new_value',
+        ),
+        migrations.AlterField(
+            model_name='moderatoractionlog',
+            name='old_value',
+            field=models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Changed fields before the action', null=True),
+        ),
+        migrations.AlterField(
+            model_name='moderatoractionlog',
+            name='new_value',
+            field=models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Changed fields after the action', null=True),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('moderation', '0003_action_log_json_values'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModeratorActionArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month the rows were created in')),
+                ('first_id', models.PositiveBigIntegerField()),
+                ('last_id', models.PositiveBigIntegerField()),
+                ('row_count', models.PositiveIntegerField()),
+                ('payload', models.BinaryField(help_text='gzip-compressed NDJSON, one action log row per line')),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'archived moderator actions',
+                'verbose_name_plural': 'archived moderator actions',
+                'ordering': ['-month', '-first_id'],
+                'indexes': [models.Index(fields=['month'], name='moderation__month_6ae3c1_idx')],
+            },
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 
 
@@ -32,8 +33,12 @@ class ModeratorActionLog(models.Model):
     target_model = models.CharField(max_length=100, help_text="Model name (e.g. 'events.Event')")
     target_id = models.PositiveIntegerField(help_text="Primary key of the target object")
     description = models.TextField(blank=True, help_text="Human-readable description of the action")
-    old_value = models.TextField(blank=True, help_text="JSON representation of old state")
-    new_value = models.TextField(blank=True, help_text="JSON representation of new state")
+    old_value = models.JSONField(
+        null=True, blank=True, encoder=DjangoJSONEncoder, help_text="Changed fields before the action"
+    )
+    new_value = models.JSONField(
+        null=True, blank=True, encoder=DjangoJSONEncoder, help_text="Changed fields after the action"
+    )
     comment = models.TextField(blank=True, help_text="Optional moderator comment")
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -44,7 +49,30 @@ class ModeratorActionLog(models.Model):
         indexes = [
             models.Index(fields=["action_type", "created_at"]),
             models.Index(fields=["moderator", "created_at"]),
+            models.Index(fields=["created_at"]),
         ]
 
     def __str__(self):
         return f"{self.moderator} {self.get_action_type_display()} {self.target_id}"
+
+
+class ModeratorActionArchive(models.Model):
+    """A chunk of archived ModeratorActionLog rows from one month, stored as gzipped NDJSON."""
+
+    month = models.DateField(help_text="First day of the month the rows were created in")
+    first_id = models.PositiveBigIntegerField()
+    last_id = models.PositiveBigIntegerField()
+    row_count = models.PositiveIntegerField()
+    payload = models.BinaryField(help_text="gzip-compressed NDJSON, one action log row per line")
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "archived moderator actions"
+        verbose_name_plural = "archived moderator actions"
+        ordering = ["-month", "-first_id"]
+        indexes = [
+            models.Index(fields=["month"]),
+        ]
+
+    def __str__(self):
+        return f"{self.month:%Y-%m}: actions {self.first_id}-{self.last_id} ({self.row_count})"
@@ -0,0 +1,301 @@
+"""
+Moderation queue: pending events, space bookings and activity submissions in one
+age-ordered list, paged by a keyset cursor over (queued_at, kind, pk).
+Approve/reject actions go through the events/spaces review services and are audited
+in ModeratorActionLog (changed fields only); old log rows are archived by month.
+"""
+import gzip
+import json
+from datetime import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import CharField, Count, F, Q, Value
+from django.utils.encoding import force_str
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+
+from apps.core.services.timeline import school_timezone
+from apps.events.models import Event, EventStatus
+from apps.events.services import approve_event, bulk_approve_events, bulk_reject_events, reject_event
+from apps.shanyraq.models import ActivitySubmission
+from apps.spaces.models import BookingStatus, SpaceBooking
+from apps.spaces.services import approve_booking, bulk_approve_bookings, bulk_reject_bookings, reject_booking
+
+from . import counters
+from .models import ActionType, ModeratorActionArchive, ModeratorActionLog
+
+QUEUE_PAGE_SIZE = 25
+
+# kind -> (pending queryset factory, age field, related fields for display)
+QUEUE_SOURCES = {
+    "event": (lambda: Event.objects.filter(status=EventStatus.PENDING), "created_at", ("created_by", "space")),
+    "booking": (lambda: SpaceBooking.objects.filter(status=BookingStatus.PENDING), "created_at", ("space", "booked_by")),
+    "activity": (lambda: ActivitySubmission.objects.filter(status="pending"), "submitted_at", ("user",)),
+}
+QUEUE_KINDS = tuple(QUEUE_SOURCES)
+
+
+def encode_queue_cursor(queued_at, kind, pk):
+    return urlsafe_base64_encode(f"{queued_at.isoformat()}|{kind}|{pk}".encode())
+
+
+def decode_queue_cursor(cursor):
+    """(datetime, kind, pk) from encode_queue_cursor(), or None when missing or malformed."""
+    if not cursor:
+        return None
+    try:
+        queued_at, kind, pk = force_str(urlsafe_base64_decode(cursor)).split("|")
+        if kind not in QUEUE_SOURCES:
+            return None
+        return datetime.fromisoformat(queued_at), kind, int(pk)
+    except (ValueError, TypeError):
+        return None
+
+
+def _after(kind, field, position):
+    """Keyset condition for one source: rows that sort after `position` in (queued_at, kind, pk)."""
+    if position is None:
+        return Q()
+    queued_at, cursor_kind, pk = position
+    if kind < cursor_kind:
+        return Q(**{f"{field}__gt": queued_at})
+    if kind == cursor_kind:
+        return Q(**{f"{field}__gt": queued_at}) | Q(**{field: queued_at, "pk__gt": pk})
+    return Q(**{f"{field}__gte": queued_at})
+
+
+def moderation_queue(kinds=None, cursor=None, page_size=QUEUE_PAGE_SIZE):
+    """
+    Oldest-first page of pending items of the given kinds (all by default).
+
+    One UNION query picks the page's (kind, pk, queued_at) rows using the per-source
+    (status, age) indexes; each kind on the page is then loaded with one in_bulk query.
+    Returns (items, next_cursor), items being dicts with "kind", "queued_at" and "obj".
+    """
+    kinds = [kind for kind in QUEUE_KINDS if not kinds or kind in kinds]
+    position = decode_queue_cursor(cursor)
+    branches = []
+    for kind in kinds:
+        pending, field, _ = QUEUE_SOURCES[kind]
+        branches.append(
+            pending()
+            .filter(_after(kind, field, position))
+            .annotate(kind=Value(kind, output_field=CharField()), queued_at=F(field))
+            .values_list("queued_at", "kind", "pk")
+            .order_by()
+        )
+    if not branches:
+        return [], None
+    query = branches[0].union(*branches[1:], all=True) if len(branches) > 1 else branches[0]
+    rows = list(query.order_by("queued_at", "kind", "pk")[: page_size + 1])
+    next_cursor = encode_queue_cursor(*rows[page_size - 1]) if len(rows) > page_size else None
+    rows = rows[:page_size]
+
+    loaded = {}
+    for kind in kinds:
+        ids = [pk for _, row_kind, pk in rows if row_kind == kind]
+        if ids:
+            pending, _, related = QUEUE_SOURCES[kind]
+            loaded[kind] = pending().select_related(*related).in_bulk(ids)
+    items = []
+    for queued_at, kind, pk in rows:
+        obj = loaded.get(kind, {}).get(pk)
+        if obj is not None:
+            items.append({"kind": kind, "queued_at": queued_at, "obj": obj})
+    return items, next_cursor
+
+
+def pending_counts():
+    """{kind: pending count} in one grouped UNION query."""
+    branches = [
+        pending()
+        .annotate(kind=Value(kind, output_field=CharField()))
+        .values("kind")
+        .annotate(total=Count("pk"))
+        .values_list("kind", "total")
+        .order_by()
+        for kind, (pending, _, _) in QUEUE_SOURCES.items()
+    ]
+    counts = dict.fromkeys(QUEUE_KINDS, 0)
+    counts.update(branches[0].union(*branches[1:], all=True))
+    return counts
+
+
+ACTION_VERBS = {"approve": "Approved", "reject": "Rejected"}
+
+# kind -> (model, target_model label, {action: (single service, bulk service, ActionType, new status)})
+MODERATION_ACTIONS = {
+    "event": (
+        Event,
+        "events.Event",
+        {
+            "approve": (approve_event, bulk_approve_events, ActionType.APPROVE_EVENT, EventStatus.APPROVED),
+            "reject": (reject_event, bulk_reject_events, ActionType.REJECT_EVENT, EventStatus.REJECTED),
+        },
+    ),
+    "booking": (
+        SpaceBooking,
+        "spaces.SpaceBooking",
+        {
+            "approve": (approve_booking, bulk_approve_bookings, ActionType.APPROVE_BOOKING, BookingStatus.APPROVED),
+            "reject": (reject_booking, bulk_reject_bookings, ActionType.REJECT_BOOKING, BookingStatus.REJECTED),
+        },
+    ),
+}
+
+
+# Fields whose before/after values are recorded in ModeratorActionLog
+AUDITED_FIELDS = {
+    "event": ("status", "rejection_comment", "booking_id"),
+    "booking": ("status", "rejection_reason", "reviewed_by_id", "reviewed_at"),
+}
+
+
+def snapshot(obj, fields):
+    """{field: value} for the audited fields of obj."""
+    return {field: getattr(obj, field) for field in fields}
+
+
+def diff_states(before, after):
+    """(old, new) dicts holding only the keys whose value changed."""
+    changed = [key for key in after if before.get(key) != after[key]]
+    return {key: before.get(key) for key in changed}, {key: after[key] for key in changed}
+
+
+def action_log(moderator, action_type, target, before, after, description="", comment=""):
+    """Unsaved ModeratorActionLog for target, storing only the fields that changed."""
+    old, new = diff_states(before, after)
+    return ModeratorActionLog(
+        moderator=moderator,
+        action_type=action_type,
+        target_model=target._meta.label,
+        target_id=target.pk,
+        description=description,
+        old_value=old or None,
+        new_value=new or None,
+        comment=comment,
+    )
+
+
+def moderate(kind, action, obj, moderator, comment=""):
+    """Approve or reject one event/booking through its review service and log it. Returns (ok, error)."""
+    single, _, action_type, _ = MODERATION_ACTIONS[kind][2][action]
+    fields = AUDITED_FIELDS[kind]
+    before = snapshot(obj, fields)
+    with transaction.atomic():
+        ok, err = single(obj, moderator, comment)
+        if ok:
+            action_log(
+                moderator,
+                action_type,
+                obj,
+                before,
+                snapshot(obj, fields),
+                description=f"{ACTION_VERBS[action]} {kind}: {obj}",
+                comment=comment,
+            ).save()
+    return ok, err
+
+
+def bulk_moderate(selection, action, moderator, comment=""):
+    """
+    Approve or reject many items at once: selection is {kind: [pk, ...]} for "event"
+    and "booking". Everything runs in one transaction through the bulk review services
+    (which bulk-insert their approval logs); ModeratorActionLog rows, with per-item
+    diffs, are bulk-inserted for the items that actually changed.
+    Returns ((done_count, skipped_count), error).
+    """
+    done, skipped, logs = 0, 0, []
+    with transaction.atomic():
+        for kind, ids in selection.items():
+            if not ids:
+                continue
+            model, _, actions = MODERATION_ACTIONS[kind]
+            _, bulk, action_type, new_status = actions[action]
+            fields = AUDITED_FIELDS[kind]
+            pending = {
+                obj.pk: obj
+                for obj in model.objects.filter(pk__in=ids, status="pending").select_related(*QUEUE_SOURCES[kind][2])
+            }
+            if not pending:
+                continue
+            before = {pk: snapshot(obj, fields) for pk, obj in pending.items()}
+            _, err = bulk(list(pending), moderator, comment)
+            if err:
+                transaction.set_rollback(True)
+                return (0, 0), err
+            changed = model.objects.filter(pk__in=list(pending), status=new_status).values("pk", *fields)
+            for after in changed:
+                obj = pending[after.pop("pk")]
+                logs.append(
+                    action_log(
+                        moderator,
+                        action_type,
+                        obj,
+                        before[obj.pk],
+                        after,
+                        description=f"{ACTION_VERBS[action]} {kind}: {obj}",
+                        comment=comment,
+                    )
+                )
+                done += 1
+            skipped += len(pending) - len(changed)
+        if not done and not skipped:
+            return (0, 0), "Nothing pending was selected."
+        ModeratorActionLog.objects.bulk_create(logs)
+        # Bulk updates and bulk_create skip model signals
+        counters.invalidate(*(counters.PENDING_COUNTERS[kind] for kind, ids in selection.items() if ids))
+        counters.bump("actions_today", len(logs))
+    return (done, skipped), None
+
+
+ARCHIVE_CHUNK_SIZE = 1000
+
+
+def archive_action_logs(before, chunk_size=ARCHIVE_CHUNK_SIZE):
+    """
+    Move ModeratorActionLog rows created before `before` into ModeratorActionArchive,
+    one gzipped NDJSON chunk (never spanning two months) per short transaction.
+    Returns the number of rows archived.
+    """
+    archived = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                ModeratorActionLog.objects.filter(created_at__lt=before)
+                .order_by("pk")
+                .values(
+                    "pk",
+                    "moderator_id",
+                    "action_type",
+                    "target_model",
+                    "target_id",
+                    "description",
+                    "old_value",
+                    "new_value",
+                    "comment",
+                    "created_at",
+                )[:chunk_size]
+            )
+            if not rows:
+                return archived
+            tz = school_timezone()
+            month = rows[0]["created_at"].astimezone(tz).date().replace(day=1)
+            rows = [row for row in rows if row["created_at"].astimezone(tz).date().replace(day=1) == month]
+            payload = gzip.compress(
+                "".join(json.dumps(row, cls=DjangoJSONEncoder) + "\n" for row in rows).encode()
+            )
+            ModeratorActionArchive.objects.create(
+                month=month,
+                first_id=rows[0]["pk"],
+                last_id=rows[-1]["pk"],
+                row_count=len(rows),
+                payload=payload,
+            )
+            ModeratorActionLog.objects.filter(pk__in=[row["pk"] for row in rows]).delete()
+        archived += len(rows)
+
+
+def read_archive(archive):
+    """Rows of one ModeratorActionArchive chunk as dicts."""
+    return [json.loads(line) for line in gzip.decompress(bytes(archive.payload)).decode().splitlines()]
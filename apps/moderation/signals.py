@@ -0,0 +1,76 @@
+"""
+Signals for moderation app: keep dashboard counters in step with writes.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from apps.events.models import Event
+from apps.shanyraq.models import ActivitySubmission, Shanyraq
+from apps.spaces.models import SpaceBooking
+from apps.spaces.signals import bookings_changed
+
+from . import counters
+from .models import ModeratorActionLog
+
+PENDING = "pending"
+QUEUED_MODELS = {
+    Event: counters.PENDING_COUNTERS["event"],
+    SpaceBooking: counters.PENDING_COUNTERS["booking"],
+    ActivitySubmission: counters.PENDING_COUNTERS["activity"],
+}
+
+
+def remember_status(sender, instance, **kwargs):
+    """Status as loaded, so post_save can tell whether the item entered or left the queue."""
+    instance._loaded_status = instance.__dict__.get("status")
+
+
+def count_status_change(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw or (update_fields is not None and "status" not in update_fields):
+        return
+    old = None if created else instance._loaded_status
+    new = instance.status
+    if old != new:
+        if old == PENDING:
+            counters.bump(QUEUED_MODELS[sender], -1)
+        if new == PENDING:
+            counters.bump(QUEUED_MODELS[sender])
+    instance._loaded_status = new
+
+
+def count_deleted_item(sender, instance, **kwargs):
+    if instance.status == PENDING:
+        counters.bump(QUEUED_MODELS[sender], -1)
+
+
+for model in QUEUED_MODELS:
+    post_init.connect(remember_status, sender=model, dispatch_uid=f"moderation_status_{model.__name__}")
+    post_save.connect(count_status_change, sender=model, dispatch_uid=f"moderation_count_{model.__name__}")
+    post_delete.connect(count_deleted_item, sender=model, dispatch_uid=f"moderation_uncount_{model.__name__}")
+
+
+@receiver(bookings_changed, sender=SpaceBooking)
+def recount_bulk_bookings(sender, **kwargs):
+    """Series creation and bulk review change many statuses at once."""
+    counters.invalidate(counters.PENDING_COUNTERS["booking"])
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_save, sender=Shanyraq)
+def count_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        counters.bump("users" if sender is not Shanyraq else "shanyraqs")
+
+
+@receiver(post_delete, sender=get_user_model())
+@receiver(post_delete, sender=Shanyraq)
+def count_deleted(sender, instance, **kwargs):
+    counters.bump("users" if sender is not Shanyraq else "shanyraqs", -1)
+
+
+@receiver(post_save, sender=ModeratorActionLog)
+def count_action(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        counters.bump("actions_today")
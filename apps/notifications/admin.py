@@ -1,20 +1,27 @@
 from django.contrib import admin
 
 from .models import Notification
+from .services import mark_read
 
 
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
-    list_display = ("title", "user", "notification_type", "is_read", "created_at")
+    list_display = ("title", "user", "notification_type", "digest_count", "is_read", "created_at")
     list_filter = ("notification_type", "is_read", "created_at")
     search_fields = ("title", "message", "user__email")
-    readonly_fields = ("created_at", "updated_at")
+    readonly_fields = ("digest_count", "created_at", "updated_at")
+    actions = ["mark_as_read"]
     fieldsets = (
         ("Basic Information", {"fields": ("user", "title", "message", "notification_type")}),
-        ("Status", {"fields": ("is_read",)}),
+        ("Status", {"fields": ("is_read", "digest_count")}),
         (
             "Related Object",
             {"fields": ("related_object_type", "related_object_id"), "classes": ("collapse",)},
         ),
         ("Timestamps", {"fields": ("created_at", "updated_at"), "classes": ("collapse",)}),
     )
+
+    @admin.action(description="Mark selected notifications as read")
+    def mark_as_read(self, request, queryset):
+        count = mark_read(queryset)
+        self.message_user(request, f"{count} notification(s) marked as read.")
@@ -0,0 +1,34 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.notifications.models import Notification
+from apps.notifications.services import PURGE_CHUNK_SIZE, purge_read_notifications
+
+
+class Command(BaseCommand):
+    help = "Delete read notifications older than N days in pk-ordered chunks (run nightly)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.NOTIFICATIONS_RETENTION_DAYS,
+            help="Keep read notifications this many days (default NOTIFICATIONS_RETENTION_DAYS)",
+        )
+        parser.add_argument("--chunk-size", type=int, default=PURGE_CHUNK_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="Only report how many notifications would be deleted")
+
+    def handle(self, *args, **options):
+        if options["days"] < 1 or options["chunk_size"] < 1:
+            raise CommandError("--days and --chunk-size must be at least 1.")
+        cutoff = timezone.now() - timedelta(days=options["days"])
+
+        if options["dry_run"]:
+            count = Notification.objects.filter(is_read=True, created_at__lt=cutoff).count()
+            self.stdout.write(f"Would delete {count} read notification(s) older than {options['days']} day(s).")
+            return
+        deleted = purge_read_notifications(cutoff, options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} read notification(s) older than {options['days']} day(s)."))
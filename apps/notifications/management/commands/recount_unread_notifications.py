@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.notifications.services import recount_unread
+
+
+class Command(BaseCommand):
+    help = "Recompute UserProfile.unread_notifications from the notifications table (repairs counter drift)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, action="append", dest="user_ids", help="User id (repeatable; default all)")
+
+    def handle(self, *args, **options):
+        updated = recount_unread(options["user_ids"])
+        self.stdout.write(self.style.SUCCESS(f"Recounted unread notifications for {updated} profile(s)."))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.accounts.models import Role
+from apps.notifications.services import notify_audience
+
+
+class Command(BaseCommand):
+    help = "Send a system notification to an audience (whole school, shanyraq, role, class or team)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("title")
+        parser.add_argument("message")
+        parser.add_argument("--all", action="store_true", help="Every active user")
+        parser.add_argument("--shanyraq", type=int, help="Shanyraq id")
+        parser.add_argument("--role", choices=Role.values)
+        parser.add_argument("--class", dest="class_name", help="Class name, e.g. 10A")
+        parser.add_argument("--team", type=int, help="Team id")
+        parser.add_argument("--user", type=int, action="append", dest="user_ids", help="User id (repeatable)")
+
+    def handle(self, *args, **options):
+        audience = {
+            key: options[key] for key in ("user_ids", "shanyraq", "role", "class_name", "team") if options[key]
+        }
+        if not audience and not options["all"]:
+            raise CommandError("Choose an audience: --all, --shanyraq, --role, --class, --team or --user.")
+        sent = notify_audience(options["title"], options["message"], everyone=options["all"], **audience)
+        self.stdout.write(self.style.SUCCESS(f"Sent {sent} notification(s)."))
@@ -31,6 +31,9 @@ class Notification(models.Model):
         default=NotificationType.SYSTEM,
     )
     is_read = models.BooleanField(default=False)
+    digest_count = models.PositiveIntegerField(
+        default=1, help_text="Notifications folded into this one (same type, within the digest window)"
+    )
 
     # Optional: Link to related object (Event, Quest, etc.)
     related_object_type = models.CharField(max_length=50, blank=True, null=True)
@@ -43,6 +46,9 @@ class Notification(models.Model):
         verbose_name = "notification"
         verbose_name_plural = "notifications"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["user", "is_read", "created_at"]),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.user.email}"
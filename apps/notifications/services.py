@@ -0,0 +1,247 @@
+"""
+Notification fan-out: resolve an audience (users, shanyraq, role, class, team) to user
+ids and write the notifications with chunked bulk_create, so an announcement to the
+whole school is a handful of INSERTs instead of one per user.
+
+Each UserProfile carries an unread_notifications counter, adjusted with F() updates in
+the same transaction as every bulk insert and mark-read here (single saves and deletes
+go through signals.py), so the navbar badge never has to COUNT.
+
+Same-type unread notifications for a user within NOTIFICATIONS_DIGEST_MINUTES are folded
+into one row with a digest_count (types tied to a specific object are never folded);
+purge_read_notifications keeps the table bounded.
+"""
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from apps.accounts.models import UserProfile
+
+from .models import Notification, NotificationType
+
+NOTIFY_CHUNK_SIZE = 1000
+PURGE_CHUNK_SIZE = 1000
+
+# Never folded into a digest: invites need their own answer, announcements are one-offs and
+# the per-object types (this event was approved, that quest completed) would lose the earlier object
+DIGEST_EXCLUDED_TYPES = {
+    NotificationType.TEAM_INVITE,
+    NotificationType.SYSTEM,
+    NotificationType.EVENT_APPROVED,
+    NotificationType.EVENT_REJECTED,
+    NotificationType.QUEST_COMPLETED,
+    NotificationType.ACTIVITY_APPROVED,
+    NotificationType.ACHIEVEMENT_UNLOCKED,
+}
+
+
+def audience_user_ids(user_ids=None, shanyraq=None, role=None, class_name=None, team=None, everyone=False):
+    """
+    Queryset of active user ids matching any of the given criteria (or all active users
+    with everyone=True). shanyraq and team accept an instance or a pk.
+    """
+    users = get_user_model().objects.filter(is_active=True)
+    if not everyone:
+        match = Q()
+        if user_ids:
+            match |= Q(pk__in=user_ids)
+        if shanyraq:
+            match |= Q(profile__shanyraq=shanyraq)
+        if role:
+            match |= Q(role=role)
+        if class_name:
+            match |= Q(profile__class_name__iexact=class_name)
+        if team:
+            match |= Q(team_memberships__team=team)
+        if not match:
+            return users.none().values_list("pk", flat=True)
+        users = users.filter(match)
+        if team:
+            users = users.distinct()
+    return users.order_by("pk").values_list("pk", flat=True)
+
+
+def _related(obj):
+    return (obj._meta.label_lower, obj.pk) if obj is not None else (None, None)
+
+
+def build_notification(user_id, title, message, notification_type=NotificationType.SYSTEM, related=None):
+    """Unsaved Notification; `related` is the object it points to (event, team request, quest)."""
+    related_type, related_id = _related(related)
+    return Notification(
+        user_id=user_id,
+        title=title,
+        message=message,
+        notification_type=notification_type,
+        related_object_type=related_type,
+        related_object_id=related_id,
+    )
+
+
+def adjust_unread(deltas):
+    """Apply {user_id: delta} to the unread counters: one UPDATE per distinct delta, never below zero."""
+    by_delta = defaultdict(list)
+    for user_id, delta in deltas.items():
+        if delta:
+            by_delta[delta].append(user_id)
+    for delta, user_ids in by_delta.items():
+        UserProfile.objects.filter(user_id__in=user_ids).update(
+            unread_notifications=Greatest(F("unread_notifications") + delta, 0)
+        )
+
+
+def _is_digestible(notification):
+    return not notification.is_read and notification.notification_type not in DIGEST_EXCLUDED_TYPES
+
+
+def _fold_into_digests(batch):
+    """
+    Fold each unread, digestible notification into the newest unread row of the same type
+    for the same user created within the digest window (stored, or earlier in this batch):
+    that row takes the latest title/message and its digest_count grows. Returns the
+    notifications that still need inserting.
+    """
+    minutes = settings.NOTIFICATIONS_DIGEST_MINUTES
+    digestible = [n for n in batch if _is_digestible(n)]
+    if minutes <= 0 or not digestible:
+        return batch
+    now = timezone.now()
+    open_digests = (
+        Notification.objects.filter(
+            user_id__in={n.user_id for n in digestible},
+            notification_type__in={n.notification_type for n in digestible},
+            is_read=False,
+            created_at__gte=now - timedelta(minutes=minutes),
+        )
+        .select_for_update()
+        .order_by("created_at")
+        .values_list("pk", "user_id", "notification_type")
+    )
+    targets = {(user_id, notification_type): pk for pk, user_id, notification_type in open_digests}
+    stored, folded, new = {}, Counter(), []
+    for notification in batch:
+        key = (notification.user_id, notification.notification_type)
+        target = targets.get(key) if _is_digestible(notification) else None
+        if target is None:
+            new.append(notification)
+            if _is_digestible(notification):
+                targets[key] = notification
+        elif isinstance(target, Notification):
+            target.digest_count += 1
+            _copy_content(notification, target)
+        else:
+            stored[target] = notification
+            folded[target] += 1
+    if stored:
+        updates = []
+        for pk, latest in stored.items():
+            row = Notification(pk=pk, digest_count=F("digest_count") + folded[pk], updated_at=now)
+            _copy_content(latest, row)
+            updates.append(row)
+        Notification.objects.bulk_update(
+            updates, ["title", "message", "related_object_type", "related_object_id", "digest_count", "updated_at"]
+        )
+    return new
+
+
+def _copy_content(source, target):
+    target.title = source.title
+    target.message = source.message
+    target.related_object_type = source.related_object_type
+    target.related_object_id = source.related_object_id
+
+
+def _create_chunk(batch):
+    with transaction.atomic():
+        batch = _fold_into_digests(batch)
+        Notification.objects.bulk_create(batch)
+        adjust_unread(Counter(notification.user_id for notification in batch if not notification.is_read))
+
+
+def send_notifications(notifications, chunk_size=NOTIFY_CHUNK_SIZE):
+    """bulk_create an iterable of unsaved notifications chunk by chunk. Returns the number written."""
+    sent, batch = 0, []
+    for notification in notifications:
+        batch.append(notification)
+        if len(batch) >= chunk_size:
+            _create_chunk(batch)
+            sent += len(batch)
+            batch = []
+    if batch:
+        _create_chunk(batch)
+        sent += len(batch)
+    return sent
+
+
+def notify_users(user_ids, title, message, notification_type=NotificationType.SYSTEM, related=None, exclude=()):
+    """Send the same notification to every user id (a list or a values_list queryset). Returns the count."""
+    exclude = set(exclude)
+    if hasattr(user_ids, "iterator"):
+        user_ids = user_ids.iterator(chunk_size=NOTIFY_CHUNK_SIZE)
+    return send_notifications(
+        build_notification(user_id, title, message, notification_type, related)
+        for user_id in user_ids
+        if user_id not in exclude
+    )
+
+
+def notify_audience(title, message, notification_type=NotificationType.SYSTEM, related=None, exclude=(), **audience):
+    """Announce to an audience (see audience_user_ids for the keyword arguments). Returns the count."""
+    return notify_users(audience_user_ids(**audience), title, message, notification_type, related, exclude)
+
+
+def mark_read(notifications):
+    """
+    Mark a queryset of notifications read and lower each owner's unread counter by the
+    rows actually flipped (rows are locked first, so concurrent calls don't double count).
+    Returns the number marked.
+    """
+    with transaction.atomic():
+        rows = list(notifications.filter(is_read=False).select_for_update().order_by().values_list("pk", "user_id"))
+        if not rows:
+            return 0
+        Notification.objects.filter(pk__in=[pk for pk, _ in rows]).update(is_read=True, updated_at=timezone.now())
+        adjust_unread({user_id: -count for user_id, count in Counter(user_id for _, user_id in rows).items()})
+    return len(rows)
+
+
+def mark_all_read(user):
+    """Mark every unread notification of user read. Returns the number marked."""
+    return mark_read(Notification.objects.filter(user=user))
+
+
+def recount_unread(user_ids=None):
+    """Recompute unread counters from the notifications table (all profiles by default)."""
+    unread = (
+        Notification.objects.filter(user=OuterRef("user"), is_read=False)
+        .order_by()
+        .values("user")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    profiles = UserProfile.objects.all() if user_ids is None else UserProfile.objects.filter(user_id__in=user_ids)
+    return profiles.update(unread_notifications=Coalesce(Subquery(unread), 0))
+
+
+def purge_read_notifications(older_than, chunk_size=PURGE_CHUNK_SIZE):
+    """
+    Delete read notifications created before `older_than`, walking the table in pk order
+    one chunk (and one short transaction) at a time. Returns the number deleted.
+    Unread rows are kept, so unread counters are unaffected.
+    """
+    stale = Notification.objects.filter(is_read=True, created_at__lt=older_than).order_by("pk")
+    deleted, last_pk = 0, 0
+    while True:
+        ids = list(stale.filter(pk__gt=last_pk).values_list("pk", flat=True)[:chunk_size])
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            count, _ = Notification.objects.filter(pk__in=ids, is_read=True).delete()
+        deleted += count
+        last_pk = ids[-1]
@@ -0,0 +1,32 @@
+"""
+Signals for notifications app: keep UserProfile.unread_notifications in step with
+single-row saves and deletes (bulk paths adjust it in services.py).
+"""
+
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .models import Notification
+from .services import adjust_unread
+
+
+@receiver(post_init, sender=Notification)
+def remember_read_state(sender, instance, **kwargs):
+    instance._loaded_is_read = instance.__dict__.get("is_read")
+
+
+@receiver(post_save, sender=Notification)
+def count_unread_change(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw or (update_fields is not None and "is_read" not in update_fields):
+        return
+    was_unread = not created and instance._loaded_is_read is False
+    is_unread = not instance.is_read
+    if was_unread != is_unread:
+        adjust_unread({instance.user_id: 1 if is_unread else -1})
+    instance._loaded_is_read = instance.is_read
+
+
+@receiver(post_delete, sender=Notification)
+def uncount_deleted(sender, instance, **kwargs):
+    if not instance.is_read:
+        adjust_unread({instance.user_id: -1})
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from . import views
+
+app_name = "notifications"
+
+urlpatterns = [
+    path("read-all/", views.mark_all_read_view, name="mark_all_read"),
+]
@@ -0,0 +1,23 @@
+"""
+Notifications app: mark-all-read.
+"""
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import redirect
+from django.utils.http import url_has_allowed_host_and_scheme
+from django.views.decorators.http import require_POST
+
+from .services import mark_all_read
+
+
+@login_required
+@require_POST
+def mark_all_read_view(request):
+    """Mark every unread notification of the current user read and go back."""
+    count = mark_all_read(request.user)
+    if count:
+        messages.success(request, f"{count} notification(s) marked as read.")
+    next_url = request.POST.get("next")
+    if not url_has_allowed_host_and_scheme(next_url, allowed_hosts={request.get_host()}, require_https=request.is_secure()):
+        next_url = "core:home"
+    return redirect(next_url)
@@ -1,10 +1,20 @@
 """
-Season progress: XP calculation, quest completion, claim rewards.
+Season progress: XP calculation, quest completion, claim rewards, season stats.
 """
+from django.core.cache import cache
+from django.db.models import F, Q, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
+from apps.notifications.models import NotificationType
+from apps.notifications.services import notify_users
+
 from .models import Quest, Season, SeasonReward, UserQuestProgress, UserReward
 
+SEASON_STATS_CACHE_KEY = "season:{season_id}:stats"
+SEASON_STATS_CACHE_TIMEOUT = 300  # seconds
+SEASON_LEADERBOARD_SIZE = 50
+
 
 def get_user_season_xp(user, season):
     """Total XP earned by user in this season from completed quests."""
@@ -21,6 +31,14 @@ def add_quest_progress(user, quest, amount=1):
     if prog.current_progress >= prog.quest.target:
         prog.completed_at = timezone.now()
         prog.save(update_fields=["completed_at", "updated_at"])
+        invalidate_season_stats(quest.season_id)
+        notify_users(
+            [user.pk],
+            f"Quest completed: {quest.title}",
+            f"You completed \"{quest.title}\" and earned {quest.xp_reward} XP.",
+            NotificationType.QUEST_COMPLETED,
+            related=quest,
+        )
         return prog, True
     return prog, False
 
@@ -74,3 +92,87 @@ def get_user_reward_track(user, season):
             "locked": r.level > user_level,
         })
     return result
+
+
+def _compute_season_stats(season):
+    """
+    Per-user season XP in one grouped query, bucketed into levels in Python.
+    Participants are users with any progress row in the season; users with
+    progress but no completed quest sit on level 1.
+    """
+    rows = (
+        UserQuestProgress.objects.filter(quest__season=season, quest__is_active=True)
+        .values("user_id")
+        .annotate(
+            xp=Coalesce(
+                Sum(
+                    "quest__xp_reward",
+                    filter=Q(completed_at__isnull=False)
+                    | Q(current_progress__gte=F("quest__target")),
+                ),
+                0,
+            )
+        )
+        .order_by("-xp", "user_id")
+    )
+    histogram = {level: 0 for level in range(1, season.max_level + 1)}
+    leaderboard = []
+    for row in rows:
+        level = min(season.max_level, (row["xp"] // season.xp_per_level) + 1)
+        histogram[level] += 1
+        if row["xp"] > 0 and len(leaderboard) < SEASON_LEADERBOARD_SIZE:
+            leaderboard.append((row["user_id"], row["xp"], level))
+    return {
+        "histogram": [{"level": lvl, "count": cnt} for lvl, cnt in histogram.items()],
+        "participants": sum(histogram.values()),
+        "leaderboard": leaderboard,
+    }
+
+
+def get_season_stats(season):
+    """Cached leaderboard rows (user_id, xp, level) and level histogram for a season."""
+    key = SEASON_STATS_CACHE_KEY.format(season_id=season.pk)
+    stats = cache.get(key)
+    if stats is None:
+        stats = _compute_season_stats(season)
+        cache.set(key, stats, SEASON_STATS_CACHE_TIMEOUT)
+    return stats
+
+
+def invalidate_season_stats(season_id):
+    """Drop cached season stats (call when quest completion changes)."""
+    cache.delete(SEASON_STATS_CACHE_KEY.format(season_id=season_id))
+
+
+def season_leaderboard(season, limit=10):
+    """Top users on the season track: list of dicts with user, profile, rank, xp, level."""
+    from apps.accounts.models import User
+
+    rows = get_season_stats(season)["leaderboard"][:limit]
+    users = User.objects.filter(pk__in=[user_id for user_id, _, _ in rows]).select_related("profile")
+    users_by_id = {u.pk: u for u in users}
+    result = []
+    for rank, (user_id, xp, level) in enumerate(rows, 1):
+        user = users_by_id.get(user_id)
+        if user is None:
+            continue
+        # Accounts created without the profile signal get one on first read
+        profile = user.profile if hasattr(user, "profile") else user.get_profile()
+        result.append({
+            "user": user,
+            "profile": profile,
+            "rank": rank,
+            "xp": xp,
+            "level": level,
+        })
+    return result
+
+
+def season_level_histogram(season):
+    """Number of participants per level 1..max_level, with percent of the largest bucket."""
+    stats = get_season_stats(season)
+    peak = max((b["count"] for b in stats["histogram"]), default=0)
+    return [
+        {**bucket, "percent": int(100 * bucket["count"] / peak) if peak else 0}
+        for bucket in stats["histogram"]
+    ]
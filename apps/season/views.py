@@ -7,7 +7,13 @@ from django.shortcuts import get_object_or_404, redirect, render
 from django.views.decorators.http import require_http_methods, require_safe
 
 from .models import QuestType, Season
-from .services import claim_reward, get_user_reward_track, get_user_season_xp
+from .services import (
+    claim_reward,
+    get_user_reward_track,
+    get_user_season_xp,
+    season_leaderboard,
+    season_level_histogram,
+)
 
 
 def _get_active_season():
@@ -39,6 +45,8 @@ def season_dashboard_view(request):
                 "user_xp": 0,
                 "xp_progress": 0,
                 "xp_needed": 100,
+                "season_leaderboard": [],
+                "level_histogram": [],
             },
         )
 
@@ -73,6 +81,11 @@ def season_dashboard_view(request):
         for q in quests_daily + quests_weekly + quests_milestone:
             q._user_progress = None
 
+    # Level distribution is for teachers tuning quest difficulty
+    level_histogram = []
+    if getattr(request.user, "is_moderator", False):
+        level_histogram = season_level_histogram(season)
+
     return render(
         request,
         "season/dashboard.html",
@@ -87,6 +100,8 @@ def season_dashboard_view(request):
             "user_xp": user_xp,
             "xp_progress": xp_progress,
             "xp_needed": xp_needed,
+            "season_leaderboard": season_leaderboard(season, limit=10),
+            "level_histogram": level_histogram,
         },
     )
 
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shanyraq', '0003_remove_shanyraq_total_points_shanyraq_lifetime_sp_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activitysubmission',
+            index=models.Index(fields=['status', 'submitted_at'], name='shanyraq_ac_status_e35a0f_idx'),
+        ),
+    ]
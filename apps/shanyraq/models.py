@@ -91,6 +91,9 @@ class ActivitySubmission(models.Model):
         ordering = ["-submitted_at"]
         verbose_name = "Activity submission"
         verbose_name_plural = "Activity submissions"
+        indexes = [
+            models.Index(fields=["status", "submitted_at"]),
+        ]
 
     def __str__(self):
         return f"{self.user.email}: {self.title} ({self.status})"
@@ -3,7 +3,7 @@ Services for XP and SP management.
 """
 
 from django.db import transaction
-from django.db.models import Sum
+from django.db.models import Count, F, Sum
 
 from .models import Shanyraq, SourceType, XPLedger
 
@@ -98,6 +98,63 @@ class XPService:
 
         return ledger_entry
 
+    @staticmethod
+    @transaction.atomic
+    def award_xp_bulk(
+        user_ids,
+        delta_xp,
+        reason="",
+        source_type=SourceType.ADMIN,
+        reference_id=None,
+        approved_by=None,
+    ):
+        """
+        Award the same positive XP amount to many users at once.
+
+        Writes every ledger entry with one bulk_create, bumps user XP with one UPDATE
+        and adds delta_xp * members-awarded to each affected Shanyraq with one UPDATE
+        per Shanyraq (the cached SP stays the sum of member XP without re-aggregating).
+        Ids with no matching user are skipped. Returns the number of users awarded.
+        """
+        from apps.accounts.models import User, UserProfile
+
+        if delta_xp <= 0:
+            return 0
+        user_ids = list(User.objects.filter(pk__in=set(user_ids)).order_by("pk").values_list("pk", flat=True))
+        if not user_ids:
+            return 0
+        XPLedger.objects.bulk_create(
+            [
+                XPLedger(
+                    user_id=user_id,
+                    delta_xp=delta_xp,
+                    reason=reason,
+                    source_type=source_type,
+                    reference_id=reference_id,
+                    approved_by=approved_by,
+                )
+                for user_id in user_ids
+            ],
+            batch_size=500,
+        )
+        awarded = User.objects.filter(pk__in=user_ids).update(
+            season_xp=F("season_xp") + delta_xp,
+            lifetime_xp=F("lifetime_xp") + delta_xp,
+        )
+        per_shanyraq = (
+            UserProfile.objects.filter(user_id__in=user_ids, shanyraq__isnull=False)
+            .values("shanyraq_id")
+            .annotate(members=Count("pk"))
+            .order_by()
+        )
+        for row in per_shanyraq:
+            points = delta_xp * row["members"]
+            Shanyraq.objects.filter(pk=row["shanyraq_id"]).update(
+                season_sp=F("season_sp") + points,
+                lifetime_sp=F("lifetime_sp") + points,
+            )
+        return awarded
+
     @staticmethod
     def _recalculate_shanyraq_sp(shanyraq):
         """Recalculate season_sp and lifetime_sp for a Shanyraq."""
@@ -1,7 +1,14 @@
+from datetime import date, timedelta
+
 from django.contrib import admin
+from django.shortcuts import render
+from django.urls import path
+from django.utils import timezone
 from django.utils.html import format_html
 
-from .models import BookingApprovalLog, BookingStatus, Space, SpaceBooking
+from apps.core.services.timeline import school_timezone
+
+from .models import BookingApprovalLog, BookingSeries, BookingStatus, Space, SpaceBooking, SpaceUsageDaily
 
 
 @admin.register(Space)
@@ -17,7 +24,7 @@ class SpaceBookingAdmin(admin.ModelAdmin):
     list_display = ("space", "booked_by", "start_time", "end_time", "status_badge", "attendees_count", "created_at")
     list_filter = ("status", "space", "start_time")
     search_fields = ("space__name", "booked_by__email", "purpose")
-    raw_id_fields = ("space", "booked_by", "reviewed_by")
+    raw_id_fields = ("space", "series", "booked_by", "reviewed_by")
     readonly_fields = ("created_at", "updated_at")
     date_hierarchy = "start_time"
 
@@ -27,6 +34,7 @@ class SpaceBookingAdmin(admin.ModelAdmin):
             "approved": "green",
             "rejected": "red",
             "cancelled": "gray",
+            "expired": "gray",
         }
         c = colors.get(obj.status, "gray")
         return format_html('<span style="color: {};">{}</span>', c, obj.get_status_display())
@@ -34,9 +42,81 @@ class SpaceBookingAdmin(admin.ModelAdmin):
     status_badge.short_description = "Status"
 
 
+@admin.register(BookingSeries)
+class BookingSeriesAdmin(admin.ModelAdmin):
+    list_display = ("space", "booked_by", "frequency", "first_start", "until", "created_at")
+    list_filter = ("frequency", "space")
+    search_fields = ("space__name", "booked_by__email", "purpose")
+    raw_id_fields = ("space", "booked_by")
+    readonly_fields = ("created_at",)
+
+
 @admin.register(BookingApprovalLog)
 class BookingApprovalLogAdmin(admin.ModelAdmin):
     list_display = ("booking", "from_status", "to_status", "changed_by", "created_at")
     list_filter = ("to_status", "created_at")
     raw_id_fields = ("booking", "changed_by")
     readonly_fields = ("booking", "from_status", "to_status", "changed_by", "comment", "created_at")
+
+
+@admin.register(SpaceUsageDaily)
+class SpaceUsageDailyAdmin(admin.ModelAdmin):
+    list_display = ("date", "space", "booked_minutes", "booking_count", "computed_at")
+    list_filter = ("space__space_type", "space")
+    raw_id_fields = ("space",)
+    readonly_fields = ("space", "date", "booked_minutes", "hourly_minutes", "booking_count", "computed_at")
+    date_hierarchy = "date"
+    change_list_template = "admin/spaces/spaceusagedaily_changelist.html"
+
+    def has_add_permission(self, request):
+        return False
+
+    def get_urls(self):
+        urls = super().get_urls()
+        custom_urls = [
+            path(
+                "report/",
+                self.admin_site.admin_view(self.utilization_report_view),
+                name="spaces_spaceusagedaily_report",
+            ),
+        ]
+        return custom_urls + urls
+
+    def utilization_report_view(self, request):
+        from .services import UTILIZATION_REPORT_DEFAULT_DAYS, UTILIZATION_REPORT_MAX_DAYS, space_utilization_report
+
+        yesterday = timezone.localdate(timezone=school_timezone()) - timedelta(days=1)
+        try:
+            last_day = date.fromisoformat(request.GET.get("to") or yesterday.isoformat())
+            first_day = date.fromisoformat(
+                request.GET.get("from") or (last_day - timedelta(days=UTILIZATION_REPORT_DEFAULT_DAYS - 1)).isoformat()
+            )
+        except ValueError:
+            self.message_user(request, "Dates must be YYYY-MM-DD.", level="error")
+            last_day = yesterday
+            first_day = last_day - timedelta(days=UTILIZATION_REPORT_DEFAULT_DAYS - 1)
+        if first_day > last_day:
+            first_day, last_day = last_day, first_day
+        # Rollups stop at yesterday, and the report walks every day in the range
+        if last_day > yesterday:
+            last_day = yesterday
+            first_day = min(first_day, last_day)
+        if (last_day - first_day).days >= UTILIZATION_REPORT_MAX_DAYS:
+            first_day = last_day - timedelta(days=UTILIZATION_REPORT_MAX_DAYS - 1)
+            self.message_user(
+                request,
+                f"The report covers at most {UTILIZATION_REPORT_MAX_DAYS} days; showing {first_day} to {last_day}.",
+                level="warning",
+            )
+
+        return render(
+            request,
+            "admin/spaces/utilization_report.html",
+            {
+                **self.admin_site.each_context(request),
+                "title": "Space utilization",
+                "report": space_utilization_report(first_day, last_day),
+                "weekdays": ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"),
+                "opts": self.model._meta,
+            },
+        )
@@ -6,3 +6,6 @@ class SpacesConfig(AppConfig):
     name = 'apps.spaces'
     label = 'spaces'
     verbose_name = 'Spaces'
+
+    def ready(self):
+        import apps.spaces.signals  # noqa
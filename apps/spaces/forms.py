@@ -5,7 +5,7 @@ from datetime import datetime
 
 from django import forms
 
-from .models import Space, SpaceBooking
+from .models import RecurrenceFrequency, Space, SpaceBooking, SpaceType
 
 
 class BookingRequestForm(forms.Form):
@@ -31,6 +31,20 @@ class BookingRequestForm(forms.Form):
         initial=1,
         widget=forms.NumberInput(attrs={"class": "input-field", "placeholder": "Number of attendees"}),
     )
+    repeat = forms.ChoiceField(
+        required=False,
+        choices=[("", "Does not repeat")] + list(RecurrenceFrequency.choices),
+        widget=forms.Select(attrs={"class": "input-field"}),
+    )
+    repeat_until = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={"class": "input-field", "type": "date"}, format="%Y-%m-%d"),
+        input_formats=["%Y-%m-%d"],
+    )
+    repeat_exceptions = forms.CharField(
+        required=False,
+        widget=forms.TextInput(attrs={"class": "input-field", "placeholder": "Skip dates, e.g. 2026-03-22, 2026-03-29"}),
+    )
 
     def __init__(self, *args, **kwargs):
         space_id = kwargs.pop("space_id", None)
@@ -49,6 +63,59 @@ class BookingRequestForm(forms.Form):
         attendees = data.get("attendees_count")
         if space and attendees and attendees > space.capacity:
             self.add_error("attendees_count", f"Exceeds space capacity ({space.capacity}).")
+        if data.get("repeat"):
+            until = data.get("repeat_until")
+            if not until:
+                self.add_error("repeat_until", "Choose the date the booking repeats until.")
+            elif start and until < start.date():
+                self.add_error("repeat_until", "Must be on or after the first date.")
+        return data
+
+    def clean_repeat_exceptions(self):
+        raw = self.cleaned_data.get("repeat_exceptions") or ""
+        dates = []
+        for part in raw.replace(";", ",").split(","):
+            part = part.strip()
+            if not part:
+                continue
+            try:
+                dates.append(datetime.strptime(part, "%Y-%m-%d").date())
+            except ValueError:
+                raise forms.ValidationError(f"Invalid date: {part} (use YYYY-MM-DD).")
+        return dates
+
+
+class SpaceSearchForm(forms.Form):
+    """Find spaces free for a time range, filtered by capacity and type."""
+    date = forms.DateField(
+        widget=forms.DateInput(attrs={"class": "input-field", "type": "date"}, format="%Y-%m-%d"),
+        input_formats=["%Y-%m-%d"],
+    )
+    start = forms.TimeField(
+        widget=forms.TimeInput(attrs={"class": "input-field", "type": "time"}, format="%H:%M"),
+        input_formats=["%H:%M"],
+    )
+    end = forms.TimeField(
+        widget=forms.TimeInput(attrs={"class": "input-field", "type": "time"}, format="%H:%M"),
+        input_formats=["%H:%M"],
+    )
+    min_capacity = forms.IntegerField(
+        required=False,
+        min_value=1,
+        widget=forms.NumberInput(attrs={"class": "input-field", "placeholder": "Seats needed"}),
+    )
+    space_type = forms.MultipleChoiceField(
+        required=False,
+        choices=SpaceType.choices,
+        widget=forms.CheckboxSelectMultiple(),
+    )
+
+    def clean(self):
+        data = super().clean()
+        start = data.get("start")
+        end = data.get("end")
+        if start and end and end <= start:
+            self.add_error("end", "End time must be after start time.")
         return data
 
 
@@ -62,6 +129,7 @@ class BookingApproveRejectForm(forms.Form):
         required=False,
         widget=forms.Textarea(attrs={"class": "input-field", "rows": 3, "placeholder": "Comment (required for rejection)"}),
     )
+    apply_to_series = forms.BooleanField(required=False)
 
     def clean(self):
         data = super().clean()
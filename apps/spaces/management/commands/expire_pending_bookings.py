@@ -0,0 +1,44 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.spaces.models import BookingStatus, SpaceBooking
+from apps.spaces.services import STALE_BOOKING_CHUNK_SIZE, cancel_unreviewed_bookings, expire_stale_bookings
+
+
+class Command(BaseCommand):
+    help = "Expire pending bookings whose start has passed; optionally cancel ones still unreviewed shortly before start"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--cancel-before-hours",
+            type=int,
+            default=settings.SPACES_PENDING_AUTO_CANCEL_HOURS,
+            help="Cancel pending bookings starting within this many hours (0 = off; "
+            "default SPACES_PENDING_AUTO_CANCEL_HOURS)",
+        )
+        parser.add_argument("--chunk-size", type=int, default=STALE_BOOKING_CHUNK_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="Only report how many bookings would change")
+
+    def handle(self, *args, **options):
+        hours = options["cancel_before_hours"]
+        if hours < 0 or options["chunk_size"] < 1:
+            raise CommandError("--cancel-before-hours must be >= 0 and --chunk-size >= 1.")
+        now = timezone.now()
+
+        if options["dry_run"]:
+            pending = SpaceBooking.objects.filter(status=BookingStatus.PENDING)
+            stale = pending.filter(start_time__lte=now).count()
+            self.stdout.write(f"Would expire {stale} booking(s).")
+            if hours:
+                due = pending.filter(start_time__gt=now, start_time__lte=now + timedelta(hours=hours)).count()
+                self.stdout.write(f"Would cancel {due} booking(s) starting within {hours} hour(s).")
+            return
+
+        expired = expire_stale_bookings(now, options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Expired {expired} pending booking(s)."))
+        if hours:
+            cancelled = cancel_unreviewed_bookings(hours, now, options["chunk_size"])
+            self.stdout.write(self.style.SUCCESS(f"Cancelled {cancelled} unreviewed booking(s) starting within {hours} hour(s)."))
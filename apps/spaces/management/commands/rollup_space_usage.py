@@ -0,0 +1,38 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.core.services.timeline import school_timezone
+from apps.spaces.services import rollup_space_usage
+
+
+class Command(BaseCommand):
+    help = "Roll up approved booking minutes per space per day into SpaceUsageDaily (run nightly)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date",
+            help="Last day to roll up, YYYY-MM-DD (default: yesterday in the school timezone)",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=1,
+            help="Number of days ending at --date to recompute (e.g. 7 to catch late changes)",
+        )
+
+    def handle(self, *args, **options):
+        if options["date"]:
+            try:
+                last_day = date.fromisoformat(options["date"])
+            except ValueError:
+                raise CommandError("--date must be YYYY-MM-DD.")
+        else:
+            last_day = timezone.localdate(timezone=school_timezone()) - timedelta(days=1)
+        if options["days"] < 1:
+            raise CommandError("--days must be at least 1.")
+        first_day = last_day - timedelta(days=options["days"] - 1)
+
+        rows = rollup_space_usage(first_day, last_day)
+        self.stdout.write(self.style.SUCCESS(f"Rolled up {first_day} to {last_day}: {rows} space-day row(s)."))
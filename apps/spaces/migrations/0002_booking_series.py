@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:55
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spaces', '0001_spaces_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingSeries',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('frequency', models.CharField(choices=[('weekly', 'Weekly'), ('biweekly', 'Every two weeks')], default='weekly', max_length=20)),
+                ('first_start', models.DateTimeField(help_text='Start of the first occurrence')),
+                ('first_end', models.DateTimeField(help_text='End of the first occurrence')),
+                ('until', models.DateField(help_text='Last date an occurrence may start on')),
+                ('exceptions', models.JSONField(blank=True, default=list, help_text='ISO dates (YYYY-MM-DD) to skip')),
+                ('purpose', models.TextField(blank=True)),
+                ('attendees_count', models.PositiveIntegerField(default=1)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('booked_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='booking_series', to=settings.AUTH_USER_MODEL)),
+                ('space', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='booking_series', to='spaces.space')),
+            ],
+            options={
+                'verbose_name': 'booking series',
+                'verbose_name_plural': 'booking series',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='spacebooking',
+            name='series',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='bookings', to='spaces.bookingseries'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spaces', '0002_booking_series'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpaceUsageDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('booked_minutes', models.PositiveIntegerField(default=0)),
+                ('hourly_minutes', models.JSONField(default=list, help_text='24 values: booked minutes per local hour')),
+                ('booking_count', models.PositiveIntegerField(default=0)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('space', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='usage_days', to='spaces.space')),
+            ],
+            options={
+                'verbose_name': 'space usage (daily)',
+                'verbose_name_plural': 'space usage (daily)',
+                'ordering': ['-date', 'space'],
+                'indexes': [models.Index(fields=['date'], name='spaces_spac_date_b58221_idx')],
+                'unique_together': {('space', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spaces', '0003_space_usage_daily'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='bookingapprovallog',
+            name='from_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected'), ('cancelled', 'Cancelled'), ('expired', 'Expired')], max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='bookingapprovallog',
+            name='to_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected'), ('cancelled', 'Cancelled'), ('expired', 'Expired')], max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='spacebooking',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected'), ('cancelled', 'Cancelled'), ('expired', 'Expired')], default='pending', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='spacebooking',
+            index=models.Index(condition=models.Q(('status__in', ['pending', 'approved'])), fields=['space', 'start_time', 'end_time'], name='spaces_booking_active_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spaces', '0004_booking_expiry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='spacebooking',
+            index=models.Index(fields=['status', 'created_at'], name='spaces_spac_status_633f11_idx'),
+        ),
+    ]
@@ -1,6 +1,6 @@
 """
 Spaces app: room/space booking with calendar and approval workflow.
-Status flow: Pending -> Approved -> Rejected / Cancelled
+Status flow: Pending -> Approved -> Rejected / Cancelled; Pending -> Expired once its start passes
 """
 from django.conf import settings
 from django.core.exceptions import ValidationError
@@ -8,6 +8,8 @@ from django.db import models
 from django.db.models import Q
 from django.utils import timezone
 
+from apps.core.permissions import user_can_review
+
 
 class SpaceType(models.TextChoices):
     CLASSROOM = "classroom", "Classroom"
@@ -68,6 +70,52 @@ class BookingStatus(models.TextChoices):
     APPROVED = "approved", "Approved"
     REJECTED = "rejected", "Rejected"
     CANCELLED = "cancelled", "Cancelled"
+    EXPIRED = "expired", "Expired"
+
+
+class RecurrenceFrequency(models.TextChoices):
+    WEEKLY = "weekly", "Weekly"
+    BIWEEKLY = "biweekly", "Every two weeks"
+
+
+class BookingSeries(models.Model):
+    """Recurrence rule for a set of bookings (e.g. a club every Tuesday for a term)."""
+    space = models.ForeignKey(
+        Space,
+        on_delete=models.CASCADE,
+        related_name="booking_series",
+    )
+    booked_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="booking_series",
+    )
+    frequency = models.CharField(
+        max_length=20,
+        choices=RecurrenceFrequency.choices,
+        default=RecurrenceFrequency.WEEKLY,
+    )
+    first_start = models.DateTimeField(help_text="Start of the first occurrence")
+    first_end = models.DateTimeField(help_text="End of the first occurrence")
+    until = models.DateField(help_text="Last date an occurrence may start on")
+    exceptions = models.JSONField(default=list, blank=True, help_text="ISO dates (YYYY-MM-DD) to skip")
+    purpose = models.TextField(blank=True)
+    attendees_count = models.PositiveIntegerField(default=1)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "booking series"
+        verbose_name_plural = "booking series"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.space.name}: {self.get_frequency_display()} until {self.until}"
+
+    @property
+    def interval(self):
+        from datetime import timedelta
+        return timedelta(weeks=2 if self.frequency == RecurrenceFrequency.BIWEEKLY else 1)
 
 
 class SpaceBooking(models.Model):
@@ -77,6 +125,13 @@ class SpaceBooking(models.Model):
         on_delete=models.CASCADE,
         related_name="bookings",
     )
+    series = models.ForeignKey(
+        BookingSeries,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="bookings",
+    )
     booked_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.SET_NULL,
@@ -111,6 +166,13 @@ class SpaceBooking(models.Model):
         indexes = [
             models.Index(fields=["space", "start_time", "end_time"]),
             models.Index(fields=["status", "start_time"]),
+            models.Index(fields=["status", "created_at"]),
+            # Conflict checks only look at pending/approved rows
+            models.Index(
+                fields=["space", "start_time", "end_time"],
+                condition=Q(status__in=["pending", "approved"]),
+                name="spaces_booking_active_idx",
+            ),
         ]
 
     def __str__(self):
@@ -159,10 +221,8 @@ class SpaceBooking(models.Model):
         )
 
     def can_approve_or_reject(self, user):
-        """Admin or Teacher can approve/reject pending bookings."""
-        if not user.is_authenticated:
-            return False
-        return getattr(user, "role", None) in ("admin", "teacher") and self.status == BookingStatus.PENDING
+        """A reviewer (Admin, Teacher, staff) can approve/reject pending bookings."""
+        return user_can_review(user) and self.status == BookingStatus.PENDING
 
 
 class BookingApprovalLog(models.Model):
@@ -190,3 +250,29 @@ class BookingApprovalLog(models.Model):
 
     def __str__(self):
         return f"{self.booking.pk}: {self.from_status} → {self.to_status}"
+
+
+class SpaceUsageDaily(models.Model):
+    """Approved booked minutes for one space on one school-local day (nightly rollup)."""
+    space = models.ForeignKey(
+        Space,
+        on_delete=models.CASCADE,
+        related_name="usage_days",
+    )
+    date = models.DateField()
+    booked_minutes = models.PositiveIntegerField(default=0)
+    hourly_minutes = models.JSONField(default=list, help_text="24 values: booked minutes per local hour")
+    booking_count = models.PositiveIntegerField(default=0)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "space usage (daily)"
+        verbose_name_plural = "space usage (daily)"
+        ordering = ["-date", "space"]
+        unique_together = [["space", "date"]]
+        indexes = [
+            models.Index(fields=["date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.space.name}: {self.date} ({self.booked_minutes} min)"
@@ -1,73 +1,413 @@
 """
 Booking workflow: conflict detection, approval, smart slot suggestions.
 """
-from datetime import datetime, timedelta
+import hashlib
+from collections import defaultdict, namedtuple
+from datetime import datetime, time, timedelta
 
-from django.db.models import Q
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import CharField, Count, Exists, F, Max, OuterRef, Q, Value
 from django.utils import timezone
 
-from .models import BookingApprovalLog, BookingStatus, Space, SpaceBooking
+from apps.core.permissions import user_can_review
+from apps.core.services.timeline import bucket_by_day, local_midnight, school_timezone
+from apps.events.models import Event, EventStatus
 
+from .models import BookingApprovalLog, BookingSeries, BookingStatus, Space, SpaceBooking, SpaceUsageDaily
+from .signals import bookings_changed
 
-def check_booking_conflicts(space, start_time, end_time, exclude_booking_id=None):
-    """Return conflicting bookings for the given time range."""
-    conflicts = SpaceBooking.objects.filter(
-        space=space,
-        status__in=(BookingStatus.PENDING, BookingStatus.APPROVED),
+WORKING_DAY_START_HOUR = 8
+WORKING_DAY_END_HOUR = 18
+ACTIVE_BOOKING_STATUSES = (BookingStatus.PENDING, BookingStatus.APPROVED)
+ACTIVE_EVENT_STATUSES = (EventStatus.PENDING, EventStatus.APPROVED)
+WEEK_CALENDAR_CACHE_KEY = "spaces:{space_id}:week:{week_start}"
+WEEK_CALENDAR_CACHE_TIMEOUT = 60 * 60
+UTILIZATION_REPORT_DEFAULT_DAYS = 90
+UTILIZATION_REPORT_MAX_DAYS = 366
+BULK_REVIEW_WINDOW_DAYS = 14
+STALE_BOOKING_CHUNK_SIZE = 500
+
+
+Conflict = namedtuple("Conflict", "kind pk start_time end_time")
+
+
+def room_occupancy(start_time, end_time, approved_only=False):
+    """
+    (bookings, events) querysets of everything occupying rooms in the range: pending/
+    approved bookings, and events holding a space without a booking (events that have
+    one are represented by that booking only). approved_only narrows both to Approved.
+    Every availability check builds on this pair, so they all agree on what is busy.
+    """
+    booking_statuses = (BookingStatus.APPROVED,) if approved_only else ACTIVE_BOOKING_STATUSES
+    event_statuses = (EventStatus.APPROVED,) if approved_only else ACTIVE_EVENT_STATUSES
+    bookings = SpaceBooking.objects.filter(
+        status__in=booking_statuses,
         start_time__lt=end_time,
         end_time__gt=start_time,
-    ).select_related("booked_by")
+    )
+    events = Event.objects.filter(
+        space__isnull=False,
+        booking__isnull=True,
+        status__in=event_statuses,
+        start_at__lt=end_time,
+        end_at__gt=start_time,
+    )
+    return bookings, events
+
+
+def busy_intervals(
+    start_time,
+    end_time,
+    space_ids=None,
+    approved_only=False,
+    exclude_booking_ids=(),
+    exclude_series_id=None,
+):
+    """
+    {space_id: [(start, end), ...]} of bookings and room-only events overlapping the range
+    (see room_occupancy), from one UNION query. Intervals are neither merged nor clipped.
+    """
+    bookings, events = room_occupancy(start_time, end_time, approved_only)
+    if space_ids is not None:
+        bookings = bookings.filter(space_id__in=space_ids)
+        events = events.filter(space_id__in=space_ids)
+    if exclude_booking_ids:
+        bookings = bookings.exclude(pk__in=exclude_booking_ids)
+    if exclude_series_id:
+        bookings = bookings.exclude(series_id=exclude_series_id)
+    rows = (
+        bookings.order_by()
+        .values_list("space_id", "start_time", "end_time")
+        .union(events.order_by().values_list("space_id", "start_at", "end_at"), all=True)
+    )
+    intervals = defaultdict(list)
+    for space_id, start, end in rows:
+        intervals[space_id].append((start, end))
+    return intervals
+
+
+def check_booking_conflicts(space, start_time, end_time, exclude_booking_id=None, exclude_event_id=None):
+    """
+    Pending/approved bookings and room-only events overlapping the range on a space, as
+    Conflict rows. One UNION query over the two indexed interval lookups.
+    """
+    bookings, events = room_occupancy(start_time, end_time)
+    bookings = (
+        bookings.filter(space=space)
+        .annotate(kind=Value("booking", output_field=CharField()))
+        .order_by()
+        .values_list("kind", "pk", "start_time", "end_time")
+    )
     if exclude_booking_id:
-        conflicts = conflicts.exclude(pk=exclude_booking_id)
-    return list(conflicts)
+        bookings = bookings.exclude(pk=exclude_booking_id)
+    events = (
+        events.filter(space=space)
+        .annotate(kind=Value("event", output_field=CharField()))
+        .order_by()
+        .values_list("kind", "pk", "start_at", "end_at")
+    )
+    if exclude_event_id:
+        events = events.exclude(pk=exclude_event_id)
+    return [Conflict(*row) for row in bookings.union(events, all=True)]
 
 
-def suggest_available_slots(space, date, duration_hours=1, max_suggestions=5):
-    """Suggest available time slots for a given date and duration."""
-    # Define working hours: 8 AM to 6 PM
-    start_hour = 8
-    end_hour = 18
-    slots = []
-    
-    current_time = timezone.make_aware(datetime.combine(date, datetime.min.time()).replace(hour=start_hour))
-    end_of_day = timezone.make_aware(datetime.combine(date, datetime.min.time()).replace(hour=end_hour))
+def merge_busy_intervals(intervals, buffer=timedelta(0)):
+    """Sort (start, end) pairs, pad each by buffer and merge overlapping/touching ones."""
+    merged = []
+    for start, end in sorted((s - buffer, e + buffer) for s, e in intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def free_gaps(busy, window_start, window_end):
+    """Free (start, end) gaps inside the window, given merged busy intervals."""
+    gaps = []
+    cursor = window_start
+    for start, end in busy:
+        if end <= cursor:
+            continue
+        if start >= window_end:
+            break
+        if start > cursor:
+            gaps.append((cursor, start))
+        cursor = max(cursor, end)
+    if cursor < window_end:
+        gaps.append((cursor, window_end))
+    return gaps
+
+
+def working_hours(date, tz=None):
+    """(start, end) of the working day on `date`, in the school timezone by default."""
+    tz = tz or school_timezone()
+    return (
+        datetime.combine(date, time(WORKING_DAY_START_HOUR), tzinfo=tz),
+        datetime.combine(date, time(WORKING_DAY_END_HOUR), tzinfo=tz),
+    )
+
+
+def suggest_available_slots(
+    space,
+    date,
+    duration_hours=1,
+    max_suggestions=5,
+    granularity_minutes=15,
+    buffer_minutes=0,
+):
+    """
+    Suggest available time slots for a given date and duration.
+
+    Loads the day's bookings and room-only events in one query, merges them (padded by
+    buffer_minutes) and sweeps the free gaps within working hours. Slot starts are
+    aligned to granularity_minutes from the start of the working day, and suggestions
+    never overlap each other: the next one starts at least `duration` later.
+    """
+    day_start, day_end = working_hours(date)
     duration = timedelta(hours=duration_hours)
-    
-    while current_time + duration <= end_of_day and len(slots) < max_suggestions:
-        slot_end = current_time + duration
-        if not check_booking_conflicts(space, current_time, slot_end):
+    step = timedelta(minutes=granularity_minutes)
+    buffer = timedelta(minutes=buffer_minutes)
+
+    intervals = busy_intervals(day_start - buffer, day_end + buffer, space_ids=[space.pk])
+    busy = merge_busy_intervals(intervals[space.pk], buffer)
+
+    def aligned(moment):
+        """First grid-aligned start at or after moment."""
+        offset = (moment - day_start) % step
+        return moment if not offset else moment + (step - offset)
+
+    slots = []
+    for gap_start, gap_end in free_gaps(busy, day_start, day_end):
+        current_time = aligned(gap_start)
+        while current_time + duration <= gap_end:
+            if len(slots) >= max_suggestions:
+                return slots
             slots.append({
                 "start": current_time,
-                "end": slot_end,
+                "end": current_time + duration,
                 "available": True,
             })
-        current_time += timedelta(hours=1)  # Check every hour
-    
+            current_time = aligned(current_time + duration)
     return slots
 
 
-def create_booking(space, booked_by, start_time, end_time, purpose="", attendees_count=1):
-    """Create a new booking request (status: Pending)."""
-    conflicts = check_booking_conflicts(space, start_time, end_time)
-    if conflicts:
-        return None, f"Time slot conflicts with {len(conflicts)} existing booking(s)."
-    
-    booking = SpaceBooking.objects.create(
-        space=space,
-        booked_by=booked_by,
-        start_time=start_time,
-        end_time=end_time,
-        purpose=purpose,
-        attendees_count=attendees_count,
-        status=BookingStatus.PENDING,
+def nearest_free_slot(busy, start_time, end_time, window_start, window_end):
+    """
+    Free (start, end) slot of the requested duration closest to start_time within
+    the window, given merged busy intervals. Returns None if nothing fits.
+    """
+    duration = end_time - start_time
+    best = None
+    for gap_start, gap_end in free_gaps(busy, window_start, window_end):
+        if gap_end - gap_start < duration:
+            continue
+        candidate = min(max(start_time, gap_start), gap_end - duration)
+        if best is None or abs(candidate - start_time) < abs(best - start_time):
+            best = candidate
+    if best is None:
+        return None
+    return best, best + duration
+
+
+def search_available_spaces(start_time, end_time, min_capacity=None, space_types=None):
+    """
+    Active spaces matching the capacity/type constraints, split into those free for
+    the whole range and those that are busy, each busy one with its nearest free slot
+    of the same duration on that working day.
+
+    Free spaces come from one anti-join (NOT EXISTS an overlapping booking or room-only
+    event, see room_occupancy); busy intervals for the rest are loaded in one more query.
+    Returns (free_spaces, busy_spaces) where busy_spaces is a list of
+    {"space", "nearest_slot"} dicts and nearest_slot is a (start, end) tuple or None.
+    """
+    spaces = Space.objects.filter(is_active=True)
+    if min_capacity:
+        spaces = spaces.filter(capacity__gte=min_capacity)
+    if space_types:
+        spaces = spaces.filter(space_type__in=space_types)
+
+    bookings, events = room_occupancy(start_time, end_time)
+    spaces = list(
+        spaces.annotate(
+            has_booking=Exists(bookings.filter(space=OuterRef("pk"))),
+            has_event=Exists(events.filter(space=OuterRef("pk"))),
+        ).order_by("space_type", "capacity", "name")
     )
-    BookingApprovalLog.objects.create(
-        booking=booking,
-        from_status="",
-        to_status=BookingStatus.PENDING,
-        changed_by=booked_by,
-        comment="Booking created",
+    free_spaces = [space for space in spaces if not (space.has_booking or space.has_event)]
+    busy = [space for space in spaces if space.has_booking or space.has_event]
+    if not busy:
+        return free_spaces, []
+
+    day_start, day_end = working_hours(start_time.astimezone(school_timezone()).date())
+    window_start = min(start_time, day_start)
+    window_end = max(end_time, day_end)
+    intervals_by_space = busy_intervals(window_start, window_end, space_ids=[space.pk for space in busy])
+
+    busy_spaces = []
+    for space in busy:
+        merged = merge_busy_intervals(intervals_by_space[space.pk])
+        busy_spaces.append({
+            "space": space,
+            "nearest_slot": nearest_free_slot(merged, start_time, end_time, window_start, window_end),
+        })
+    return free_spaces, busy_spaces
+
+
+def _free_busy_range(start_date, days):
+    range_start = local_midnight(start_date)
+    return range_start, range_start + timedelta(days=days)
+
+
+def free_busy_etag(start_date, days=7, slot_minutes=30):
+    """
+    Cheap version tag for a free/busy matrix: one aggregate each over bookings and
+    room-linked events touching the range, plus one over active spaces. Any booking or
+    event change bumps updated_at.
+    """
+    range_start, range_end = _free_busy_range(start_date, days)
+    bookings = SpaceBooking.objects.filter(
+        start_time__lt=range_end,
+        end_time__gt=range_start,
+    ).aggregate(last=Max("updated_at"), n=Count("pk"))
+    events = Event.objects.filter(
+        space__isnull=False,
+        start_at__lt=range_end,
+        end_at__gt=range_start,
+    ).aggregate(last=Max("updated_at"), n=Count("pk"))
+    spaces = Space.objects.filter(is_active=True).aggregate(last=Max("updated_at"), n=Count("pk"))
+    raw = (
+        f"{start_date}:{days}:{slot_minutes}:{bookings['last']}:{bookings['n']}:"
+        f"{events['last']}:{events['n']}:{spaces['last']}:{spaces['n']}"
     )
+    return hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+
+
+def build_free_busy(start_date, days=7, slot_minutes=30):
+    """
+    Free/busy matrix for all active spaces over [start_date, start_date + days).
+
+    Loads every booking and room-only event in the range with one query, groups them by
+    space in Python and returns, per space, merged busy intervals plus a bitmap string
+    with one character per slot_minutes slot ("1" = busy, "0" = free).
+    """
+    range_start, range_end = _free_busy_range(start_date, days)
+    slot = timedelta(minutes=slot_minutes)
+    slot_count = int((range_end - range_start) / slot)
+
+    spaces = list(Space.objects.filter(is_active=True).order_by("name").values("id", "name", "space_type", "capacity"))
+    intervals_by_space = busy_intervals(range_start, range_end, space_ids=[space["id"] for space in spaces])
+
+    for space in spaces:
+        busy = merge_busy_intervals(
+            (max(start, range_start), min(end, range_end)) for start, end in intervals_by_space.get(space["id"], ())
+        )
+        bits = bytearray(b"0" * slot_count)
+        for start, end in busy:
+            first = int((start - range_start) / slot)
+            last = -int(-(end - range_start) / slot)  # ceil
+            bits[first:last] = b"1" * (last - first)
+        space["busy"] = [(start.isoformat(), end.isoformat()) for start, end in busy]
+        space["bitmap"] = bits.decode()
+    return {
+        "start": range_start.isoformat(),
+        "end": range_end.isoformat(),
+        "slot_minutes": slot_minutes,
+        "spaces": spaces,
+    }
+
+
+def get_week_calendar(space, week_start, tz=None):
+    """
+    Bookings of one space split per local day for the week starting on week_start
+    (a Monday), as returned by bucket_by_day(). Cached per (space, week); entries
+    are dropped by invalidate_week_calendars() whenever a booking in that week changes.
+    """
+    key = WEEK_CALENDAR_CACHE_KEY.format(space_id=space.pk, week_start=week_start.isoformat())
+    days = cache.get(key)
+    if days is None:
+        tz = tz or school_timezone()
+        bookings = (
+            SpaceBooking.objects.filter(
+                space=space,
+                status__in=ACTIVE_BOOKING_STATUSES,
+                start_time__lt=local_midnight(week_start + timedelta(days=7), tz),
+                end_time__gt=local_midnight(week_start, tz),
+            )
+            .only("pk", "status", "start_time", "end_time")
+            .order_by("start_time")
+        )
+        days = bucket_by_day(bookings, week_start, 7, tz=tz)
+        cache.set(key, days, WEEK_CALENDAR_CACHE_TIMEOUT)
+    return days
+
+
+def week_calendar_keys(space_id, intervals, tz=None):
+    """Cache keys of every local week touched by the given (start, end) intervals."""
+    tz = tz or school_timezone()
+    keys = set()
+    for start, end in intervals:
+        first = start.astimezone(tz).date()
+        last = (end - timedelta(microseconds=1)).astimezone(tz).date()
+        week = first - timedelta(days=first.weekday())
+        while week <= last:
+            keys.add(WEEK_CALENDAR_CACHE_KEY.format(space_id=space_id, week_start=week.isoformat()))
+            week += timedelta(weeks=1)
+    return keys
+
+
+def invalidate_week_calendars(space_id, intervals):
+    """Drop cached week calendars touched by intervals, once the current transaction commits."""
+    keys = week_calendar_keys(space_id, intervals)
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(list(keys)))
+
+
+def lock_space(space):
+    """
+    Serialize booking writes for one space until the surrounding transaction ends.
+    Uses a row lock where the backend supports SELECT ... FOR UPDATE; SQLite has no
+    row locks, so a no-op write takes its database write lock up front instead.
+    Must be called inside transaction.atomic().
+    """
+    if connection.features.has_select_for_update:
+        Space.objects.select_for_update().only("pk").get(pk=space.pk)
+    else:
+        Space.objects.filter(pk=space.pk).update(is_active=F("is_active"))
+
+
+def create_booking(space, booked_by, start_time, end_time, purpose="", attendees_count=1, event=None):
+    """
+    Create a new booking request (status: Pending).
+    With `event`, the booking becomes that event's room reservation (event.booking).
+    """
+    with transaction.atomic():
+        lock_space(space)
+        conflicts = check_booking_conflicts(space, start_time, end_time, exclude_event_id=event.pk if event else None)
+        if conflicts:
+            return None, f"Time slot conflicts with {len(conflicts)} existing booking(s) or event(s)."
+
+        booking = SpaceBooking.objects.create(
+            space=space,
+            booked_by=booked_by,
+            start_time=start_time,
+            end_time=end_time,
+            purpose=purpose,
+            attendees_count=attendees_count,
+            status=BookingStatus.PENDING,
+        )
+        BookingApprovalLog.objects.create(
+            booking=booking,
+            from_status="",
+            to_status=BookingStatus.PENDING,
+            changed_by=booked_by,
+            comment="Booking created",
+        )
+        if event is not None:
+            event.booking = booking
+            event.save(update_fields=["booking", "updated_at"])
     return booking, None
 
 
@@ -75,27 +415,34 @@ def approve_booking(booking, user, comment=""):
     """Approve a pending booking."""
     if booking.status != BookingStatus.PENDING:
         return False, "Booking is not pending."
-    if getattr(user, "role", None) not in ("admin", "teacher"):
-        return False, "Only Admin or Teacher can approve."
-    
-    # Double-check for conflicts
-    conflicts = check_booking_conflicts(booking.space, booking.start_time, booking.end_time, booking.pk)
-    if conflicts:
-        return False, f"Time slot now conflicts with {len(conflicts)} approved booking(s)."
-    
-    old_status = booking.status
-    booking.status = BookingStatus.APPROVED
-    booking.reviewed_by = user
-    booking.reviewed_at = timezone.now()
-    booking.save(update_fields=["status", "reviewed_by", "reviewed_at", "updated_at"])
-    
-    BookingApprovalLog.objects.create(
-        booking=booking,
-        from_status=old_status,
-        to_status=BookingStatus.APPROVED,
-        changed_by=user,
-        comment=comment or "Approved",
-    )
+    if not user_can_review(user):
+        return False, "Only Admin, Teacher or staff can approve."
+
+    with transaction.atomic():
+        lock_space(booking.space)
+        # Another reviewer may have acted while we waited for the lock
+        booking.refresh_from_db(fields=["status"])
+        if booking.status != BookingStatus.PENDING:
+            return False, "Booking is not pending."
+
+        # Double-check for conflicts
+        conflicts = check_booking_conflicts(booking.space, booking.start_time, booking.end_time, booking.pk)
+        if conflicts:
+            return False, f"Time slot now conflicts with {len(conflicts)} other booking(s) or event(s)."
+
+        old_status = booking.status
+        booking.status = BookingStatus.APPROVED
+        booking.reviewed_by = user
+        booking.reviewed_at = timezone.now()
+        booking.save(update_fields=["status", "reviewed_by", "reviewed_at", "updated_at"])
+
+        BookingApprovalLog.objects.create(
+            booking=booking,
+            from_status=old_status,
+            to_status=BookingStatus.APPROVED,
+            changed_by=user,
+            comment=comment or "Approved",
+        )
     return True, None
 
 
@@ -103,8 +450,8 @@ def reject_booking(booking, user, reason):
     """Reject a pending booking."""
     if booking.status != BookingStatus.PENDING:
         return False, "Booking is not pending."
-    if getattr(user, "role", None) not in ("admin", "teacher"):
-        return False, "Only Admin or Teacher can reject."
+    if not user_can_review(user):
+        return False, "Only Admin, Teacher or staff can reject."
     if not (reason or "").strip():
         return False, "Rejection reason is required."
     
@@ -144,3 +491,528 @@ def cancel_booking(booking, user, reason=""):
         comment=reason or "Cancelled by user",
     )
     return True, None
+
+
+def expand_recurrence(first_start, first_end, interval, until, exceptions=()):
+    """(start, end) pairs for every occurrence starting on or before `until`, skipping exception dates."""
+    skip = {d if isinstance(d, str) else d.isoformat() for d in exceptions}
+    tz = school_timezone()
+    duration = first_end - first_start
+    occurrences = []
+    start = first_start
+    while start.astimezone(tz).date() <= until:
+        if start.astimezone(tz).date().isoformat() not in skip:
+            occurrences.append((start, start + duration))
+        start += interval
+    return occurrences
+
+
+def find_occurrence_conflicts(space, occurrences, exclude_series_id=None):
+    """
+    Occurrences (sorted by start) that overlap a pending/approved booking or room-only
+    event. Everything over the whole series span is loaded in one range query and
+    merged, then swept against the occurrences with a single moving pointer.
+    """
+    if not occurrences:
+        return []
+    existing = busy_intervals(
+        occurrences[0][0], occurrences[-1][1], space_ids=[space.pk], exclude_series_id=exclude_series_id
+    )
+    busy = merge_busy_intervals(existing[space.pk])
+    conflicts = []
+    i = 0
+    for start, end in occurrences:
+        while i < len(busy) and busy[i][1] <= start:
+            i += 1
+        if i < len(busy) and busy[i][0] < end:
+            conflicts.append((start, end))
+    return conflicts
+
+
+def create_recurring_booking(
+    space,
+    booked_by,
+    start_time,
+    end_time,
+    frequency,
+    until,
+    exceptions=(),
+    purpose="",
+    attendees_count=1,
+):
+    """
+    Create a BookingSeries and all its occurrences as Pending bookings.
+    Validates once for the whole series, checks every occurrence for conflicts in one
+    range query, then inserts bookings and their logs with bulk_create.
+    Returns (series or None, error).
+    """
+    if end_time <= start_time:
+        return None, "End time must be after start time."
+    if start_time < timezone.now():
+        return None, "Cannot book in the past."
+    if attendees_count > space.capacity:
+        return None, f"Exceeds space capacity ({space.capacity})."
+
+    series = BookingSeries(
+        space=space,
+        booked_by=booked_by,
+        frequency=frequency,
+        first_start=start_time,
+        first_end=end_time,
+        until=until,
+        exceptions=sorted({d if isinstance(d, str) else d.isoformat() for d in exceptions}),
+        purpose=purpose,
+        attendees_count=attendees_count,
+    )
+    if end_time - start_time >= series.interval:
+        return None, "Each occurrence must be shorter than the repeat interval."
+    occurrences = expand_recurrence(start_time, end_time, series.interval, until, series.exceptions)
+    if not occurrences:
+        return None, "The recurrence rule produces no dates."
+
+    with transaction.atomic():
+        lock_space(space)
+        conflicts = find_occurrence_conflicts(space, occurrences)
+        if conflicts:
+            dates = ", ".join(start.astimezone(school_timezone()).strftime("%Y-%m-%d") for start, _ in conflicts)
+            return None, f"{len(conflicts)} occurrence(s) conflict with existing bookings: {dates}."
+
+        series.save()
+        bookings = SpaceBooking.objects.bulk_create([
+            SpaceBooking(
+                space=space,
+                series=series,
+                booked_by=booked_by,
+                start_time=start,
+                end_time=end,
+                purpose=purpose,
+                attendees_count=attendees_count,
+                status=BookingStatus.PENDING,
+            )
+            for start, end in occurrences
+        ])
+        BookingApprovalLog.objects.bulk_create([
+            BookingApprovalLog(
+                booking=booking,
+                from_status="",
+                to_status=BookingStatus.PENDING,
+                changed_by=booked_by,
+                comment="Booking created (series)",
+            )
+            for booking in bookings
+        ])
+        bookings_changed.send(sender=SpaceBooking, space_id=space.pk, intervals=occurrences)
+    return series, None
+
+
+def _bulk_set_status(rows, to_status, changed_by, comment, **updates):
+    """
+    Move bookings to to_status with one UPDATE and one BookingApprovalLog batch, then send
+    bookings_changed per space. rows are pending (pk, space_id, start_time, end_time);
+    call inside transaction.atomic().
+    """
+    pks = [pk for pk, _, _, _ in rows]
+    SpaceBooking.objects.filter(pk__in=pks).update(status=to_status, updated_at=timezone.now(), **updates)
+    BookingApprovalLog.objects.bulk_create([
+        BookingApprovalLog(
+            booking_id=pk,
+            from_status=BookingStatus.PENDING,
+            to_status=to_status,
+            changed_by=changed_by,
+            comment=comment,
+        )
+        for pk in pks
+    ])
+    intervals_by_space = defaultdict(list)
+    for _, space_id, start, end in rows:
+        intervals_by_space[space_id].append((start, end))
+    for space_id, intervals in intervals_by_space.items():
+        bookings_changed.send(sender=SpaceBooking, space_id=space_id, intervals=intervals)
+
+
+def _apply_review(rows, user, to_status, comment, extra_updates=None):
+    """Review decision for pending bookings (see _bulk_set_status)."""
+    _bulk_set_status(
+        rows,
+        to_status,
+        user,
+        comment,
+        reviewed_by=user,
+        reviewed_at=timezone.now(),
+        **(extra_updates or {}),
+    )
+
+
+def _review_series(series, user, to_status, comment, extra_updates=None):
+    """Move every pending occurrence of a series to to_status with one UPDATE and one log batch."""
+    with transaction.atomic():
+        pending = list(
+            series.bookings.filter(status=BookingStatus.PENDING).values_list(
+                "pk", "space_id", "start_time", "end_time"
+            )
+        )
+        if not pending:
+            return 0
+        _apply_review(pending, user, to_status, comment, extra_updates)
+    return len(pending)
+
+
+def approve_booking_series(series, user, comment=""):
+    """Approve all pending occurrences of a series at once. Returns (count, error)."""
+    if not user_can_review(user):
+        return 0, "Only Admin, Teacher or staff can approve."
+    with transaction.atomic():
+        lock_space(series.space)
+        occurrences = list(
+            series.bookings.filter(status=BookingStatus.PENDING)
+            .order_by("start_time")
+            .values_list("start_time", "end_time")
+        )
+        if not occurrences:
+            return 0, "No pending occurrences in this series."
+        conflicts = find_occurrence_conflicts(series.space, occurrences, exclude_series_id=series.pk)
+        if conflicts:
+            return 0, f"{len(conflicts)} occurrence(s) now conflict with other bookings."
+        return _review_series(series, user, BookingStatus.APPROVED, comment or "Approved (series)"), None
+
+
+def reject_booking_series(series, user, reason):
+    """Reject all pending occurrences of a series at once. Returns (count, error)."""
+    if not user_can_review(user):
+        return 0, "Only Admin, Teacher or staff can reject."
+    if not (reason or "").strip():
+        return 0, "Rejection reason is required."
+    count = _review_series(
+        series,
+        user,
+        BookingStatus.REJECTED,
+        reason.strip(),
+        extra_updates={"rejection_reason": reason.strip()},
+    )
+    if not count:
+        return 0, "No pending occurrences in this series."
+    return count, None
+
+
+def group_overlapping(bookings):
+    """
+    Sort-and-sweep over bookings ordered by (space, start_time): split them into groups
+    of transitively overlapping bookings per space and set `overlaps_with` (pks of the
+    bookings each one overlaps) on every item. Groups with more than one booking conflict.
+    """
+    groups = []
+    active = []
+    reach = None
+    for booking in bookings:
+        booking.overlaps_with = []
+        same_space = groups and groups[-1][0].space_id == booking.space_id
+        if not same_space or booking.start_time >= reach:
+            groups.append([booking])
+            active = []
+            reach = booking.end_time
+        else:
+            groups[-1].append(booking)
+            reach = max(reach, booking.end_time)
+        active = [other for other in active if other.end_time > booking.start_time]
+        for other in active:
+            other.overlaps_with.append(booking.pk)
+            booking.overlaps_with.append(other.pk)
+        active.append(booking)
+    return groups
+
+
+def pending_review_groups(window_start, window_end):
+    """
+    Pending bookings in [window_start, window_end) grouped by overlap (see group_overlapping),
+    with `blocked` set on bookings that overlap an approved booking or approved room-only
+    event. Two queries: the pending bookings and the approved occupancy around them.
+    """
+    pending = list(
+        SpaceBooking.objects.filter(
+            status=BookingStatus.PENDING,
+            start_time__lt=window_end,
+            end_time__gt=window_start,
+        )
+        .select_related("space", "booked_by", "series")
+        .order_by("space__name", "space_id", "start_time")
+    )
+    if not pending:
+        return []
+    approved = busy_intervals(
+        min(b.start_time for b in pending),
+        max(b.end_time for b in pending),
+        space_ids={b.space_id for b in pending},
+        approved_only=True,
+    )
+    busy_by_space = {space_id: merge_busy_intervals(busy) for space_id, busy in approved.items()}
+
+    groups = group_overlapping(pending)
+    for group in groups:
+        busy = busy_by_space.get(group[0].space_id, [])
+        i = 0
+        for booking in group:
+            while i < len(busy) and busy[i][1] <= booking.start_time:
+                i += 1
+            booking.blocked = i < len(busy) and busy[i][0] < booking.end_time
+    return [
+        {"space": group[0].space, "bookings": group, "has_conflict": len(group) > 1}
+        for group in groups
+    ]
+
+
+def bulk_approve_bookings(booking_ids, user, comment=""):
+    """
+    Approve the selected pending bookings in one transaction. A booking is skipped when
+    approve_booking() would refuse it, i.e. it overlaps another pending/approved booking
+    outside the batch or a room-only event (busy_intervals, the check_booking_conflicts
+    sources), or when it overlaps a booking approved earlier in the same batch.
+    Returns ((approved_count, skipped_count), error).
+    """
+    if not user_can_review(user):
+        return (0, 0), "Only Admin, Teacher or staff can approve."
+    with transaction.atomic():
+        pending = SpaceBooking.objects.filter(pk__in=booking_ids, status=BookingStatus.PENDING)
+        space_ids = sorted(set(pending.values_list("space_id", flat=True)))
+        # Fixed lock order so two reviewers cannot deadlock each other
+        for space_id in space_ids:
+            lock_space(Space(pk=space_id))
+        rows = list(pending.order_by("space_id", "start_time").values_list("pk", "space_id", "start_time", "end_time"))
+        if not rows:
+            return (0, 0), "No pending bookings selected."
+
+        occupied = busy_intervals(
+            min(start for _, _, start, _ in rows),
+            max(end for _, _, _, end in rows),
+            space_ids=space_ids,
+            exclude_booking_ids=[pk for pk, _, _, _ in rows],
+        )
+        busy_by_space = {space_id: merge_busy_intervals(busy) for space_id, busy in occupied.items()}
+
+        accepted = []
+        last_space, last_end, i = None, None, 0
+        for row in rows:
+            _, space_id, start, end = row
+            if space_id != last_space:
+                last_space, last_end, i = space_id, None, 0
+            busy = busy_by_space.get(space_id, [])
+            while i < len(busy) and busy[i][1] <= start:
+                i += 1
+            if (i < len(busy) and busy[i][0] < end) or (last_end and start < last_end):
+                continue
+            accepted.append(row)
+            last_end = end
+        if accepted:
+            _apply_review(accepted, user, BookingStatus.APPROVED, comment or "Approved (bulk)")
+    return (len(accepted), len(rows) - len(accepted)), None
+
+
+def bulk_reject_bookings(booking_ids, user, reason):
+    """Reject the selected pending bookings in one transaction. Returns (count, error)."""
+    if not user_can_review(user):
+        return 0, "Only Admin, Teacher or staff can reject."
+    if not (reason or "").strip():
+        return 0, "Rejection reason is required."
+    with transaction.atomic():
+        rows = list(
+            SpaceBooking.objects.filter(pk__in=booking_ids, status=BookingStatus.PENDING).values_list(
+                "pk", "space_id", "start_time", "end_time"
+            )
+        )
+        if not rows:
+            return 0, "No pending bookings selected."
+        _apply_review(
+            rows,
+            user,
+            BookingStatus.REJECTED,
+            reason.strip(),
+            extra_updates={"rejection_reason": reason.strip()},
+        )
+    return len(rows), None
+
+
+def _close_pending_in_chunks(queryset, to_status, comment, chunk_size):
+    """
+    Move pending bookings matched by queryset to to_status in pk-ordered chunks, one
+    short transaction per chunk. Returns the number of bookings moved.
+    """
+    queryset = queryset.filter(status=BookingStatus.PENDING).order_by("pk")
+    if connection.features.has_select_for_update_skip_locked:
+        # Leave rows a reviewer is touching right now for the next run
+        queryset = queryset.select_for_update(skip_locked=True)
+    total = 0
+    while True:
+        with transaction.atomic():
+            rows = list(queryset.values_list("pk", "space_id", "start_time", "end_time")[:chunk_size])
+            if rows:
+                _bulk_set_status(rows, to_status, None, comment)
+        total += len(rows)
+        if len(rows) < chunk_size:
+            return total
+
+
+def expire_stale_bookings(now=None, chunk_size=STALE_BOOKING_CHUNK_SIZE):
+    """Mark pending bookings whose start time has passed as Expired. Returns the count."""
+    now = now or timezone.now()
+    return _close_pending_in_chunks(
+        SpaceBooking.objects.filter(start_time__lte=now),
+        BookingStatus.EXPIRED,
+        "Expired: not reviewed before start",
+        chunk_size,
+    )
+
+
+def cancel_unreviewed_bookings(hours, now=None, chunk_size=STALE_BOOKING_CHUNK_SIZE):
+    """Cancel pending bookings starting within `hours` that nobody has reviewed. Returns the count."""
+    now = now or timezone.now()
+    return _close_pending_in_chunks(
+        SpaceBooking.objects.filter(start_time__gt=now, start_time__lte=now + timedelta(hours=hours)),
+        BookingStatus.CANCELLED,
+        f"Auto-cancelled: not reviewed {hours} hour(s) before start",
+        chunk_size,
+    )
+
+
+def compute_daily_usage(first_day, last_day, tz=None):
+    """
+    Approved booked minutes per (space_id, local date) for [first_day, last_day], from one
+    range query. Overlapping approved bookings are merged so no minute counts twice.
+    Returns {(space_id, date): {"minutes", "hourly" (24 ints), "count"}}.
+    """
+    tz = tz or school_timezone()
+    window_start = local_midnight(first_day, tz)
+    window_end = local_midnight(last_day + timedelta(days=1), tz)
+    rows = (
+        SpaceBooking.objects.filter(
+            status=BookingStatus.APPROVED,
+            start_time__lt=window_end,
+            end_time__gt=window_start,
+        )
+        .order_by("space_id", "start_time")
+        .values_list("space_id", "start_time", "end_time")
+    )
+    by_space = defaultdict(list)
+    for space_id, start, end in rows:
+        by_space[space_id].append((max(start, window_start), min(end, window_end)))
+
+    seconds = defaultdict(lambda: [0] * 24)
+    counts = defaultdict(int)
+    for space_id, intervals in by_space.items():
+        for start, end in intervals:
+            day = start.astimezone(tz).date()
+            while day <= (end - timedelta(microseconds=1)).astimezone(tz).date():
+                counts[(space_id, day)] += 1
+                day += timedelta(days=1)
+        for start, end in merge_busy_intervals(intervals):
+            cursor = start.astimezone(tz)
+            end = end.astimezone(tz)
+            while cursor < end:
+                boundary = min(end, cursor.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1))
+                seconds[(space_id, cursor.date())][cursor.hour] += (boundary - cursor).total_seconds()
+                cursor = boundary
+
+    usage = {}
+    for key, hourly_seconds in seconds.items():
+        hourly = [round(value / 60) for value in hourly_seconds]
+        usage[key] = {"minutes": sum(hourly), "hourly": hourly, "count": counts[key]}
+    return usage
+
+
+def rollup_space_usage(first_day, last_day):
+    """
+    Recompute SpaceUsageDaily rows for [first_day, last_day]. Days without approved
+    bookings get no row. Returns the number of rows written.
+    """
+    usage = compute_daily_usage(first_day, last_day)
+    with transaction.atomic():
+        SpaceUsageDaily.objects.filter(date__gte=first_day, date__lte=last_day).delete()
+        SpaceUsageDaily.objects.bulk_create([
+            SpaceUsageDaily(
+                space_id=space_id,
+                date=day,
+                booked_minutes=data["minutes"],
+                hourly_minutes=data["hourly"],
+                booking_count=data["count"],
+            )
+            for (space_id, day), data in sorted(usage.items(), key=lambda item: (item[0][1], item[0][0]))
+        ])
+    return len(usage)
+
+
+def space_utilization_report(first_day, last_day):
+    """
+    Occupancy within working hours per space, per space type and per hour-of-week,
+    read from SpaceUsageDaily rollups only (never the bookings table).
+    Percentages are booked minutes over available minutes of every active space.
+    """
+    days = (last_day - first_day).days + 1
+    open_hours = range(WORKING_DAY_START_HOUR, WORKING_DAY_END_HOUR)
+    available_per_space = days * len(open_hours) * 60
+    weekday_days = [0] * 7
+    for offset in range(days):
+        weekday_days[(first_day + timedelta(days=offset)).weekday()] += 1
+
+    rollups = SpaceUsageDaily.objects.filter(date__gte=first_day, date__lte=last_day)
+    space_minutes = defaultdict(int)
+    space_bookings = defaultdict(int)
+    hour_of_week = [[0] * 24 for _ in range(7)]
+    for space_id, day, hourly, booking_count in rollups.values_list(
+        "space_id", "date", "hourly_minutes", "booking_count"
+    ):
+        space_minutes[space_id] += sum(hourly[hour] for hour in open_hours)
+        space_bookings[space_id] += booking_count
+        row = hour_of_week[day.weekday()]
+        for hour, minutes in enumerate(hourly):
+            row[hour] += minutes
+
+    spaces = list(Space.objects.filter(Q(is_active=True) | Q(pk__in=list(space_minutes))).order_by("name"))
+
+    def percent(minutes, available):
+        return round(100 * minutes / available, 1) if available else 0
+
+    per_space = sorted(
+        (
+            {
+                "space": space,
+                "booked_hours": round(space_minutes[space.pk] / 60, 1),
+                "bookings": space_bookings[space.pk],
+                "occupancy": percent(space_minutes[space.pk], available_per_space),
+            }
+            for space in spaces
+        ),
+        key=lambda row: -row["occupancy"],
+    )
+
+    type_totals = defaultdict(lambda: {"spaces": 0, "minutes": 0})
+    for space in spaces:
+        type_totals[space.get_space_type_display()]["spaces"] += 1
+        type_totals[space.get_space_type_display()]["minutes"] += space_minutes[space.pk]
+    per_type = sorted(
+        (
+            {
+                "space_type": label,
+                "spaces": totals["spaces"],
+                "occupancy": percent(totals["minutes"], totals["spaces"] * available_per_space),
+            }
+            for label, totals in type_totals.items()
+        ),
+        key=lambda row: -row["occupancy"],
+    )
+
+    hour_rows = [
+        {
+            "hour": hour,
+            "cells": [
+                percent(hour_of_week[weekday][hour], len(spaces) * weekday_days[weekday] * 60)
+                for weekday in range(7)
+            ],
+        }
+        for hour in open_hours
+    ]
+    return {
+        "first_day": first_day,
+        "last_day": last_day,
+        "days": days,
+        "per_space": per_space,
+        "per_type": per_type,
+        "hour_of_week": hour_rows,
+    }
@@ -0,0 +1,46 @@
+"""
+Signals for spaces app: drop cached week calendars when bookings change.
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+
+from .models import SpaceBooking
+
+# Sent by bulk writes (recurring series) that bypass post_save.
+# kwargs: space_id, intervals=[(start_time, end_time), ...]
+bookings_changed = Signal()
+
+_INTERVAL_FIELDS = {"space", "start_time", "end_time"}
+
+
+@receiver(pre_save, sender=SpaceBooking)
+def remember_booking_interval(sender, instance, update_fields=None, **kwargs):
+    """Keep the stored space/time so moving a booking also clears its old week."""
+    instance._previous_interval = None
+    if instance.pk is None or (update_fields is not None and not _INTERVAL_FIELDS & set(update_fields)):
+        return
+    instance._previous_interval = (
+        SpaceBooking.objects.filter(pk=instance.pk).values_list("space_id", "start_time", "end_time").first()
+    )
+
+
+@receiver(post_save, sender=SpaceBooking)
+@receiver(post_delete, sender=SpaceBooking)
+def invalidate_booking_weeks(sender, instance, **kwargs):
+    """Drop cached week calendars covering a saved or deleted booking."""
+    from .services import invalidate_week_calendars
+
+    invalidate_week_calendars(instance.space_id, [(instance.start_time, instance.end_time)])
+    previous = getattr(instance, "_previous_interval", None)
+    if previous:
+        space_id, start_time, end_time = previous
+        invalidate_week_calendars(space_id, [(start_time, end_time)])
+
+
+@receiver(bookings_changed, sender=SpaceBooking)
+def invalidate_bulk_booking_weeks(sender, space_id, intervals, **kwargs):
+    """Drop cached week calendars covering a batch of bookings."""
+    from .services import invalidate_week_calendars
+
+    invalidate_week_calendars(space_id, intervals)
@@ -0,0 +1,166 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+from django.db import OperationalError, connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.core.services.timeline import bucket_by_day, local_week_start, school_timezone
+
+from .models import BookingStatus, Space, SpaceBooking
+from .services import create_booking
+
+
+class ConcurrentBookingTests(TransactionTestCase):
+    """Parallel requests for the same slot must not both get through."""
+
+    workers = 8
+
+    def setUp(self):
+        self.space = Space.objects.create(name="Assembly Hall", capacity=200)
+        self.users = [
+            User.objects.create_user(email=f"student{i}@nis.edu.kz", username=f"student{i}", password="x")
+            for i in range(self.workers)
+        ]
+        start = (timezone.now() + timedelta(days=2)).replace(hour=14, minute=0, second=0, microsecond=0)
+        self.start, self.end = start, start + timedelta(hours=1)
+
+    def _book(self, user):
+        try:
+            booking, _ = create_booking(self.space, user, self.start, self.end, purpose="Club meeting")
+            return booking is not None
+        except OperationalError:
+            # SQLite may refuse a waiting writer outright ("database is locked")
+            return False
+        finally:
+            connection.close()
+
+    def test_single_slot_hammered_by_thread_pool(self):
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            results = list(pool.map(self._book, self.users))
+
+        self.assertEqual(sum(results), 1)
+        surviving = SpaceBooking.objects.filter(space=self.space).exclude(status=BookingStatus.CANCELLED)
+        self.assertEqual(surviving.count(), 1)
+
+
+@override_settings(SCHOOL_TIME_ZONE="Asia/Almaty")
+class SchoolTimezoneBookingTests(TestCase):
+    """A booking entered at a local time shows at that local time on the week calendar."""
+
+    def setUp(self):
+        self.space = Space.objects.create(name="Room 101", capacity=30)
+        self.user = User.objects.create_user(email="student@nis.edu.kz", username="student", password="x")
+        self.client.force_login(self.user)
+        self.day = local_week_start(1) + timedelta(days=2)
+
+    def test_booking_round_trips_through_calendar_in_local_time(self):
+        response = self.client.post(
+            reverse("spaces:booking_create"),
+            {
+                "space": self.space.pk,
+                "start_time": f"{self.day:%Y-%m-%d}T14:00",
+                "end_time": f"{self.day:%Y-%m-%d}T15:30",
+                "attendees_count": 5,
+            },
+        )
+        self.assertEqual(response.status_code, 302)
+        booking = SpaceBooking.objects.get(space=self.space)
+        local_start = booking.start_time.astimezone(school_timezone())
+        self.assertEqual((local_start.date(), local_start.hour), (self.day, 14))
+        self.assertEqual(booking.start_time.astimezone(dt_timezone.utc).hour, 9)
+
+        response = self.client.get(reverse("spaces:detail", args=[self.space.pk]), {"week": 1})
+        day = next(day for day in response.context["days"] if day["date"] == self.day)
+        [segment] = day["bookings"]
+        self.assertEqual(segment["item"].pk, booking.pk)
+        self.assertEqual((segment["start"].hour, segment["start"].minute), (14, 0))
+        self.assertEqual((segment["end"].hour, segment["end"].minute), (15, 30))
+        self.assertContains(response, "2:00 PM–3:30 PM")
+
+
+class BucketByDayTests(SimpleTestCase):
+    """Calendar day-splitting of intervals in a local timezone."""
+
+    tz = ZoneInfo("Asia/Almaty")
+    monday = date(2026, 3, 2)
+
+    def booking(self, start, end):
+        return SimpleNamespace(start_time=start.replace(tzinfo=self.tz), end_time=end.replace(tzinfo=self.tz))
+
+    def spans(self, buckets, day):
+        return [
+            (seg["start"].strftime("%H:%M"), seg["end"].strftime("%H:%M"), seg["continues_before"], seg["continues_after"])
+            for seg in buckets[day]
+        ]
+
+    def test_every_day_has_a_key(self):
+        buckets = bucket_by_day([], self.monday, 7, tz=self.tz)
+        self.assertEqual(list(buckets), [self.monday + timedelta(days=i) for i in range(7)])
+
+    def test_overnight_booking_splits_at_local_midnight(self):
+        overnight = self.booking(datetime(2026, 3, 3, 22), datetime(2026, 3, 4, 2))
+        buckets = bucket_by_day([overnight], self.monday, 7, tz=self.tz)
+        self.assertEqual(self.spans(buckets, date(2026, 3, 3)), [("22:00", "00:00", False, True)])
+        self.assertEqual(self.spans(buckets, date(2026, 3, 4)), [("00:00", "02:00", True, False)])
+        self.assertEqual(sum(len(segments) for segments in buckets.values()), 2)
+
+    def test_utc_input_is_bucketed_by_local_day(self):
+        # 20:00 UTC on Tuesday is 01:00 on Wednesday in Almaty (UTC+5)
+        start = datetime(2026, 3, 3, 20, tzinfo=dt_timezone.utc)
+        late = SimpleNamespace(start_time=start, end_time=start + timedelta(hours=1))
+        buckets = bucket_by_day([late], self.monday, 7, tz=self.tz)
+        self.assertEqual(buckets[date(2026, 3, 3)], [])
+        self.assertEqual(self.spans(buckets, date(2026, 3, 4)), [("01:00", "02:00", False, False)])
+
+    def test_multi_day_booking_is_clipped_to_the_range(self):
+        camp = self.booking(datetime(2026, 2, 27, 9), datetime(2026, 3, 4, 12))
+        buckets = bucket_by_day([camp], self.monday, 7, tz=self.tz)
+        self.assertEqual(self.spans(buckets, self.monday), [("00:00", "00:00", True, True)])
+        self.assertEqual(self.spans(buckets, date(2026, 3, 3)), [("00:00", "00:00", True, True)])
+        self.assertEqual(self.spans(buckets, date(2026, 3, 4)), [("00:00", "12:00", True, False)])
+        self.assertEqual(buckets[date(2026, 3, 5)], [])
+
+    def test_booking_ending_at_midnight_does_not_touch_next_day(self):
+        evening = self.booking(datetime(2026, 3, 2, 20), datetime(2026, 3, 3, 0))
+        buckets = bucket_by_day([evening], self.monday, 7, tz=self.tz)
+        self.assertEqual(self.spans(buckets, self.monday), [("20:00", "00:00", False, False)])
+        self.assertEqual(buckets[date(2026, 3, 3)], [])
+
+    def test_segments_keep_start_order_within_a_day(self):
+        early = self.booking(datetime(2026, 3, 2, 23), datetime(2026, 3, 3, 10))
+        late = self.booking(datetime(2026, 3, 3, 9), datetime(2026, 3, 3, 11))
+        buckets = bucket_by_day([early, late], self.monday, 7, tz=self.tz)
+        self.assertEqual([seg["item"] for seg in buckets[date(2026, 3, 3)]], [early, late])
+
+    def test_thousands_of_bookings_over_a_week(self):
+        # Every 7 minutes across the week and a day either side, lengths of 15 minutes to
+        # ~6 hours, so a share of them run past midnight or start outside the range
+        first = datetime(2026, 3, 1, 0, 0)
+        bookings = [
+            self.booking(first + timedelta(minutes=7 * i), first + timedelta(minutes=7 * i + 15 + (i * 37) % 360))
+            for i in range(5000)
+        ]
+        buckets = bucket_by_day(bookings, self.monday, 7, tz=self.tz)
+
+        range_start = datetime(2026, 3, 2, tzinfo=self.tz)
+        range_end = datetime(2026, 3, 9, tzinfo=self.tz)
+        expected = sum(
+            (min(b.end_time, range_end) - max(b.start_time, range_start) for b in bookings
+             if b.end_time > range_start and b.start_time < range_end),
+            timedelta(),
+        )
+        segments = [seg for day in buckets.values() for seg in day]
+        self.assertEqual(sum((seg["end"] - seg["start"] for seg in segments), timedelta()), expected)
+        for day, day_segments in buckets.items():
+            self.assertTrue(all(seg["start"].date() == day for seg in day_segments))
+            starts = [seg["start"] for seg in day_segments]
+            self.assertEqual(starts, sorted(starts))
+        overnight = [b for b in bookings if b.start_time.date() != (b.end_time - timedelta(microseconds=1)).date()]
+        self.assertTrue(overnight)
+        self.assertTrue(all(any(seg["item"] is b for seg in buckets[b.end_time.date()]) for b in overnight
+                            if self.monday <= b.end_time.date() <= date(2026, 3, 8)))
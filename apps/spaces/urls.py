@@ -6,6 +6,8 @@ app_name = "spaces"
 
 urlpatterns = [
     path("", views.space_list_view, name="list"),
+    path("search/", views.space_search_view, name="search"),
+    path("freebusy/", views.free_busy_view, name="free_busy"),
     path("my-bookings/", views.my_bookings_view, name="my_bookings"),
     path("booking/create/", views.booking_create_view, name="booking_create"),
     path("booking/create/<int:space_id>/", views.booking_create_view, name="booking_create_for_space"),
@@ -13,5 +15,7 @@ urlpatterns = [
     path("booking/<int:pk>/cancel/", views.booking_cancel_view, name="booking_cancel"),
     path("booking/<int:pk>/review/", views.booking_review_view, name="booking_review"),
     path("review/", views.booking_review_list_view, name="review_list"),
+    path("review/bulk/", views.booking_bulk_review_view, name="bulk_review"),
     path("<int:pk>/", views.space_detail_view, name="detail"),
+    path("<int:pk>/calendar.ics", views.space_calendar_feed_view, name="calendar_feed"),
 ]
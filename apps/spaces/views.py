@@ -5,21 +5,34 @@ from datetime import datetime, timedelta
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.http import HttpResponseForbidden
+from django.http import HttpResponseBadRequest, HttpResponseForbidden, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
-from django.views.decorators.http import require_http_methods, require_safe
+from django.views.decorators.http import condition, require_http_methods, require_safe
 
-from apps.accounts.decorators import teacher_required
+from apps.accounts.decorators import reviewer_required
+from apps.core.services.ical import calendar_response, feed_window_start, vevent
+from apps.core.services.timeline import local_midnight, local_week_start, school_timezone
 
-from .forms import BookingApproveRejectForm, BookingRequestForm
+from .forms import BookingApproveRejectForm, BookingRequestForm, SpaceSearchForm
 from .models import BookingStatus, Space, SpaceBooking
 from .services import (
+    BULK_REVIEW_WINDOW_DAYS,
     approve_booking,
+    approve_booking_series,
+    build_free_busy,
+    bulk_approve_bookings,
+    bulk_reject_bookings,
     cancel_booking,
     check_booking_conflicts,
     create_booking,
+    create_recurring_booking,
+    free_busy_etag,
+    get_week_calendar,
+    pending_review_groups,
     reject_booking,
+    reject_booking_series,
+    search_available_spaces,
     suggest_available_slots,
 )
 
@@ -38,46 +51,132 @@ def space_list_view(request):
     )
 
 
+@require_safe
+def space_search_view(request):
+    """Find all spaces free for a time range, with nearest free slots for busy ones."""
+    free_spaces = None
+    busy_spaces = []
+    start = end = None
+    if request.GET:
+        form = SpaceSearchForm(request.GET)
+        if form.is_valid():
+            date = form.cleaned_data["date"]
+            start = timezone.make_aware(datetime.combine(date, form.cleaned_data["start"]))
+            end = timezone.make_aware(datetime.combine(date, form.cleaned_data["end"]))
+            free_spaces, busy_spaces = search_available_spaces(
+                start,
+                end,
+                min_capacity=form.cleaned_data.get("min_capacity"),
+                space_types=form.cleaned_data.get("space_type"),
+            )
+    else:
+        form = SpaceSearchForm(initial={"date": timezone.localdate()})
+    return render(
+        request,
+        "spaces/space_search.html",
+        {
+            "section_name": "Spaces",
+            "form": form,
+            "free_spaces": free_spaces,
+            "busy_spaces": busy_spaces,
+            "search_start": start,
+            "search_end": end,
+        },
+    )
+
+
+FREE_BUSY_MAX_DAYS = 31
+FREE_BUSY_SLOT_MINUTES = (15, 30, 60)
+
+
+def _free_busy_params(request):
+    """Parse ?start=YYYY-MM-DD&days=N&slot=M; defaults to this week in 30-minute slots."""
+    start_str = request.GET.get("start")
+    if start_str:
+        start_date = datetime.strptime(start_str, "%Y-%m-%d").date()
+    else:
+        today = timezone.localdate()
+        start_date = today - timedelta(days=today.weekday())
+    days = int(request.GET.get("days", 7))
+    slot_minutes = int(request.GET.get("slot", 30))
+    if not 1 <= days <= FREE_BUSY_MAX_DAYS or slot_minutes not in FREE_BUSY_SLOT_MINUTES:
+        raise ValueError("Out of range")
+    return start_date, days, slot_minutes
+
+
+def _free_busy_etag(request):
+    try:
+        return free_busy_etag(*_free_busy_params(request))
+    except ValueError:
+        return None
+
+
+@require_safe
+@condition(etag_func=_free_busy_etag)
+def free_busy_view(request):
+    """JSON free/busy matrix for all active spaces (occupancy grid, front-desk screen)."""
+    try:
+        start_date, days, slot_minutes = _free_busy_params(request)
+    except ValueError:
+        return HttpResponseBadRequest(
+            f"Use start=YYYY-MM-DD, days=1..{FREE_BUSY_MAX_DAYS}, slot in {FREE_BUSY_SLOT_MINUTES}."
+        )
+    return JsonResponse(build_free_busy(start_date, days, slot_minutes))
+
+
+def booking_vevents(bookings):
+    """VEVENT line lists for bookings, streamed with .iterator()."""
+    for booking in bookings.iterator(chunk_size=500):
+        yield vevent(
+            uid=f"booking-{booking.pk}@nis-superapp",
+            start=booking.start_time,
+            end=booking.end_time,
+            summary=booking.purpose.splitlines()[0][:120] if booking.purpose else f"Booked: {booking.space.name}",
+            description=booking.purpose,
+            location=booking.space.location or booking.space.name,
+            stamp=booking.updated_at,
+            status="CONFIRMED" if booking.status == BookingStatus.APPROVED else "TENTATIVE",
+        )
+
+
+@require_safe
+def space_calendar_feed_view(request, pk):
+    """iCalendar feed of a space's approved bookings (subscribe from a phone calendar)."""
+    space = get_object_or_404(Space.objects.filter(is_active=True), pk=pk)
+    window = space.bookings.filter(end_time__gte=feed_window_start())
+    bookings = window.filter(status=BookingStatus.APPROVED).select_related("space").order_by("start_time")
+    return calendar_response(
+        request,
+        filename=f"space-{space.pk}.ics",
+        name=space.name,
+        events=booking_vevents(bookings),
+        version_querysets=[window],
+    )
+
+
 @require_safe
 def space_detail_view(request, pk):
-    """Space detail with weekly calendar view."""
+    """Space detail with weekly calendar view (days in the school timezone)."""
     space = get_object_or_404(Space.objects.filter(is_active=True), pk=pk)
     
     # Get week parameter (default: current week)
     week_offset = int(request.GET.get("week", 0))
-    today = timezone.now().date()
+    tz = school_timezone()
+    today = timezone.localdate(timezone=tz)
     # Start from Monday of the current week
-    start_of_week = today - timedelta(days=today.weekday()) + timedelta(weeks=week_offset)
+    start_of_week = local_week_start(week_offset, tz)
     
-    # Generate 7 days
-    days = []
-    for i in range(7):
-        day_date = start_of_week + timedelta(days=i)
-        days.append({
+    # Bookings split across every day they cover (cached per space and week)
+    segments_by_day = get_week_calendar(space, start_of_week, tz)
+    days = [
+        {
             "date": day_date,
             "day_name": day_date.strftime("%A"),
             "is_today": day_date == today,
-        })
-    
-    # Get bookings for this week
-    week_start = timezone.make_aware(datetime.combine(start_of_week, datetime.min.time()))
-    week_end = week_start + timedelta(days=7)
-    bookings = space.bookings.filter(
-        status__in=(BookingStatus.APPROVED, BookingStatus.PENDING),
-        start_time__lt=week_end,
-        end_time__gt=week_start,
-    ).select_related("booked_by").order_by("start_time")
-    
-    # Organize bookings by day and attach to day dict
-    bookings_by_day = {day["date"]: [] for day in days}
-    for booking in bookings:
-        booking_date = booking.start_time.date()
-        if booking_date in bookings_by_day:
-            bookings_by_day[booking_date].append(booking)
-    
-    # Attach bookings to each day
-    for day in days:
-        day["bookings"] = bookings_by_day.get(day["date"], [])
+            "bookings": segments,
+        }
+        for day_date, segments in segments_by_day.items()
+    ]
     
     return render(
         request,
@@ -87,6 +186,7 @@ def space_detail_view(request, pk):
             "space": space,
             "days": days,
             "week_offset": week_offset,
+            "school_time_zone": tz.key,
             "prev_week": week_offset - 1,
             "next_week": week_offset + 1,
         },
@@ -110,26 +210,55 @@ def booking_create_view(request, space_id=None):
             if timezone.is_naive(end):
                 end = timezone.make_aware(end)
             
-            booking, error = create_booking(
-                space=space,
-                booked_by=request.user,
-                start_time=start,
-                end_time=end,
-                purpose=form.cleaned_data.get("purpose", ""),
-                attendees_count=form.cleaned_data.get("attendees_count", 1),
-            )
-            if booking:
-                messages.success(request, f"Booking request created for {space.name}. Awaiting approval.")
-                return redirect("spaces:booking_detail", pk=booking.pk)
+            if form.cleaned_data.get("repeat"):
+                series, error = create_recurring_booking(
+                    space=space,
+                    booked_by=request.user,
+                    start_time=start,
+                    end_time=end,
+                    frequency=form.cleaned_data["repeat"],
+                    until=form.cleaned_data["repeat_until"],
+                    exceptions=form.cleaned_data.get("repeat_exceptions") or [],
+                    purpose=form.cleaned_data.get("purpose", ""),
+                    attendees_count=form.cleaned_data.get("attendees_count", 1),
+                )
+                if series:
+                    bookings = list(series.bookings.order_by("start_time").only("pk"))
+                    messages.success(
+                        request,
+                        f"{len(bookings)} recurring booking requests created for {space.name}. Awaiting approval.",
+                    )
+                    return redirect("spaces:booking_detail", pk=bookings[0].pk)
+                messages.error(request, error or "Could not create bookings.")
             else:
-                messages.error(request, error or "Could not create booking.")
+                booking, error = create_booking(
+                    space=space,
+                    booked_by=request.user,
+                    start_time=start,
+                    end_time=end,
+                    purpose=form.cleaned_data.get("purpose", ""),
+                    attendees_count=form.cleaned_data.get("attendees_count", 1),
+                )
+                if booking:
+                    messages.success(request, f"Booking request created for {space.name}. Awaiting approval.")
+                    return redirect("spaces:booking_detail", pk=booking.pk)
+                else:
+                    messages.error(request, error or "Could not create booking.")
     else:
         # Pre-fill with suggested slot if date provided
         date_str = request.GET.get("date")
         initial = {}
         if space_id:
             initial["space"] = space_id
-        if date_str and space_id:
+        start_str = request.GET.get("start")
+        end_str = request.GET.get("end")
+        if start_str and end_str:
+            try:
+                initial["start_time"] = datetime.strptime(start_str, "%Y-%m-%dT%H:%M")
+                initial["end_time"] = datetime.strptime(end_str, "%Y-%m-%dT%H:%M")
+            except ValueError:
+                pass
+        elif date_str and space_id:
             try:
                 date = datetime.strptime(date_str, "%Y-%m-%d").date()
                 space = Space.objects.get(pk=space_id, is_active=True)
@@ -155,7 +284,7 @@ def booking_create_view(request, space_id=None):
 @require_safe
 def booking_detail_view(request, pk):
     """Booking detail with status and actions."""
-    booking = get_object_or_404(SpaceBooking.objects.select_related("space", "booked_by", "reviewed_by"), pk=pk)
+    booking = get_object_or_404(SpaceBooking.objects.select_related("space", "booked_by", "reviewed_by", "series"), pk=pk)
     logs = booking.approval_logs.select_related("changed_by").order_by("-created_at")[:20]  # type: ignore[union-attr]
     
     # Check for conflicts (for pending bookings)
@@ -194,11 +323,11 @@ def booking_cancel_view(request, pk):
     return redirect("spaces:booking_detail", pk=pk)
 
 
-@teacher_required
+@reviewer_required
 @require_http_methods(["GET", "POST"])
 def booking_review_view(request, pk):
-    """Admin/Teacher review panel: approve or reject."""
-    booking = get_object_or_404(SpaceBooking.objects.select_related("space", "booked_by"), pk=pk)
+    """Reviewer panel (Admin/Teacher/staff): approve or reject."""
+    booking = get_object_or_404(SpaceBooking.objects.select_related("space", "booked_by", "series"), pk=pk)
     if booking.status != BookingStatus.PENDING:
         messages.info(request, "This booking is not pending review.")
         return redirect("spaces:booking_detail", pk=pk)
@@ -211,7 +340,16 @@ def booking_review_view(request, pk):
         if form.is_valid():
             action = form.cleaned_data["action"]
             comment = (form.cleaned_data.get("comment") or "").strip()
-            if action == "approve":
+            if booking.series_id and form.cleaned_data.get("apply_to_series"):
+                if action == "approve":
+                    count, err = approve_booking_series(booking.series, request.user, comment)
+                else:
+                    count, err = reject_booking_series(booking.series, request.user, comment)
+                if count:
+                    messages.success(request, f"{count} booking(s) in the series {'approved' if action == 'approve' else 'rejected'}.")
+                    return redirect("spaces:booking_detail", pk=pk)
+                messages.error(request, err or "Could not update the series.")
+            elif action == "approve":
                 ok, err = approve_booking(booking, request.user, comment)
                 if ok:
                     messages.success(request, "Booking approved.")
@@ -241,10 +379,10 @@ def booking_review_view(request, pk):
     )
 
 
-@teacher_required
+@reviewer_required
 @require_safe
 def booking_review_list_view(request):
-    """List of bookings pending review (Admin/Teacher)."""
+    """List of bookings pending review (Admin/Teacher/staff)."""
     pending = SpaceBooking.objects.filter(status=BookingStatus.PENDING).select_related("space", "booked_by").order_by("start_time")
     return render(
         request,
@@ -256,6 +394,62 @@ def booking_review_list_view(request):
     )
 
 
+@reviewer_required
+@require_http_methods(["GET", "POST"])
+def booking_bulk_review_view(request):
+    """Bulk review: pending bookings in a window grouped by overlap; approve/reject selections."""
+    tz = school_timezone()
+    try:
+        first_day = datetime.strptime(request.GET.get("from", ""), "%Y-%m-%d").date()
+    except ValueError:
+        first_day = timezone.localdate(timezone=tz)
+    try:
+        days = min(max(int(request.GET.get("days", BULK_REVIEW_WINDOW_DAYS)), 1), 90)
+    except ValueError:
+        days = BULK_REVIEW_WINDOW_DAYS
+
+    if request.method == "POST":
+        try:
+            booking_ids = [int(pk) for pk in request.POST.getlist("booking")]
+        except ValueError:
+            return HttpResponseBadRequest("Invalid booking id.")
+        action = request.POST.get("action")
+        comment = request.POST.get("comment", "").strip()
+        if not booking_ids:
+            messages.error(request, "Select at least one booking.")
+        elif action == "approve":
+            (approved, skipped), err = bulk_approve_bookings(booking_ids, request.user, comment)
+            if err:
+                messages.error(request, err)
+            else:
+                messages.success(request, f"{approved} booking(s) approved.")
+                if skipped:
+                    messages.warning(request, f"{skipped} booking(s) skipped because they overlap an approved booking.")
+        elif action == "reject":
+            count, err = bulk_reject_bookings(booking_ids, request.user, comment)
+            if err:
+                messages.error(request, err)
+            else:
+                messages.success(request, f"{count} booking(s) rejected.")
+        else:
+            return HttpResponseBadRequest("Unknown action.")
+        return redirect(request.get_full_path())
+
+    groups = pending_review_groups(local_midnight(first_day, tz), local_midnight(first_day + timedelta(days=days), tz))
+    return render(
+        request,
+        "spaces/booking_bulk_review.html",
+        {
+            "section_name": "Spaces",
+            "groups": groups,
+            "conflict_count": sum(1 for group in groups if group["has_conflict"]),
+            "first_day": first_day,
+            "days": days,
+            "school_time_zone": tz.key,
+        },
+    )
+
+
 @login_required
 @require_safe
 def my_bookings_view(request):
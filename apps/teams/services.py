@@ -3,6 +3,9 @@ Team formation: create, apply, invite, accept, reject.
 """
 from django.utils import timezone
 
+from apps.notifications.models import NotificationType
+from apps.notifications.services import notify_users
+
 from .models import Team, TeamMember, TeamRequest, TeamRequestStatus
 
 
@@ -60,6 +63,14 @@ def invite_to_team(team, inviter, invitee, message=""):
             "invited_by": inviter,
         },
     )
+    inviter_name = inviter.get_full_name() or inviter.email
+    notify_users(
+        [invitee.pk],
+        f"Team invite: {team.name}",
+        f"{inviter_name} invited you to join {team.name}." + (f" {message}" if message else ""),
+        NotificationType.TEAM_INVITE,
+        related=req,
+    )
     return req, None
 
 
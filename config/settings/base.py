@@ -62,6 +62,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "apps.core.middleware.SchoolTimezoneMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "allauth.account.middleware.AccountMiddleware",
@@ -110,6 +111,9 @@ AUTH_PASSWORD_VALIDATORS = [
 # Internationalization
 LANGUAGE_CODE = "en-us"
 TIME_ZONE = "UTC"
+# Active timezone for every request (forms, templates) and local day boundaries for
+# calendars and reports; storage stays in UTC (see apps.core.middleware)
+SCHOOL_TIME_ZONE = env("SCHOOL_TIME_ZONE", default="Asia/Almaty")  # type: ignore[arg-type]
 USE_I18N = True
 USE_TZ = True
 
@@ -150,3 +154,11 @@ LOGOUT_REDIRECT_URL = "/"
 
 # Login URL for @login_required
 LOGIN_URL = "/accounts/login/"
+
+# Spaces: cancel pending bookings still unreviewed this many hours before start (0 = off)
+SPACES_PENDING_AUTO_CANCEL_HOURS = env.int("SPACES_PENDING_AUTO_CANCEL_HOURS", default=0)  # type: ignore[arg-type]
+
+# Notifications: fold same-type unread notifications sent within this many minutes into one row (0 = off)
+NOTIFICATIONS_DIGEST_MINUTES = env.int("NOTIFICATIONS_DIGEST_MINUTES", default=60)  # type: ignore[arg-type]
+# Notifications: purge_notifications deletes read notifications older than this many days
+NOTIFICATIONS_RETENTION_DAYS = env.int("NOTIFICATIONS_RETENTION_DAYS", default=90)  # type: ignore[arg-type]
@@ -22,6 +22,7 @@ urlpatterns = [
     path("opportunities/", include("apps.opportunities.urls")),
     path("teams/", include("apps.teams.urls")),
     path("people/", include("apps.people.urls")),
+    path("notifications/", include("apps.notifications.urls")),
     path("", include("apps.core.urls")),
 ]
 